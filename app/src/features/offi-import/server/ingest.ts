@@ -1,14 +1,33 @@
 import fs from 'node:fs'
 import readline from 'node:readline'
+import zlib from 'node:zlib'
 import { prisma } from '@/server/db'
 import { buildWorkUpsert } from '@/features/offi-import/mappers'
 import { parseOffiJsonLine, type OffiWorkRecord } from '@/features/offi-import/schemas'
 
+function isGzipFile(file: string) {
+  const fd = fs.openSync(file, 'r')
+  try {
+    const magic = Buffer.alloc(2)
+    return fs.readSync(fd, magic, 0, 2, 0) === 2 && magic[0] === 0x1f && magic[1] === 0x8b
+  } finally {
+    fs.closeSync(fd)
+  }
+}
+
+function openOffiStream(file: string) {
+  // Le scraper peut produire un JSONL gzip (--out-compress gzip)
+  if (isGzipFile(file)) {
+    return fs.createReadStream(file).pipe(zlib.createGunzip()).setEncoding('utf-8')
+  }
+  return fs.createReadStream(file, { encoding: 'utf-8' })
+}
+
 export async function readOffiFile(file: string) {
   const records: OffiWorkRecord[] = []
   const seenUrls = new Set<string>()
   const rl = readline.createInterface({
-    input: fs.createReadStream(file, { encoding: 'utf-8' }),
+    input: openOffiStream(file),
     crlfDelay: Infinity,
   })
 
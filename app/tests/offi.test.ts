@@ -1,6 +1,30 @@
-import { describe, expect, it } from 'vitest'
+import fs from 'node:fs'
+import os from 'node:os'
+import path from 'node:path'
+import zlib from 'node:zlib'
+import { afterEach, describe, expect, it, vi } from 'vitest'
+
+const { prisma } = vi.hoisted(() => ({
+  prisma: {
+    work: { upsert: vi.fn() },
+    importJob: { create: vi.fn() },
+    $disconnect: vi.fn(),
+  },
+}))
+
+vi.mock('@/server/db', () => ({ prisma }))
+
 import { buildWorkUpsert } from '@/features/offi-import/mappers'
 import { parseOffiJsonLine } from '@/features/offi-import/schemas'
+import { ingestOffiFile } from '@/features/offi-import/server/ingest'
+
+function offiLine(id: number) {
+  return JSON.stringify({
+    url: `https://www.offi.fr/theatre/theatre-test-${id}/spectacle-${id}.html`,
+    title: `Spectacle ${id}`,
+    section: 'theatre',
+  })
+}
 
 describe('Offi ingestion helpers', () => {
   it('normalizes reversed dates and prices while keeping extra fields harmless', () => {
@@ -93,4 +117,38 @@ describe('Offi ingestion helpers', () => {
       ),
     ).toThrow(/Line 42/)
   })
+
+  describe('ingestOffiFile', () => {
+    let dir: string | undefined
+
+    afterEach(() => {
+      vi.clearAllMocks()
+      if (dir) fs.rmSync(dir, { recursive: true, force: true })
+      dir = undefined
+    })
+
+    it('ingests a multi-member gzip file as written by the scraper', async () => {
+      dir = fs.mkdtempSync(path.join(os.tmpdir(), 'offi-'))
+      const file = path.join(dir, 'offi.jsonl.gz')
+      // JsonlWriter.sync() ferme un membre gzip à chaque flush : le fichier en enchaîne plusieurs
+      fs.writeFileSync(
+        file,
+        Buffer.concat([
+          zlib.gzipSync(`${offiLine(1)}\n${offiLine(2)}\n`),
+          zlib.gzipSync(`${offiLine(3)}\n`),
+        ]),
+      )
+
+      const result = await ingestOffiFile(file)
+
+      expect(result).toEqual({ imported: 3, validated: 3 })
+      expect(prisma.work.upsert.mock.calls.map(([args]) => args.where.sourceUrl)).toEqual([
+        'https://www.offi.fr/theatre/theatre-test-1/spectacle-1.html',
+        'https://www.offi.fr/theatre/theatre-test-2/spectacle-2.html',
+        'https://www.offi.fr/theatre/theatre-test-3/spectacle-3.html',
+      ])
+      expect(prisma.importJob.create).toHaveBeenCalledWith({ data: { source: file, imported: 3 } })
+      expect(prisma.$disconnect).toHaveBeenCalledOnce()
+    })
+  })
 })
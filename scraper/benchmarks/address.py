@@ -0,0 +1,115 @@
+"""Micro-benchmark de l'extraction d'adresse, sur textes réels et entrées pathologiques.
+
+Compare `find_address` (ancré sur le code postal, fenêtre bornée) à l'ancienne regex appliquée
+au texte entier. Les textes réels viennent de data/offi.jsonl (descriptions et adresses) : les
+deux versions doivent y trouver la même adresse. Les entrées pathologiques, de taille doublée à
+chaque ligne, ne contiennent aucune adresse : le temps de `find_address` doit y rester linéaire.
+
+    python -m scraper.benchmarks.address [--data ../data/offi.jsonl] [--max-size 32000] [--legacy-timeout 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from scraper.offi_scraper import find_address
+
+DEFAULT_DATA = Path(__file__).resolve().parents[2] / "data" / "offi.jsonl"
+
+LEGACY_ADDRESS_RE = re.compile(
+    r"\b\d{1,4}\s+(?:bis\s+|ter\s+)?[A-Za-zÀ-ÖØ-öø-ÿ'’\-. ]+?\b\d{5}\s+[A-Za-zÀ-ÖØ-öø-ÿ'’\-. ]+"
+)
+
+# Familles d'entrées pathologiques : taille (caractères) -> texte, sans adresse complète
+PATHOLOGICAL: dict[str, Callable[[int], str]] = {
+    # numéro suivi d'un long blanc (mise en page) : `\s+` et la voie se disputent les espaces, en O(n²)
+    "numéro puis blancs": lambda n: "12" + " " * n + "|",
+    # numéro suivi d'une voie sans fin ni code postal
+    "voie sans code postal": lambda n: "12 " + ("rue de la paix " * (n // 15 + 1))[:n],
+    # suite de numéros et d'espaces : une tentative de voie par numéro
+    "numéros répétés": lambda n: ("1 " * (n // 2 + 1))[:n],
+    # longue voie, puis un code postal non suivi d'une ville
+    "code postal orphelin": lambda n: "3 " + ("avenue " * (n // 7 + 1))[:n] + " 75001",
+}
+
+
+def _legacy(text: str) -> Optional[str]:
+    match = LEGACY_ADDRESS_RE.search(text)
+    return match.group(0) if match else None
+
+
+def load_inputs(path: Path) -> list[str]:
+    inputs: list[str] = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            for key in ("description", "address"):
+                if record.get(key):
+                    inputs.append(record[key])
+            if record.get("description") and record.get("address"):
+                inputs.append(f"{record['description']} Adresse : {record['address']}")
+    return inputs
+
+
+def best_time(extract: Callable[[str], Optional[str]], texts: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            extract(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmark de l'extraction d'adresse")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-size", type=int, default=32000, help="Taille maximale des entrées pathologiques")
+    parser.add_argument(
+        "--legacy-timeout", type=float, default=2.0,
+        help="Au-delà de ce temps (s), l'ancienne regex n'est plus mesurée sur les tailles suivantes",
+    )
+    args = parser.parse_args()
+    repeat = max(1, args.repeat)
+
+    mismatches = 0
+    if args.data.exists():
+        inputs = load_inputs(args.data)
+        mismatches = sum(1 for text in inputs if find_address(text) != _legacy(text))
+        print(
+            f"{len(inputs)} textes réels — find_address {best_time(find_address, inputs, repeat) * 1000:.1f} ms, "
+            f"ancienne regex {best_time(_legacy, inputs, repeat) * 1000:.1f} ms, {mismatches} écart(s)"
+        )
+
+    print(f"{'entrée':<22} {'taille':>7} {'find_address ms':>16} {'ancienne ms':>12}")
+    for name, build in PATHOLOGICAL.items():
+        legacy_enabled = True
+        size = 1000
+        while size <= args.max_size:
+            text = build(size)
+            current_s = best_time(find_address, [text], repeat)
+            legacy = "-"
+            if legacy_enabled:
+                legacy_s = best_time(_legacy, [text], 1)
+                legacy = f"{legacy_s * 1000:.1f}"
+                legacy_enabled = legacy_s < args.legacy_timeout
+            print(f"{name:<22} {len(text):>7} {current_s * 1000:>16.2f} {legacy:>12}")
+            size *= 2
+
+    if mismatches:
+        print("ÉCART entre find_address et l'ancienne regex sur les textes réels", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""Construit le corpus HTML versionné du benchmark de parsing.
+
+Avec `--record`, le corpus reprend les pages programme et fiches détail réelles d'une archive
+`--record` du scraper (dernière réponse exploitable de chaque URL). Sans archive, il est
+synthétique : les pages sont reconstituées à partir des fiches de data/offi.jsonl dans un
+gabarit écrit à la main (menus, scripts publicitaires, JSON-LD, blocs informations, fil
+d'Ariane), jamais confronté au balisage réel ; chaque page porte alors `"synthetic": true`.
+La génération est déterministe ; un changement de gabarit implique une nouvelle version.
+Le benchmark utilise le corpus enregistré dès qu'il existe.
+
+    python -m scraper.benchmarks.build_corpus [--data ../data/offi.jsonl] [--out corpus/offi-v1.jsonl.gz]
+    python -m scraper.benchmarks.build_corpus --record ../data/archive [--out corpus/offi-record-v1.jsonl.gz]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import html
+import json
+import random
+from pathlib import Path
+from urllib.parse import urlparse
+
+from scraper.offi_scraper import BASE_URL, CINEMA_PROGRAMME_URL, SECTION_CONFIGS, THEATRE_PROGRAMME_URL, PageArchive
+
+CORPUS_VERSION = "offi-v1"
+RECORDED_CORPUS_VERSION = "offi-record-v1"
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_DATA = BENCH_DIR.parents[1] / "data" / "offi.jsonl"
+SYNTHETIC_CORPUS = BENCH_DIR / "corpus" / f"{CORPUS_VERSION}.jsonl.gz"
+RECORDED_CORPUS = BENCH_DIR / "corpus" / f"{RECORDED_CORPUS_VERSION}.jsonl.gz"
+DEFAULT_CORPUS = RECORDED_CORPUS if RECORDED_CORPUS.exists() else SYNTHETIC_CORPUS
+
+MONTH_NAMES = (
+    "janvier", "février", "mars", "avril", "mai", "juin",
+    "juillet", "août", "septembre", "octobre", "novembre", "décembre",
+)
+MONTH_ABBREVIATIONS = (
+    "janv.", "févr.", "mars", "avr.", "mai", "juin",
+    "juil.", "août", "sept.", "oct.", "nov.", "déc.",
+)
+CINEMA_GENRES = ("drame", "comédie dramatique", "thriller", "documentaire", "animation")
+
+THEATRE_DETAIL_PAGES = 120
+CINEMA_DETAIL_PAGES = 40
+SHOWS_PER_PROGRAMME_PAGE = 30
+
+
+def _date_phrase(rng: random.Random, date_start: str, date_end: str) -> str:
+    y1, m1, d1 = (int(part) for part in date_start.split("-"))
+    y2, m2, d2 = (int(part) for part in date_end.split("-"))
+    months = MONTH_NAMES if rng.random() < 0.7 else MONTH_ABBREVIATIONS
+    month1, month2 = months[m1 - 1], months[m2 - 1]
+    return rng.choice([
+        f"Du {d1:02d}/{m1:02d}/{y1} au {d2:02d}/{m2:02d}/{y2}",
+        f"Du {d1} {month1} {y1} au {d2} {month2} {y2}",
+        f"Du {d1} {month1} au {d2} {month2} {y2}",
+        f"Du {d1} au {d2} {month2} {y2}",
+        f"À partir du {d1} {month1} {y1}",
+        f"Jusqu'au {d2} {month2} {y2}",
+        f"Le {d1} {month1} {y1}, le {d2} {month2} {y2} à 20h30",
+    ])
+
+
+def _site_header(section_label: str) -> str:
+    menu = "".join(f'<li><a href="/{section_label}/rubrique-{i}.html">Rubrique {i}</a></li>' for i in range(40))
+    return f'<header><nav class="menu"><ul>{menu}</ul></nav></header>'
+
+
+def _ads() -> str:
+    return "".join(
+        f"<script>window.ad{i} = {{slot: 'x{i}', sizes: [[300,250],[728,90]]}};</script>" for i in range(6)
+    )
+
+
+def _theatre_detail(rng: random.Random, record: dict) -> str:
+    title = html.escape(record.get("title") or "Sans titre")
+    venue = record.get("venue") or "Théâtre"
+    venue_slug = record["url"].split("/")[4]
+    description = html.escape(record.get("description") or "")
+    address = html.escape(record.get("address") or "1 rue de Rivoli 75001 Paris")
+    date_start = record.get("date_start") or "2025-09-01"
+    date_end = record.get("date_end") or date_start
+    duration = int(record.get("duration_min") or 90)
+    price_min, price_max = record.get("price_min_eur"), record.get("price_max_eur")
+
+    jsonld = ""
+    if rng.random() < 0.6:
+        payload = {
+            "@context": "https://schema.org",
+            "@type": "TheaterEvent",
+            "name": record.get("title"),
+            "startDate": date_start + ("T20:30:00+02:00" if rng.random() < 0.5 else ""),
+            "endDate": date_end,
+            "location": {"@type": "Place", "name": venue, "address": {"streetAddress": record.get("address")}},
+        }
+        jsonld = f'<script type="application/ld+json">{json.dumps(payload, ensure_ascii=False)}</script>'
+    price = ""
+    if price_min is not None:
+        if price_max is not None and price_max != price_min and rng.random() < 0.5:
+            price = f"<p>Tarifs : {int(price_min)} - {int(price_max)} €</p>"
+        elif price_max is not None and price_max != price_min:
+            price = f"<p>Prix : de {price_min:.2f}€ à {price_max:.2f}€</p>".replace(".", ",")
+        else:
+            price = f"<p>Billet : {price_min:.0f} €</p>"
+    hours, minutes = divmod(duration, 60)
+    duration_text = rng.choice([
+        f"Durée : {hours}h{minutes:02d}" if minutes else f"Durée : {hours}h",
+        f"Durée : {duration} min",
+        f"{duration} mn",
+    ])
+    depth = rng.randrange(1, 4)
+    address_block = (
+        f'<div class="venue-address">{address}</div>' if rng.random() < 0.7 else f"<p>Adresse : {address}</p>"
+    )
+    paragraphs = "".join(f"<p>{description}</p>" for _ in range(rng.randrange(1, 3)))
+    return f"""<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8"><title>{title} - Offi</title>
+<meta name="description" content="{description[:160]}"><meta property="og:image" content="{record.get('image') or '/img/default.jpg'}">
+<link rel="stylesheet" href="/css/main.css"><style>.a{{color:red}} .b{{margin:0}}</style>{_ads()}{jsonld}</head>
+<body>{_site_header("theatre")}
+<div class="container"><nav class="breadcrumb"><a href="/">Accueil</a> &gt; <a href="/theatre.html">Pièces de théâtre</a> &gt; <a href="/theatre/{venue_slug}.html">{html.escape(venue.split(' - ')[0])}</a></nav>
+<article class="event"><h1>{title}</h1>
+<div class="informations"><div class="dates">{_date_phrase(rng, date_start, date_end)}</div><span class="infos">{duration_text}</span>{address_block}{price}</div>
+{"<section><div>" * depth}<h2>Présentation</h2>{paragraphs}<h3>Distribution</h3><p>Avec des comédiens formidables et talentueux.</p>{"</div></section>" * depth}
+</article><aside><svg width="10" height="10"><circle r="4"></circle></svg><iframe src="/ads"></iframe></aside></div>
+<footer><p>Offi.fr - Tous droits réservés</p></footer><noscript>Activez JS</noscript></body></html>"""
+
+
+def _cinema_detail(rng: random.Random, record: dict, index: int) -> str:
+    title = html.escape(record.get("title") or f"Film {index}")
+    description = html.escape(record.get("description") or "Un film.")
+    genre = rng.choice(CINEMA_GENRES)
+    duration = rng.randrange(70, 180)
+    year, month, day = 2026, rng.randrange(1, 13), rng.randrange(1, 28)
+    jsonld = ""
+    kind = rng.randrange(3)
+    if kind == 0:
+        payload = {
+            "@context": "https://schema.org",
+            "@type": "Movie",
+            "genre": genre,
+            "duration": f"PT{duration // 60}H{duration % 60}M",
+            "datePublished": f"{year}-{month:02d}-{day:02d}",
+        }
+        jsonld = f'<script type="application/ld+json">{json.dumps(payload, ensure_ascii=False)}</script>'
+    elif kind == 1:
+        payload = {
+            "@context": "https://schema.org",
+            "@graph": [
+                {"@type": "WebPage", "name": title},
+                {"@type": "Movie", "genre": [genre, "Romance"], "dateCreated": f"{year}-{month:02d}-{day:02d}T00:00:00"},
+            ],
+        }
+        jsonld = f'<script type="application/ld+json">{json.dumps(payload, ensure_ascii=False)}</script>'
+    release = rng.choice([f"{day} {MONTH_NAMES[month - 1]} {year}", f"{day:02d}/{month:02d}/{year}"])
+    return f"""<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8"><title>{title} - Offi</title>
+<meta name="description" content="{description[:160]}"><meta property="og:image" content="/img/film-{index}.jpg">{_ads()}{jsonld}</head>
+<body>{_site_header("cinema")}<nav class="breadcrumb"><a href="/cinema.html">Cinéma</a></nav><h1>{title}</h1>
+<section class="meta"><p>Genre : {genre}</p><p>Date de sortie (ou ressortie) en France : {release}</p><p>Durée : {duration // 60}h{duration % 60:02d}</p><p>Réalisateur : Quelqu'un</p></section>
+<h2>Synopsis</h2><p>{description}</p><footer><p>Offi.fr - Tous droits réservés</p></footer></body></html>"""
+
+
+def _programme(section_label: str, cards: list[tuple[str, str, str]], page: int, pages: int) -> str:
+    items = "".join(
+        f'<li class="event-card"><a href="{url}"><img src="/img/{i}.jpg" alt=""></a>'
+        f'<a href="{url}">{html.escape(title)}</a><span class="lieu">{html.escape(venue)}</span></li>'
+        for i, (url, title, venue) in enumerate(cards)
+    )
+    pagination = "".join(f'<a href="?npage={n}">{n}</a>' for n in range(1, pages + 1) if n != page)
+    return f"""<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8"><title>Programme - Offi</title>{_ads()}</head>
+<body>{_site_header(section_label)}<main><ul class="programme">{items}</ul><div class="pagination">{pagination}</div></main>
+<footer><p>Offi.fr - Tous droits réservés</p></footer></body></html>"""
+
+
+def _programme_pages(section: str, base_url: str, cards: list[tuple[str, str, str]]) -> list[dict]:
+    chunks = [cards[i:i + SHOWS_PER_PROGRAMME_PAGE] for i in range(0, len(cards), SHOWS_PER_PROGRAMME_PAGE)]
+    separator = "&" if "?" in base_url else "?"
+    return [
+        {
+            "url": base_url if page == 1 else f"{base_url}{separator}npage={page}",
+            "section": section,
+            "page_type": "programme",
+            "html": _programme(section, chunk, page, len(chunks)),
+            "synthetic": True,
+        }
+        for page, chunk in enumerate(chunks, start=1)
+    ]
+
+
+def build(data_path: Path, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    with data_path.open(encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    theatre = [record for record in records if "/theatre/" in record["url"]][:THEATRE_DETAIL_PAGES]
+
+    pages: list[dict] = []
+    theatre_cards: list[tuple[str, str, str]] = []
+    for record in theatre:
+        pages.append({
+            "url": record["url"],
+            "section": "theatre",
+            "page_type": "detail",
+            "html": _theatre_detail(rng, record),
+            "synthetic": True,
+        })
+        theatre_cards.append((record["url"].removeprefix(BASE_URL), record.get("title") or "", record.get("venue") or ""))
+
+    cinema_cards: list[tuple[str, str, str]] = []
+    for index in range(CINEMA_DETAIL_PAGES):
+        record = rng.choice(records)
+        path = f"/cinema/evenement/film-{index}-{1000 + index}.html"
+        pages.append({
+            "url": BASE_URL + path,
+            "section": "cinema",
+            "page_type": "detail",
+            "html": _cinema_detail(rng, record, index),
+            "synthetic": True,
+        })
+        cinema_cards.append((path, record.get("title") or f"Film {index}", ""))
+
+    pages.extend(_programme_pages("theatre", THEATRE_PROGRAMME_URL, theatre_cards))
+    pages.extend(_programme_pages("cinema", CINEMA_PROGRAMME_URL, cinema_cards))
+    return pages
+
+
+def build_from_archive(archive_dir: Path) -> list[dict]:
+    """Pages programme et fiches détail d'une archive `--record`, dans l'ordre de l'archive.
+
+    Les fiches détail sont limitées comme celles du corpus synthétique, pour garder la durée du benchmark.
+    """
+    archive = PageArchive(str(archive_dir))
+    limits = {"theatre": THEATRE_DETAIL_PAGES, "cinema": CINEMA_DETAIL_PAGES}
+    details: dict[str, list[dict]] = {section: [] for section in SECTION_CONFIGS}
+    programmes: list[dict] = []
+    for entry in archive.latest_pages():
+        path = urlparse(entry.url).path
+        for section, config in SECTION_CONFIGS.items():
+            if path == urlparse(config.programme_url).path:
+                pages, page_type = programmes, "programme"
+            elif config.show_path_re.match(path) and len(details[section]) < limits[section]:
+                pages, page_type = details[section], "detail"
+            else:
+                continue
+            pages.append({"url": entry.url, "section": section, "page_type": page_type, "html": archive.body(entry)})
+            break
+    return [page for section in SECTION_CONFIGS for page in details[section]] + programmes
+
+
+def corpus_name(path: Path) -> str:
+    """Nom du corpus tel qu'enregistré dans la baseline : `offi-v1`, `offi-record-v1`…"""
+    return path.name.removesuffix(".jsonl.gz")
+
+
+def is_synthetic(corpus: list[dict]) -> bool:
+    return any(page.get("synthetic") for page in corpus)
+
+
+def load_corpus(path: Path = DEFAULT_CORPUS) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Construit le corpus HTML du benchmark de parsing")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--data", type=Path, default=DEFAULT_DATA, help="Fiches JSONL du corpus synthétique")
+    source.add_argument("--record", type=Path, default=None, help="Archive --record de pages Offi réelles")
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+
+    if args.record is not None:
+        pages = build_from_archive(args.record)
+        if not pages:
+            parser.error(f"aucune page programme ni fiche détail dans {args.record}")
+        args.out = args.out or RECORDED_CORPUS
+    else:
+        pages = build(args.data)
+        args.out = args.out or SYNTHETIC_CORPUS
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    # mtime=0 : le même corpus donne exactement les mêmes octets
+    with open(args.out, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+        for page in pages:
+            gz.write((json.dumps(page, ensure_ascii=False) + "\n").encode("utf-8"))
+    print(f"{len(pages)} pages -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Micro-benchmark du parseur de plages de dates.
+
+Les entrées sont les descriptions réelles de data/offi.jsonl et des phrases de dates
+construites à partir des dates des mêmes fiches, dans les formes vues sur Offi.
+
+    python -m scraper.benchmarks.dates [--data ../data/offi.jsonl] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from scraper.offi_scraper import parse_date_range
+
+DEFAULT_DATA = Path(__file__).resolve().parents[2] / "data" / "offi.jsonl"
+
+MONTH_NAMES = (
+    "janvier", "février", "mars", "avril", "mai", "juin",
+    "juillet", "août", "septembre", "octobre", "novembre", "décembre",
+)
+
+
+def _phrases(date_start: str, date_end: str) -> list[str]:
+    y1, m1, d1 = (int(part) for part in date_start.split("-"))
+    y2, m2, d2 = (int(part) for part in date_end.split("-"))
+    month1, month2 = MONTH_NAMES[m1 - 1], MONTH_NAMES[m2 - 1]
+    return [
+        f"Du {d1:02d}/{m1:02d}/{y1} au {d2:02d}/{m2:02d}/{y2}",
+        f"Du {d1} {month1} {y1} au {d2} {month2} {y2}",
+        f"Du {d1} {month1} au {d2} {month2} {y2}",
+        f"Du {d1} au {d2} {month2} {y2}",
+        f"À partir du {d1} {month1} {y1}",
+        f"Jusqu'au {d2} {month2} {y2}",
+        f"Le {d1} {month1} {y1} à 20h30, relâche le {d2} {month2} {y2}",
+    ]
+
+
+def load_inputs(path: Path) -> list[str]:
+    inputs: list[str] = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("description"):
+                inputs.append(record["description"])
+            if record.get("date_start"):
+                inputs.extend(_phrases(record["date_start"], record.get("date_end") or record["date_start"]))
+    return inputs
+
+
+def run(inputs: list[str], repeat: int) -> dict[str, float]:
+    """Meilleur temps à froid (cache vidé) sur tout le jeu, et à chaud sur ce que le cache retient."""
+    working_set = inputs[: parse_date_range.cache_parameters()["maxsize"]]
+    cold: list[float] = []
+    warm: list[float] = []
+    for _ in range(repeat):
+        parse_date_range.cache_clear()
+        started = time.perf_counter()
+        for text in inputs:
+            parse_date_range(text)
+        cold.append(time.perf_counter() - started)
+        for text in working_set:
+            parse_date_range(text)
+        started = time.perf_counter()
+        for text in working_set:
+            parse_date_range(text)
+        warm.append(time.perf_counter() - started)
+    return {"cold_s": min(cold), "warm_s": min(warm)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark du parseur de dates")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    inputs = load_inputs(args.data)
+    result = run(inputs, max(1, args.repeat))
+    print(
+        f"{len(inputs)} textes — à froid {result['cold_s'] * 1000:.1f} ms "
+        f"({len(inputs) / result['cold_s']:.0f} textes/s), "
+        f"à chaud {result['warm_s'] * 1000:.1f} ms ({min(len(inputs), parse_date_range.cache_info().maxsize)} textes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
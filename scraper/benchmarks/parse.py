@@ -0,0 +1,227 @@
+"""Benchmark hors ligne du parsing, sur le corpus HTML versionné (benchmarks/corpus).
+
+Pour chaque parser et chaque extracteur (liens des pages programme, fiches théâtre, fiches
+cinéma) : pages/s, temps par page p50/p95 (parsing compris) et pic mémoire d'une page (tracemalloc).
+Les résultats sont comparés à benchmarks/baseline.json ; les temps de référence sont mis à
+l'échelle de la machine par une boucle de calibration. Une régression du p50, du débit ou
+du pic mémoire au-delà de la tolérance fait échouer la commande. Tant que le corpus est
+synthétique (sans archive `--record`, voir build_corpus), la baseline porte `"synthetic": true`
+et les chiffres ne valent que pour le gabarit écrit à la main.
+
+    python -m scraper.benchmarks.parse [--rounds 5] [--tolerance 0.3] [--update-baseline]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from scraper.benchmarks.build_corpus import DEFAULT_CORPUS, corpus_name, is_synthetic, load_corpus
+from scraper.offi_scraper import PARSER_VALUES, OffiScraper, Show
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+# Pages du corpus mesurées par chaque extracteur : (type de page, section)
+EXTRACTORS = {
+    "programme": ("programme", None),
+    "theatre_detail": ("detail", "theatre"),
+    "cinema_detail": ("detail", "cinema"),
+}
+CALIBRATION_TEXT = " ".join(f"Du {d} au {d + 7} octobre 2025, 20h30, {d * 3} €" for d in range(1, 22)) * 4
+CALIBRATION_RE = re.compile(r"\w+")
+
+
+def calibrate(repeat: int = 20) -> float:
+    """Temps (s) d'une charge Python pure fixe : l'étalon des comparaisons entre machines."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        counts: dict[str, int] = {}
+        for _ in range(100):
+            for word in CALIBRATION_RE.findall(CALIBRATION_TEXT):
+                counts[word] = counts.get(word, 0) + 1
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _extractor(scraper: OffiScraper, name: str) -> Callable[[dict], object]:
+    if name == "programme":
+        def run(page: dict):
+            scraper._seen_urls.clear()
+            return scraper._page_seeds(scraper._parse_html(page["html"], "programme"), page["section"])
+    else:
+        def run(page: dict):
+            show = Show(url=page["url"], section=page["section"])
+            return scraper._complete_show_from_soup(show, scraper._parse_html(page["html"], "detail"))
+    return run
+
+
+def measure(pages: list[dict], run: Callable[[dict], object], rounds: int) -> dict[str, float]:
+    """Meilleur tour pour le débit, meilleur temps de chaque page pour p50/p95 (moins de bruit).
+
+    Le pic mémoire est celui de la page la plus coûteuse, chacune mesurée après une collecte :
+    un arbre BeautifulSoup est cyclique et n'est libéré que par le GC, si bien qu'un pic pris sur
+    tout le lot compterait un nombre variable d'arbres morts selon le moment où le GC passe.
+    """
+    best_per_page = [float("inf")] * len(pages)
+    best_round = float("inf")
+    for _ in range(rounds):
+        round_started = time.perf_counter()
+        for i, page in enumerate(pages):
+            started = time.perf_counter()
+            run(page)
+            best_per_page[i] = min(best_per_page[i], time.perf_counter() - started)
+        best_round = min(best_round, time.perf_counter() - round_started)
+    ordered = sorted(best_per_page)
+    peak = 0
+    for page in pages:
+        gc.collect()
+        tracemalloc.start()
+        run(page)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        "pages": len(pages),
+        "pages_per_s": len(pages) / best_round,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[len(ordered) - 1 - len(ordered) // 20] * 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+def run_suite(corpus: list[dict], rounds: int) -> dict[str, dict[str, dict[str, float]]]:
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for parser in PARSER_VALUES:
+        scraper = OffiScraper(parser=parser)
+        results[parser] = {}
+        for name, (page_type, section) in EXTRACTORS.items():
+            pages = [
+                page for page in corpus
+                if page["page_type"] == page_type and (section is None or page["section"] == section)
+            ]
+            results[parser][name] = measure(pages, _extractor(scraper, name), rounds)
+    return results
+
+
+def best_of(first: dict, second: dict) -> dict:
+    """Meilleure valeur de chaque métrique sur deux passes du suite."""
+    merged: dict = {}
+    for parser, extractors in first.items():
+        merged[parser] = {}
+        for name, a in extractors.items():
+            b = second[parser][name]
+            merged[parser][name] = {
+                "pages": a["pages"],
+                "pages_per_s": max(a["pages_per_s"], b["pages_per_s"]),
+                "p50_ms": min(a["p50_ms"], b["p50_ms"]),
+                "p95_ms": min(a["p95_ms"], b["p95_ms"]),
+                "peak_kib": min(a["peak_kib"], b["peak_kib"]),
+            }
+    return merged
+
+
+def compare(results: dict, baseline: dict, calibration_s: float, tolerance: float) -> list[str]:
+    """Régressions par rapport à la baseline : p50 et débit mis à l'échelle de la machine, mémoire brute.
+
+    Le p95 est affiché mais pas comparé : sur quelques dizaines de pages, il reste trop bruité.
+    """
+    scale = calibration_s / baseline["calibration_s"]
+    regressions: list[str] = []
+    for parser, extractors in results.items():
+        for name, current in extractors.items():
+            reference = baseline["results"].get(parser, {}).get(name)
+            if reference is None:
+                continue
+            limit = reference["p50_ms"] * scale * (1 + tolerance)
+            if current["p50_ms"] > limit:
+                regressions.append(f"{parser}/{name} p50_ms {current['p50_ms']:.2f} > {limit:.2f}")
+            throughput_floor = reference["pages_per_s"] / scale * (1 - tolerance)
+            if current["pages_per_s"] < throughput_floor:
+                regressions.append(
+                    f"{parser}/{name} pages/s {current['pages_per_s']:.1f} < {throughput_floor:.1f}"
+                )
+            memory_limit = reference["peak_kib"] * (1 + tolerance)
+            if current["peak_kib"] > memory_limit:
+                regressions.append(f"{parser}/{name} pic mémoire {current['peak_kib']:.0f} KiB > {memory_limit:.0f} KiB")
+    return regressions
+
+
+def report(results: dict, baseline: dict | None) -> None:
+    print(f"{'parser':<12} {'extracteur':<15} {'pages':>5} {'pages/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'pic KiB':>9}  baseline p50")
+    for parser, extractors in results.items():
+        for name, r in extractors.items():
+            reference = (baseline or {}).get("results", {}).get(parser, {}).get(name)
+            previous = f"{reference['p50_ms']:.2f}" if reference else "-"
+            print(
+                f"{parser:<12} {name:<15} {r['pages']:>5} {r['pages_per_s']:>9.1f} {r['p50_ms']:>8.2f} "
+                f"{r['p95_ms']:>8.2f} {r['peak_kib']:>9.0f}  {previous}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de parsing sur le corpus HTML versionné")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Dégradation tolérée (0.3 = 30 %%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Enregistre ces résultats comme baseline")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    name = corpus_name(args.corpus)
+    synthetic = is_synthetic(corpus)
+    if synthetic:
+        print(
+            f"Corpus {name} synthétique : gabarit écrit à la main, pas des pages Offi réelles "
+            "(make -C scraper bench-corpus RECORD=<archive --record> pour le remplacer)",
+            file=sys.stderr,
+        )
+    calibration_s = calibrate()
+    results = run_suite(corpus, max(1, args.rounds))
+    calibration_s = min(calibration_s, calibrate())
+
+    baseline = None
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    report(results, baseline)
+
+    if args.update_baseline:
+        payload = {"corpus": name, "synthetic": synthetic, "calibration_s": calibration_s, "results": results}
+        args.baseline.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baseline enregistrée dans {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"Pas de baseline ({args.baseline}) : lancer avec --update-baseline", file=sys.stderr)
+        return 1
+    if baseline.get("corpus") != name:
+        print(f"Baseline faite sur {baseline.get('corpus')}, corpus actuel {name}", file=sys.stderr)
+        return 1
+
+    regressions = compare(results, baseline, calibration_s, args.tolerance)
+    if regressions:
+        # Une seconde passe écarte le bruit ponctuel de la machine avant de conclure à une régression
+        print("Écart au-delà de la tolérance, seconde passe de confirmation…")
+        results = best_of(results, run_suite(corpus, max(1, args.rounds)))
+        calibration_s = min(calibration_s, calibrate())
+        report(results, baseline)
+        regressions = compare(results, baseline, calibration_s, args.tolerance)
+    if regressions:
+        print("RÉGRESSION de performance :", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    print("OK : pas de régression au-delà de la tolérance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,25 +6,42 @@ Scraper Offi.fr - fiches 2 segments strictes, venue=théâtre fiable, parsing da
 
 Usage :
   python offi_scraper.py --max-pages 10 --out spectacles.jsonl [--debug]
+  python offi_scraper.py reparse ARCHIVE_DIR --out spectacles.jsonl [--workers N]
+  python offi_scraper.py cards ARCHIVE_DIR [--sections theatre,cinema]
 """
 
 from __future__ import annotations
 import argparse
+import asyncio
+import bisect
+import copy
+import gzip
+import hashlib
+import heapq
 import json
 import logging
 import os
+import queue
 import random
 import re
+import sqlite3
 import sys
+import threading
 import time
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta, timezone
-from typing import Optional, Tuple, List
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, contextmanager, nullcontext
+from dataclasses import dataclass, asdict, field, fields, replace
+from functools import cached_property, lru_cache, wraps
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Tuple, List
 from urllib.parse import urljoin, urlparse, urlunparse, urlencode, parse_qsl
 
 import requests
-from bs4 import BeautifulSoup
-from bs4.element import Tag
+from requests.structures import CaseInsensitiveDict
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from bs4.element import CData, NavigableString, Tag
 
 # -----------------------
 # Configuration
@@ -54,11 +71,25 @@ PRICE_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*€")
 PRICE_RANGE_RE = re.compile(r"(\d+)\s*[-–—]\s*(\d+)\s*€")
 DURATION_RE = re.compile(r"(\d+)h(?:(\d+))?|(\d+)\s*(?:mn|min)")
 DURATION_CONTEXT_RE = re.compile(r"\b(?:durée|duree|dur\.)\b", re.IGNORECASE)
-ADDRESS_RE = re.compile(
-    r"\b\d{1,4}\s+(?:bis\s+|ter\s+)?[A-Za-zÀ-ÖØ-öø-ÿ'’\-. ]+?\b\d{5}\s+[A-Za-zÀ-ÖØ-öø-ÿ'’\-. ]+"
-)
+# Adresse `<numéro> <voie> <code postal> <ville>`, repérée par son code postal à 5 chiffres. La voie
+# ne contient pas de chiffre : elle est cherchée juste avant chaque code postal, dans une fenêtre de
+# ADDRESS_WINDOW caractères, ce qui borne le travail par code postal (cf. `find_address`).
+ADDRESS_CHARS = "A-Za-zÀ-ÖØ-öø-ÿ'’\\-. "
+# `\d\d\d\d\d` plutôt que `\b\d{5}` : bien plus rapide à balayer, la frontière de mot est vérifiée à part
+ADDRESS_POSTCODE_RE = re.compile(r"\d\d\d\d\d(?=\s)")
+ADDRESS_STREET_RE = re.compile(rf"\b\d{{1,4}}\s+(?:bis\s+|ter\s+)?[{ADDRESS_CHARS}]+$")
+ADDRESS_CITY_RE = re.compile(rf"\s+[{ADDRESS_CHARS}]+")
+ADDRESS_WINDOW = 160
+PRICE_CONTEXT_RE = re.compile(r"tarif|prix|billet", re.IGNORECASE)
 RUBRIC_RE = re.compile(r"rubrique\s+([^\.]+)\.", re.IGNORECASE)
 SECTION_VALUES = {"theatre", "cinema"}
+ENGINE_VALUES = ("sync", "async", "pipeline")
+THROTTLE_VALUES = ("adaptive", "fixed")
+PARSER_VALUES = ("html.parser", "lxml")
+COMPRESS_VALUES = ("none", "gzip")
+REFRESH_POLICY_VALUES = ("lifecycle", "fixed")
+# Sous-arbres sans contenu utile pour l'extraction, ignorés au parsing des fiches détail
+DETAIL_SKIPPED_TAGS = {"style", "noscript", "svg", "iframe", "template", "link"}
 
 # Mois FR (longs + abréviations, avec ou sans point)
 MONTHS = {
@@ -82,75 +113,388 @@ MONTH_PATTERN = (
     r"août|aout|septembre|sept\.?|octobre|oct\.?|novembre|nov\.?|décembre|decembre|déc\.?|dec\.?)"
 )
 
-# --- CAPTURE du mois (entre parenthèses !) ---
-# Date simple "12 octobre 2025"
-DATE_WORD_RE = re.compile(
-    rf"(\d{{1,2}})\s+({MONTH_PATTERN})\s+(\d{{4}})",
-    re.IGNORECASE,
-)
-
-# Plages "du 30 décembre 2025 au 3 janvier 2026"
-RANGE_BOTH_YEARS_RE = re.compile(
-    rf"du\s+(\d{{1,2}})\s+({MONTH_PATTERN})\s+(\d{{4}})\s+au\s+(\d{{1,2}})\s+({MONTH_PATTERN})\s+(\d{{4}})",
-    re.IGNORECASE,
-)
-# Plages "du 7 septembre au 12 octobre 2025" (année à la fin)
-RANGE_YEAR_AT_END_RE = re.compile(
-    rf"du\s+(\d{{1,2}})\s+({MONTH_PATTERN})\s+au\s+(\d{{1,2}})\s+({MONTH_PATTERN})\s+(\d{{4}})",
-    re.IGNORECASE,
-)
-# Plages "du 5 au 12 octobre 2025" (même mois)
-RANGE_SAME_MONTH_RE = re.compile(
-    rf"du\s+(\d{{1,2}})\s+au\s+(\d{{1,2}})\s+({MONTH_PATTERN})\s+(\d{{4}})",
-    re.IGNORECASE,
-)
-
 # Dates numériques (dd/mm/yyyy ou dd-mm-yyyy)
 DATE_NUM = r"(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})"
-RANGE_NUMERIC_RE = re.compile(rf"du\s+{DATE_NUM}\s+au\s+{DATE_NUM}", re.IGNORECASE)
 DATE_NUMERIC_RE = re.compile(DATE_NUM)
 
-# Bornes simples
-JUSQU_AU_RE = re.compile(
-    rf"jusqu['’]?au\s+(\d{{1,2}})\s+({MONTH_PATTERN})\s+(\d{{4}})",
-    re.IGNORECASE,
-)
-A_PARTIR_DU_RE = re.compile(
-    rf"à\s+partir\s+du\s+(\d{{1,2}})\s+({MONTH_PATTERN})\s+(\d{{4}})",
+# Tokenizer des dates : un seul passage sur le texte, ancré sur les nombres ; le mot-clé qui
+# précède un nombre est lu dans une fenêtre bornée, le mois qui le suit dans le même match.
+DATE_ANCHOR_RE = re.compile(rf"(\d+(?:[/-]\d+[/-]\d+)?)(?:\s+({MONTH_PATTERN})(?![\w.]))?", re.IGNORECASE)
+DATE_KEYWORD_BEFORE_RE = re.compile(
+    r"(?<!\w)(?:(à\s+partir)\s+(du)|(jusqu['’]?au)|(du)|(au))\s+$",
     re.IGNORECASE,
 )
+DATE_KEYWORD_WINDOW = 24
 
 CINEMA_RELEASE_RE = re.compile(
     rf"\b(?:date\s+de\s+sortie|sortie|date\s+de\s+ressortie|ressortie)[^:]*[:\-]?\s*({DATE_NUM}|"
     rf"\d{{1,2}}\s+{MONTH_PATTERN}\s+\d{{4}})",
     re.IGNORECASE,
 )
-JSONLD_GENRE_RE = re.compile(r'"genre"\s*:\s*(?:"([^"]+)"|\[(.*?)\])', re.IGNORECASE | re.DOTALL)
-JSONLD_DURATION_RE = re.compile(r'"duration"\s*:\s*"([^"]+)"', re.IGNORECASE)
-JSONLD_DATE_RE = re.compile(r'"(?:datePublished|dateCreated|startDate|releaseDate)"\s*:\s*"([^"]+)"', re.IGNORECASE)
+JSONLD_RELEASE_KEYS = ("datePublished", "dateCreated", "startDate", "releaseDate")
+CINEMA_GENRE_RE = re.compile(
+    r"\bgenre(?:s)?\s*:\s*(.+?)(?=\b(?:durée|duree|date\s+de\s+sortie|sortie|nationalité|réalisateur|réalisation|avec|casting|titre\s+original)\b|$)",
+    re.IGNORECASE,
+)
+CINEMA_DURATION_RE = re.compile(r"\bdur(?:ée|e)?\s*:\s*([^\s•|]+)", re.IGNORECASE)
+DESCRIPTION_HEADING_KEYWORDS = ("présentation", "résumé", "synopsis", "à propos")
+ADDRESS_SELECTORS = ("[itemprop='streetAddress']", "[itemprop='address']", "[class*=address]", "[id*=address]", "address")
+
+# Index de texte des fiches détail : un bloc par élément de niveau bloc, étiqueté par les
+# sélecteurs qui le couvrent (sur lui-même, un ancêtre ou un descendant inline).
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "body", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+    "li", "main", "nav", "ol", "p", "section", "table", "td", "th", "tr", "ul",
+}
+THEATRE_DATE_SELECTORS = (
+    "time", ".date", ".dates", ".informations", ".meta", "[class*=date]", "[id*=date]", "section", "article",
+)
+THEATRE_DURATION_SELECTORS = (".informations", ".meta", "section", "article", "p", "[class*=durée]", "[class*=duree]")
+# Sélecteurs dont le contexte suffit à lire "1h30" comme une durée (et non une heure de séance)
+HOUR_ONLY_DURATION_SELECTORS = frozenset({"[class*=durée]", "[class*=duree]"})
+
+
+def _word_date_iso(day: str, month_name: str, year: str) -> Optional[str]:
+    month = MONTHS.get(month_name.lower().replace(".", "")) if month_name else None
+    if not month:
+        return None
+    try:
+        y = int(year)
+        if y < 100:  # 24 -> 2024 naïf
+            y += 2000
+        return f"{y:04d}-{month:02d}-{int(day):02d}"
+    except ValueError:
+        return None
+
+
+def _numeric_date_iso(value: str) -> Optional[str]:
+    match = DATE_NUMERIC_RE.fullmatch(value)
+    if not match:
+        return None
+    day, month, year = match.groups()
+    return f"{int(year) + (2000 if len(year) == 2 else 0):04d}-{int(month):02d}-{int(day):02d}"
+
+
+# Jetons du tokenizer de dates, un caractère par jeton ; "|" sépare deux jetons non contigus
+DATE_TOKEN_CODES = {"du": "D", "au": "A", "from": "F", "until": "U", "day": "d", "year": "y", "numeric": "n", "month": "m"}
+
+# Règles de plage par priorité décroissante : signature de jetons contigus -> (début, fin)
+DATE_RANGE_RULES = (
+    # du 05/10/2025 au 12/11/2025
+    ("DnAn", lambda v: (_numeric_date_iso(v[1]), _numeric_date_iso(v[3]))),
+    # du 30 décembre 2025 au 3 janvier 2026
+    ("DdmyAdmy", lambda v: (_word_date_iso(v[1], v[2], v[3]), _word_date_iso(v[5], v[6], v[7]))),
+    # du 7 septembre au 12 octobre 2025
+    ("DdmAdmy", lambda v: (_word_date_iso(v[1], v[2], v[6]), _word_date_iso(v[4], v[5], v[6]))),
+    # du 5 au 12 octobre 2025
+    ("DdAdmy", lambda v: (_word_date_iso(v[1], v[4], v[5]), _word_date_iso(v[3], v[4], v[5]))),
+    # à partir du X (seulement start)
+    ("FDdmy", lambda v: (_word_date_iso(v[2], v[3], v[4]), None)),
+    # jusqu'au Y (seulement end)
+    ("Udmy", lambda v: (None, _word_date_iso(v[1], v[2], v[3]))),
+)
+DATE_WORD_SIGNATURE_RE = re.compile("dmy")
+
+
+def _tokenize_dates(text: str) -> tuple[str, list[int], list[str]]:
+    """Signature des jetons de date du texte, position de chaque caractère de jeton, valeurs.
+
+    Codes (DATE_TOKEN_CODES) : `D` du, `A` au, `F` « à partir » (toujours suivi de `D`), `U`
+    jusqu'au, `d` jour (1-2 chiffres), `y` année (4 chiffres), `n` jj/mm/aaaa, `m` mois, `o` nombre
+    inutilisable. Deux jetons ne sont contigus que s'ils sont séparés par des espaces seulement.
+    """
+    signature: list[str] = []
+    index: list[int] = []
+    values: list[str] = []
+    last_end = -1
+
+    def emit(kind: str, value: str, start: int, end: int) -> None:
+        nonlocal last_end
+        if signature and not (start > last_end and text[last_end:start].isspace()):
+            signature.append("|")
+        index.append(len(signature))
+        signature.append(DATE_TOKEN_CODES.get(kind, "o"))
+        values.append(value)
+        last_end = end
+
+    for match in DATE_ANCHOR_RE.finditer(text):
+        start = match.start()
+        keyword = DATE_KEYWORD_BEFORE_RE.search(text, max(0, start - DATE_KEYWORD_WINDOW), start)
+        if keyword:
+            if keyword.group(1):
+                emit("from", keyword.group(1), keyword.start(1), keyword.end(1))
+                emit("du", keyword.group(2), keyword.start(2), keyword.end(2))
+            elif keyword.group(3):
+                emit("until", keyword.group(3), keyword.start(3), keyword.end(3))
+            else:
+                group = 4 if keyword.group(4) else 5
+                emit(keyword.group(group).lower(), keyword.group(group), keyword.start(group), keyword.end(group))
+
+        number = match.group(1)
+        if "/" in number or "-" in number:
+            kind = "numeric" if DATE_NUMERIC_RE.fullmatch(number) else "other"
+        else:
+            kind = "day" if len(number) <= 2 else ("year" if len(number) == 4 else "other")
+        emit(kind, number, start, match.end(1))
+        if match.group(2):
+            emit("month", match.group(2), match.start(2), match.end(2))
+
+    return "".join(signature), index, values
+
+
+@lru_cache(maxsize=4096)
+def parse_date_range(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """Plage de dates d'un blob de texte FR, avec priorité aux vraies plages (mémoïsé par texte)."""
+    signature, index, values = _tokenize_dates(text)
+    token_at = {position: token for token, position in enumerate(index)}
+
+    for pattern, read in DATE_RANGE_RULES:
+        position = signature.find(pattern)
+        if position >= 0:
+            first = token_at[position]
+            return read(values[first:first + len(pattern)])
+
+    # Fallback : toutes les dates (mots + numériques), min/max
+    dates: set[str] = set()
+    for match in DATE_WORD_SIGNATURE_RE.finditer(signature):
+        first = token_at[match.start()]
+        iso = _word_date_iso(*values[first:first + 3])
+        if iso:
+            dates.add(iso)
+    position = signature.find("n")
+    while position >= 0:
+        iso = _numeric_date_iso(values[token_at[position]])
+        if iso:
+            dates.add(iso)
+        position = signature.find("n", position + 1)
+    if not dates:
+        return None, None
+    ordered = sorted(dates)
+    return ordered[0], ordered[-1]
+
+
+def find_address(text: str) -> Optional[str]:
+    """Première adresse du texte, en temps linéaire.
+
+    Équivaut à une recherche `\\b\\d{1,4}\\s+(?:bis\\s+|ter\\s+)?[voie]+?\\b\\d{5}\\s+[ville]+` (la
+    première adresse est aussi celle du premier code postal qui a une voie devant lui), sans son
+    retour arrière sur les longs textes : seule la fenêtre précédant chaque code postal est examinée.
+    """
+    for postcode in ADDRESS_POSTCODE_RE.finditer(text):
+        start = postcode.start()
+        if start and (text[start - 1].isalnum() or text[start - 1] == "_"):
+            continue
+        # `pos`/`endpos` bornent la recherche sans couper le contexte : `\b` voit toujours le caractère précédent
+        street = ADDRESS_STREET_RE.search(text, max(0, start - ADDRESS_WINDOW), start)
+        if street is None:
+            continue
+        city = ADDRESS_CITY_RE.match(text, postcode.end())
+        if city is not None:
+            return text[street.start():city.end()]
+    return None
+
+
+SIMPLE_ATTR_SELECTOR_RE = re.compile(r"\[([\w-]+)(\*?=)['\"]?([^'\"\]]+)['\"]?\]")
+SIMPLE_TAG_SELECTOR_RE = re.compile(r"[\w-]+")
+
+
+@lru_cache(maxsize=None)
+def _compile_simple_selector(selector: str):
+    """Prédicat sur un Tag pour les sélecteurs simples de l'index : `tag`, `.classe`, `[attr*=x]`, `[attr='x']`."""
+    if selector.startswith("."):
+        class_name = selector[1:]
+        return lambda el: class_name in (el.get("class") or [])
+    attr_match = SIMPLE_ATTR_SELECTOR_RE.fullmatch(selector)
+    if attr_match:
+        attr, operator, needle = attr_match.groups()
+
+        def matches(el) -> bool:
+            value = el.get(attr)
+            if isinstance(value, list):
+                value = " ".join(value)
+            if not value:
+                return False
+            return needle in value if operator == "*=" else value == needle
+
+        return matches
+    return lambda el: el.name == selector
+
+
+class SelectorIndex:
+    """Sélecteurs compilés une fois pour être tous évalués en un seul parcours du DOM.
+
+    Chaque sélecteur est un sélecteur simple (cf. `_compile_simple_selector`), une liste de
+    sélecteurs simples séparés par des virgules, ou `ancêtre descendant`. Les sélecteurs sont
+    rangés par nom de balise, par classe et par attribut : un élément n'est testé que contre
+    ceux qui peuvent le concerner.
+    """
+
+    def __init__(self, selectors):
+        self.selectors = tuple(dict.fromkeys(selectors))
+        self._by_name: dict[str, list[str]] = {}
+        self._by_class: dict[str, list[str]] = {}
+        self._by_attr: list[tuple[str, str, str, str]] = []
+        self._descendants: list[tuple[str, str, str]] = []
+        self._registered: set[tuple[str, str]] = set()
+        for selector in self.selectors:
+            for alternative in selector.split(","):
+                parts = alternative.split()
+                if len(parts) == 2:
+                    ancestor, inner = parts
+                    self._add(ancestor, ancestor)
+                    self._add(inner, inner)
+                    self._descendants.append((ancestor, inner, selector))
+                elif len(parts) == 1:
+                    self._add(parts[0], selector)
+                else:
+                    raise ValueError(f"Sélecteur non indexable: {selector!r}")
+
+    def _add(self, simple: str, label: str) -> None:
+        if (simple, label) in self._registered:
+            return
+        self._registered.add((simple, label))
+        attr_match = SIMPLE_ATTR_SELECTOR_RE.fullmatch(simple)
+        if simple.startswith(".") and SIMPLE_TAG_SELECTOR_RE.fullmatch(simple[1:]):
+            self._by_class.setdefault(simple[1:], []).append(label)
+        elif attr_match:
+            attr, operator, needle = attr_match.groups()
+            self._by_attr.append((attr, operator, needle, label))
+        elif SIMPLE_TAG_SELECTOR_RE.fullmatch(simple):
+            self._by_name.setdefault(simple, []).append(label)
+        else:
+            raise ValueError(f"Sélecteur non indexable: {simple!r}")
+
+    def labels(self, el: Tag, inherited: frozenset[str]) -> list[str]:
+        """Sélecteurs satisfaits par `el` lui-même ; `inherited` réunit ceux de ses ancêtres."""
+        found = list(self._by_name.get(el.name, ()))
+        attrs = el.attrs
+        if attrs:
+            for class_name in attrs.get("class") or ():
+                found.extend(self._by_class.get(class_name, ()))
+            for attr, operator, needle, label in self._by_attr:
+                value = attrs.get(attr)
+                if not value:
+                    continue
+                if isinstance(value, list):
+                    value = " ".join(value)
+                if needle in value if operator == "*=" else value == needle:
+                    found.append(label)
+        for ancestor, inner, label in self._descendants:
+            if ancestor in inherited and inner in found:
+                found.append(label)
+        return list(dict.fromkeys(found)) if len(found) > 1 else found
 
 
 @dataclass(frozen=True)
-class SectionConfig:
-    programme_url: str
-    show_path_re: re.Pattern[str]
-    venue_path_re: Optional[re.Pattern[str]]
-    default_category: Optional[str]
+class ListingCardConfig:
+    """Carte d'une fiche sur une page programme : le conteneur du lien et les champs qu'elle affiche.
 
+    `fields` associe un type de champ (`title`, `venue`, `dates`, `release_date`, `price`,
+    `category`, `duration`) aux sélecteurs simples cherchés dans la carte, par priorité.
+    `covers` liste les champs de `Show` que la carte doit fournir pour tenir lieu de refresh
+    de la fiche détail en cache.
+    """
 
-SECTION_CONFIGS = {
-    "theatre": SectionConfig(
-        programme_url=THEATRE_PROGRAMME_URL,
-        show_path_re=re.compile(r"^/theatre/[^/]+-\d+/[^/]+-\d+\.html$"),
-        venue_path_re=re.compile(r"^/theatre/[^/]+-\d+(?:\.html)?$"),
-        default_category="théâtre",
-    ),
-    "cinema": SectionConfig(
-        programme_url=CINEMA_PROGRAMME_URL,
-        show_path_re=re.compile(r"^/cinema/evenement/[^/]+-\d+\.html$"),
-        venue_path_re=None,
-        default_category=None,
-    ),
+    containers: tuple[str, ...]
+    fields: dict[str, tuple[str, ...]]
+    covers: tuple[str, ...]
+    max_depth: int = 4
+
+
+@dataclass(frozen=True)
+class FieldSource:
+    """Une source d'un champ de fiche détail, et le lecteur qui en tire la valeur.
+
+    `kind` fixe ce que reçoit le lecteur `parse` (méthode d'OffiScraper, appelée avec la valeur) :
+    `elements` (éléments des sélecteurs `keys`, par priorité puis ordre du document),
+    `blocks` (blocs de texte couverts par `keys`, tous si vide), `jsonld` (valeurs des
+    clés `keys`), `meta` (contenu de la première balise `attr=valeur` de `keys` présente),
+    `text` (texte complet, ou 1er groupe de `pattern`), `url` (URL de la fiche) ou
+    `field` (champ `keys[0]` déjà extrait). Sans `parse`, la valeur brute est gardée.
+    `merge="widen"` élargit une plage (début, fin) déjà connue au lieu de la laisser telle quelle.
+    `venue_index` marque les sources de référence de l'index des lieux (`VenueIndex`).
+    """
+
+    kind: str
+    keys: tuple[str, ...] = ()
+    parse: Optional[Callable[[OffiScraper, Any], Any]] = None
+    pattern: Optional[re.Pattern[str]] = None
+    url: bool = False
+    merge: str = "fill"
+    venue_index: bool = False
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """Champ(s) de `Show` extraits d'une fiche détail : `sources` essayées dans l'ordre tant qu'une cible manque.
+
+    Le temps passé est mesuré sous `stage` (`extract_<name>` par défaut).
+    """
+
+    name: str
+    targets: tuple[str, ...]
+    sources: tuple[FieldSource, ...]
+    stage: Optional[str] = None
+
+    @property
+    def timing_stage(self) -> str:
+        return self.stage or f"extract_{self.name}"
+
+
+# Champs de programmation d'une carte : toujours plus frais que la fiche en cache, qu'ils remplacent
+CARD_LISTING_FIELDS = ("date_start", "date_end", "price_min_eur", "price_max_eur")
+# Avec `card_refresh`, une fiche dont la carte couvre `covers` ne refetch sa page détail (description,
+# adresse…) que passé ce délai
+CARD_REFRESH_AFTER = timedelta(days=30)
+# Au-delà, un checkpoint laissé par un run interrompu n'est plus repris : la sortie partielle serait périmée
+CHECKPOINT_MAX_AGE = timedelta(hours=24)
+# Fiche du cache ni vue au programme ni recrawlée depuis ce délai : purgée même si sa section est incomplète
+CACHE_UNSEEN_TTL = timedelta(days=180)
+# Lieu de l'index non relu depuis ce délai : plus servi aux seeds, donc relu sur la prochaine fiche du lieu
+VENUE_MAX_AGE = timedelta(days=90)
+
+
+def _keep_detail_tag(name: str, attrs: dict) -> bool:
+    """Strainer des fiches détail : métadonnées du <head>, JSON-LD et contenu du <body>.
+
+    `html`/`head`/`body` sont refusés pour que chacun de leurs enfants soit évalué
+    séparément ; les scripts non JSON-LD et les balises de DETAIL_SKIPPED_TAGS sont écartés.
+    Un `parse_only` ne filtre que ces enfants directs : les mêmes balises imbriquées plus bas
+    sont parsées, puis ignorées par le parcours de `PageContext.dom`, et le texte nu posé
+    directement dans <body> (hors de toute balise) est perdu.
+    """
+    if name in ("html", "head", "body"):
+        return False
+    if name == "script":
+        return (attrs.get("type") or "").lower() == "application/ld+json"
+    return name not in DETAIL_SKIPPED_TAGS
+
+
+class _StartTag:
+    """Balise ouvrante vue par un strainer (nom + attributs bruts), interrogeable par les sélecteurs simples."""
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def get(self, key: str, default=None):
+        value = self.attrs.get(key, default)
+        return value.split() if key == "class" and isinstance(value, str) else value
+
+
+def _keep_programme_tag(name: str, attrs: dict) -> bool:
+    """Strainer des pages programme : les liens vers les fiches et les cartes qui les entourent."""
+    if name == "a":
+        return bool(attrs.get("href"))
+    tag = _StartTag(name, attrs)
+    return any(_compile_simple_selector(selector)(tag) for selector in CARD_CONTAINER_SELECTORS)
+
+
+PAGE_STRAINERS = {
+    # Les pages programme ne servent qu'à collecter les liens vers les fiches et leurs cartes
+    "programme": SoupStrainer(_keep_programme_tag),
+    "detail": SoupStrainer(_keep_detail_tag),
 }
 
 
@@ -175,6 +519,95 @@ class Show:
         fields = [self.title, self.venue, self.date_start, self.description]
         return sum(1 for f in fields if f is not None) <= 1
 
+    def fingerprint(self) -> str:
+        """Empreinte stable du contenu : deux crawls d'une fiche inchangée donnent la même."""
+        content = {name: value for name, value in asdict(self).items() if name not in FINGERPRINT_EXCLUDED}
+        return hashlib.sha1(json.dumps(content, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+SHOW_FIELDS = tuple(f.name for f in fields(Show))
+FINGERPRINT_EXCLUDED = frozenset({"crawled_at"})
+# Compteurs ventilés par étiquette (dict) -> nom du label Prometheus
+LABELLED_COUNTERS = {"refresh_rules": "rule", "refresh_avoided": "rule", "card_fields": "field"}
+CHANGE_COUNTERS = ("shows_added", "shows_changed", "shows_unchanged")
+
+
+# Bornes (s) des histogrammes de durée, du parsing d'un bloc de texte aux attentes du throttle
+TIMING_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRICS_PREFIX = "offi_crawl"
+LOGGED_TIMINGS = ("throttle", "retry_wait", "http_get", "soup", "extract", "validate_show")
+
+
+@dataclass
+class TimingHistogram:
+    """Histogramme de durées à bornes fixes (`TIMING_BUCKETS`), cumulable entre processus."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(TIMING_BUCKETS) + 1))
+    count: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(TIMING_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total_s += seconds
+        self.max_s = max(self.max_s, seconds)
+
+    def merge(self, other: "TimingHistogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_s += other.total_s
+        self.max_s = max(self.max_s, other.max_s)
+
+    def quantile(self, q: float) -> float:
+        """Borne supérieure du bucket contenant le quantile `q` (le max pour le dernier bucket)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, bucket_count in zip(TIMING_BUCKETS, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(bound, self.max_s)
+        return self.max_s
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_s": round(self.total_s, 6),
+            "max_s": round(self.max_s, 6),
+            "p50_s": self.quantile(0.5),
+            "p95_s": self.quantile(0.95),
+            "buckets": {str(bound): n for bound, n in zip((*TIMING_BUCKETS, "+Inf"), self.counts)},
+        }
+
+
+def _timed(stage: str):
+    """Décorateur des méthodes d'OffiScraper : durée de chaque appel dans `stats.timings[stage]`."""
+
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.stats.observe(stage, time.perf_counter() - started)
+
+        return wrapper
+
+    return decorate
+
+
+def _write_atomic(path: str, content: str) -> None:
+    """Le fichier est remplacé d'un coup : un collecteur ne lit jamais une version partielle."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
 
 @dataclass
 class CrawlStats:
@@ -188,7 +621,1390 @@ class CrawlStats:
     request_failures: int = 0
     cached_loaded: int = 0
     cached_reused: int = 0
+    cached_written: int = 0
     detail_fetches: int = 0
+    not_modified: int = 0
+    bytes_saved: int = 0
+    current_rate: float = 0.0
+    backoff_events: int = 0
+    archived_responses: int = 0
+    shows_added: int = 0
+    shows_changed: int = 0
+    shows_unchanged: int = 0
+    shows_removed: int = 0
+    bytes_downloaded: int = 0
+    venue_index_hits: int = 0
+    venues_added: int = 0
+    venues_changed: int = 0
+    budget_deferred: int = 0
+    budget_skipped_new: int = 0
+    # Par règle de la politique de refresh : fiches en cache décidées, et refetchs évités par rapport
+    # au refresh à âge fixe (`--refresh-after-hours`)
+    refresh_rules: dict[str, int] = field(default_factory=dict)
+    refresh_avoided: dict[str, int] = field(default_factory=dict)
+    # Par champ de `Show` : valeurs lues sur les cartes des pages programme
+    card_fields: dict[str, int] = field(default_factory=dict)
+    pipeline_stages: dict = field(default_factory=dict)
+    sections: dict[str, dict] = field(default_factory=dict)
+    timings: dict[str, TimingHistogram] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """Incrément atomique d'un compteur (les workers de détail partagent les stats)."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def incr_labelled(self, name: str, label: str, amount: int = 1) -> None:
+        """Incrément atomique d'un compteur par étiquette (`LABELLED_COUNTERS`)."""
+        with self._lock:
+            counts = getattr(self, name)
+            counts[label] = counts.get(label, 0) + amount
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.timings.get(stage)
+            if histogram is None:
+                histogram = self.timings[stage] = TimingHistogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timed(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def merge_timings(self, timings: dict[str, TimingHistogram]) -> None:
+        """Ajoute les durées mesurées ailleurs (processus de parsing du moteur pipeline)."""
+        with self._lock:
+            for stage, other in timings.items():
+                self.timings.setdefault(stage, TimingHistogram()).merge(other)
+
+    def merge_counters(self, other: "CrawlStats") -> None:
+        """Ajoute les compteurs d'un crawl de section ; `current_rate`, une jauge, n'est pas cumulé."""
+        with self._lock:
+            for name, value in other.counters().items():
+                if name != "current_rate":
+                    setattr(self, name, getattr(self, name) + value)
+            for name in LABELLED_COUNTERS:
+                counts = getattr(self, name)
+                for label, count in getattr(other, name).items():
+                    counts[label] = counts.get(label, 0) + count
+
+    def counters(self) -> dict[str, float]:
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if not f.name.startswith("_") and isinstance(getattr(self, f.name), (int, float))
+        }
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "counters": self.counters(),
+                "timings": {stage: h.to_dict() for stage, h in sorted(self.timings.items())},
+                **{name: dict(sorted(getattr(self, name).items())) for name in LABELLED_COUNTERS},
+                "pipeline_stages": dict(self.pipeline_stages),
+                "sections": dict(self.sections),
+            }
+
+    def write_metrics_json(self, path: str, **labels: str) -> None:
+        payload = {"generated_at": datetime.now(timezone.utc).isoformat(), "labels": labels, **self.to_dict()}
+        _write_atomic(path, json.dumps(payload, ensure_ascii=False, indent=2) + "\n")
+
+    def prometheus_text(self, **labels: str) -> str:
+        """Format texte Prometheus (collecteur textfile de node_exporter)."""
+
+        def label_set(**extra: str) -> str:
+            merged = {**labels, **extra}
+            if not merged:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(merged.items())) + "}"
+
+        lines: list[str] = []
+        for name, value in self.counters().items():
+            metric = f"{METRICS_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{label_set()} {value}")
+        metric = f"{METRICS_PREFIX}_stage_duration_seconds"
+        lines.append(f"# HELP {metric} Durée des étapes du crawl (throttle, réseau, parsing, extracteurs)")
+        lines.append(f"# TYPE {metric} histogram")
+        with self._lock:
+            timings = sorted(self.timings.items())
+        for stage, histogram in timings:
+            cumulative = 0
+            for bound, bucket_count in zip((*TIMING_BUCKETS, "+Inf"), histogram.counts):
+                cumulative += bucket_count
+                lines.append(f"{metric}_bucket{label_set(stage=stage, le=str(bound))} {cumulative}")
+            lines.append(f"{metric}_sum{label_set(stage=stage)} {histogram.total_s:.6f}")
+            lines.append(f"{metric}_count{label_set(stage=stage)} {histogram.count}")
+        for name, label in LABELLED_COUNTERS.items():
+            metric = f"{METRICS_PREFIX}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            for value, count in sorted(getattr(self, name).items()):
+                lines.append(f"{metric}{label_set(**{label: value})} {count}")
+        for stage, report in sorted(self.pipeline_stages.items()):
+            for key in ("utilization", "queue_max", "queue_mean"):
+                lines.append(f"{METRICS_PREFIX}_pipeline_{key}{label_set(stage=stage)} {report[key]}")
+        lines.append(f"{METRICS_PREFIX}_last_run_timestamp_seconds{label_set()} {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus_textfile(self, path: str, **labels: str) -> None:
+        _write_atomic(path, self.prometheus_text(**labels))
+
+
+class AdaptiveRate:
+    """Débit de requêtes AIMD, en requêtes/s, borné par `min_rate` et `max_rate`.
+
+    Chaque réponse saine (2xx/304) augmente le débit de `increase` ; un 403/429/5xx, une erreur
+    réseau ou un p95 de latence qui dépasse `latency_factor` fois le meilleur p95 observé le
+    multiplie par `decrease`. Après une baisse, les signaux de surcharge sont ignorés pendant
+    deux intervalles, le temps que les requêtes déjà parties reviennent.
+    """
+
+    OVERLOAD_STATUS_CODES = {403, 429}
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase: float = 0.02,
+        decrease: float = 0.5,
+        latency_window: int = 20,
+        latency_factor: float = 2.0,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self._baseline_p95: Optional[float] = None
+        self._hold_until = 0.0
+        self._lock = threading.Lock()
+
+    def interval(self) -> float:
+        with self._lock:
+            return 1 / self.rate
+
+    def _p95(self) -> float:
+        ordered = sorted(self._latencies)
+        return ordered[len(ordered) - 1 - len(ordered) // 20]
+
+    def observe(self, status_code: Optional[int], latency: float) -> Optional[str]:
+        """Ajuste le débit après une réponse (`status_code` None : erreur réseau).
+
+        Renvoie la raison de la baisse si le débit vient d'être réduit, sinon None.
+        """
+        with self._lock:
+            reason = None
+            if status_code is None:
+                reason = "erreur réseau"
+            elif status_code in self.OVERLOAD_STATUS_CODES or status_code >= 500:
+                reason = f"HTTP {status_code}"
+            elif status_code in {200, 304}:
+                self._latencies.append(latency)
+                if len(self._latencies) == self._latencies.maxlen:
+                    p95 = self._p95()
+                    if self._baseline_p95 is None or p95 < self._baseline_p95:
+                        self._baseline_p95 = p95
+                    elif p95 > self._baseline_p95 * self.latency_factor:
+                        reason = f"p95 latence {p95:.2f}s"
+                if reason is None:
+                    self.rate = min(self.max_rate, self.rate + self.increase)
+                    return None
+            else:
+                return None
+
+            now = time.monotonic()
+            if now < self._hold_until:
+                return None
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._latencies.clear()
+            self._hold_until = now + 2 / self.rate
+            return reason
+
+
+class RateLimiter:
+    """Budget de requêtes global vers Offi, partagé par tous les threads.
+
+    Chaque appel à `wait` réserve le prochain créneau libre : deux départs de requête
+    sont toujours espacés d'un délai tiré entre `min_delay` et `max_delay`, quel que
+    soit le nombre de workers. Avec un `AdaptiveRate`, l'espacement suit son débit courant
+    (±10 %), sans descendre sous `1 / max_rate`.
+    """
+
+    def __init__(self, min_delay: float, max_delay: float, adaptive: Optional[AdaptiveRate] = None):
+        self.min_delay = min_delay
+        self.max_delay = max(max_delay, min_delay)
+        self.adaptive = adaptive
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def _next_interval(self) -> float:
+        if self.adaptive is None:
+            return random.uniform(self.min_delay, self.max_delay)
+        return max(1 / self.adaptive.max_rate, self.adaptive.interval() * random.uniform(0.9, 1.1))
+
+    def reserve(self) -> float:
+        """Réserve un créneau et renvoie l'attente nécessaire avant de l'utiliser."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._next_interval()
+            return slot - now
+
+    def wait(self, until: Optional[float] = None) -> bool:
+        """Attend le créneau réservé ; False, sans dépasser `until` (horloge monotone), s'il tombe après."""
+        delay = self.reserve()
+        if until is not None and time.monotonic() + delay >= until:
+            time.sleep(max(until - time.monotonic(), 0.0))
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+
+class TokenBucket:
+    """Limiteur asyncio du moteur `--engine async` : `rate` jetons/s, au plus `capacity` d'avance.
+
+    Avec un `AdaptiveRate`, `rate` suit son débit courant. Un jeton manquant est pris à crédit et
+    l'attente correspond à la dette : la réservation se fait sous un verrou de thread, si bien qu'un
+    même bucket sert aux boucles asyncio de plusieurs sections crawlées en parallèle.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, adaptive: Optional[AdaptiveRate] = None):
+        self._rate = rate
+        self.adaptive = adaptive
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.adaptive.rate if self.adaptive else self._rate
+
+    def reserve(self) -> float:
+        """Prend un jeton et renvoie l'attente avant de s'en servir."""
+        rate = self.rate
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / rate if self._tokens < 0 else 0.0
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class _DeadlineReached(Exception):
+    """Levée par `_fetch_html` quand l'attente suivante dépasserait la deadline du budget."""
+
+
+class CrawlBudget:
+    """Budget d'un run borné (`--max-requests`, `--deadline`), partagé par toutes les sections.
+
+    Chaque tentative HTTP est décomptée ; le budget est vérifié avant chaque page, les requêtes
+    déjà en vol se terminent. La deadline court depuis `start`, appelé au lancement du crawl.
+    """
+
+    def __init__(self, max_requests: Optional[int] = None, deadline_s: Optional[float] = None):
+        self.max_requests = max_requests
+        self.deadline_s = deadline_s
+        self.deadline: Optional[float] = None
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.start()
+
+    def start(self) -> None:
+        """(Re)lance la deadline : `deadline_s` à partir de maintenant."""
+        self.deadline = time.monotonic() + self.deadline_s if self.deadline_s is not None else None
+
+    def charge(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def exhausted(self) -> Optional[str]:
+        """Raison de l'épuisement du budget, ou None s'il en reste."""
+        if self.max_requests is not None and self.requests >= self.max_requests:
+            return f"{self.requests} requêtes"
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "deadline atteinte"
+        return None
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    html: str
+    not_modified: bool = False
+
+
+@dataclass
+class HttpCacheEntry:
+    url: str
+    body: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # Octets reçus pour ce corps, mesurés comme `bytes_downloaded` (None : entrée antérieure)
+    size: Optional[int] = None
+
+    def validator_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """Cache HTTP persistant : une entrée gzip (validateurs + corps) par URL.
+
+    Seules les réponses portant un `ETag` ou un `Last-Modified` sont conservées, puisque
+    le cache ne sert qu'à émettre des requêtes conditionnelles. Une entrée ni réécrite ni
+    revalidée (304) depuis `max_age` est périmée ; à l'ouverture, les entrées périmées sont
+    supprimées, puis les plus anciennes tant que le cache dépasse `max_bytes`.
+    """
+
+    def __init__(
+        self, directory: str, max_age: Optional[timedelta] = timedelta(days=30), max_bytes: Optional[int] = None
+    ):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.prune()
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json.gz")
+
+    def _expired(self, mtime: float) -> bool:
+        return self.max_age is not None and time.time() - mtime > self.max_age.total_seconds()
+
+    def prune(self) -> int:
+        """Supprime les entrées périmées, puis les plus anciennes au-delà de `max_bytes`."""
+        entries: list[tuple[float, int, str]] = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json.gz"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if not self._expired(mtime) and (self.max_bytes is None or total <= self.max_bytes):
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        if removed:
+            logging.info("Cache HTTP %s : %s entrées supprimées (%s octets restants)", self.directory, removed, total)
+        return removed
+
+    def get(self, url: str) -> Optional[HttpCacheEntry]:
+        path = self._path(url)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        if self._expired(mtime):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, EOFError, json.JSONDecodeError) as exc:
+            logging.warning("Entrée de cache HTTP illisible pour %s: %s", url, exc)
+            return None
+        if payload.get("url") != url or not isinstance(payload.get("body"), str):
+            return None
+        return HttpCacheEntry(
+            url=url,
+            body=payload["body"],
+            etag=payload.get("etag"),
+            last_modified=payload.get("last_modified"),
+            size=payload.get("size"),
+        )
+
+    def store(self, url: str, headers, body: str, size: Optional[int] = None) -> None:
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        entry = HttpCacheEntry(url=url, body=body, etag=etag, last_modified=last_modified, size=size)
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(asdict(entry), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def touch(self, url: str) -> None:
+        """Entrée revalidée par un 304 : sa période de validité repart de zéro."""
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+
+@dataclass
+class ArchivedResponse:
+    url: str
+    status: int
+    headers: dict
+    offset: int
+    length: int
+    recorded_at: Optional[str] = None
+
+
+class PageArchive:
+    """Archive append-only des réponses HTTP de `--record`, rejouée par `--replay`.
+
+    `bodies.bin` concatène les corps, un membre gzip par réponse ; `index.jsonl` décrit chaque
+    réponse (URL, statut, en-têtes, position du corps) et n'est écrit qu'après le corps, si bien
+    qu'une archive interrompue reste lisible.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.bodies_path = os.path.join(directory, "bodies.bin")
+        self.index_path = os.path.join(directory, "index.jsonl")
+        self._lock = threading.Lock()
+        self._index: Optional[dict[str, list[ArchivedResponse]]] = None
+
+    def record(self, url: str, status: int, headers, body: str) -> None:
+        data = gzip.compress(body.encode("utf-8"), mtime=0)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.bodies_path, "ab") as f:
+                offset = f.tell()
+                f.write(data)
+            entry = ArchivedResponse(
+                url=url,
+                status=status,
+                headers=dict(headers),
+                offset=offset,
+                length=len(data),
+                recorded_at=datetime.now(timezone.utc).isoformat(),
+            )
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+            if self._index is not None:
+                self._index.setdefault(url, []).append(entry)
+
+    def _load_index(self) -> dict[str, list[ArchivedResponse]]:
+        if self._index is None:
+            index: dict[str, list[ArchivedResponse]] = {}
+            if os.path.exists(self.index_path):
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = ArchivedResponse(**json.loads(line))
+                            index.setdefault(entry.url, []).append(entry)
+            self._index = index
+        return self._index
+
+    def responses(self, url: str) -> list[ArchivedResponse]:
+        """Réponses archivées pour `url`, dans l'ordre où elles ont été reçues."""
+        with self._lock:
+            return list(self._load_index().get(url, []))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._load_index().values())
+
+    def latest_pages(self) -> list[ArchivedResponse]:
+        """Dernière réponse exploitable (200/304) de chaque URL, dans l'ordre de première apparition."""
+        with self._lock:
+            index = self._load_index()
+            latest = []
+            for entries in index.values():
+                usable = [entry for entry in entries if entry.status in (200, 304)]
+                if usable:
+                    latest.append(usable[-1])
+            return latest
+
+    def body(self, entry: ArchivedResponse) -> str:
+        with open(self.bodies_path, "rb") as f:
+            f.seek(entry.offset)
+            return gzip.decompress(f.read(entry.length)).decode("utf-8")
+
+
+@dataclass
+class ReplayResponse:
+    status_code: int
+    text: str
+    headers: CaseInsensitiveDict
+    encoding: Optional[str] = "utf-8"
+
+
+class ReplaySession:
+    """Remplace `requests.Session` en `--replay` : sert les réponses d'une `PageArchive`, sans réseau.
+
+    Les réponses d'une même URL sont rejouées dans l'ordre d'enregistrement (retries compris),
+    la dernière resservant ensuite ; une URL absente de l'archive répond 404. Un 304 enregistré
+    (corps tiré du cache HTTP) est rejoué en 200, le replay n'ayant pas de cache HTTP ; un 304
+    ne portant en général pas de `Content-Type`, celui d'une page HTML lui est ajouté.
+    """
+
+    def __init__(self, archive: PageArchive):
+        self.archive = archive
+        self.headers: dict[str, str] = {}
+        self._served: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def mount(self, prefix: str, adapter) -> None:
+        pass
+
+    def get(self, url: str, timeout=None, headers=None) -> ReplayResponse:
+        entries = self.archive.responses(url)
+        if not entries:
+            return ReplayResponse(status_code=404, text="", headers=CaseInsensitiveDict())
+        with self._lock:
+            served = self._served.get(url, 0)
+            self._served[url] = served + 1
+        entry = entries[min(served, len(entries) - 1)]
+        response_headers = CaseInsensitiveDict(entry.headers)
+        if entry.status == 304:
+            response_headers.setdefault("content-type", "text/html; charset=utf-8")
+        return ReplayResponse(
+            status_code=200 if entry.status == 304 else entry.status,
+            text=self.archive.body(entry),
+            headers=response_headers,
+        )
+
+
+class FixedRefreshPolicy:
+    """Une fiche en cache complète est refetchée dès qu'elle a plus de `refresh_after` (0 : jamais)."""
+
+    name = "fixed"
+
+    def __init__(self, refresh_after: timedelta):
+        self.refresh_after = refresh_after
+
+    @staticmethod
+    def due(age: Optional[timedelta], interval: timedelta) -> bool:
+        if interval == timedelta(0):
+            return False
+        return age is None or age > interval
+
+    def decide(self, show: Show, age: Optional[timedelta], unchanged_runs: int, today: date) -> tuple[bool, str]:
+        """(refetch ?, règle appliquée) pour une fiche complète, vieille de `age` (None : date inconnue)."""
+        return self.due(age, self.refresh_after), "age"
+
+
+class LifecycleRefreshPolicy(FixedRefreshPolicy):
+    """Refresh selon le cycle de vie de la fiche plutôt qu'à âge fixe.
+
+    - `ended` : date de fin passée, la fiche n'est plus jamais refetchée ;
+    - `opening_soon` : première dans moins de `opening_soon_days`, refresh toutes les `opening_soon_after` ;
+    - `far_future` : première dans plus de `far_future_days`, refresh toutes les `far_future_after` ;
+    - `stable` : fiche inchangée aux `n` derniers refetchs, intervalle `refresh_after * 2**n`
+      plafonné à `max_interval` ; un changement remet le compteur à zéro.
+    """
+
+    name = "lifecycle"
+
+    def __init__(
+        self,
+        refresh_after: timedelta,
+        opening_soon_days: int = 7,
+        opening_soon_after: timedelta = timedelta(hours=12),
+        far_future_days: int = 60,
+        far_future_after: timedelta = timedelta(days=14),
+        max_interval: timedelta = timedelta(days=30),
+    ):
+        super().__init__(refresh_after)
+        self.opening_soon_days = opening_soon_days
+        self.opening_soon_after = opening_soon_after
+        self.far_future_days = far_future_days
+        self.far_future_after = far_future_after
+        self.max_interval = max_interval
+
+    @staticmethod
+    def _date(value: Optional[str]) -> Optional[date]:
+        try:
+            return date.fromisoformat(value[:10]) if value else None
+        except ValueError:
+            return None
+
+    def decide(self, show: Show, age: Optional[timedelta], unchanged_runs: int, today: date) -> tuple[bool, str]:
+        date_end = self._date(show.date_end)
+        if date_end is not None and date_end < today:
+            return False, "ended"
+        if self.refresh_after == timedelta(0):
+            return False, "age"
+        date_start = self._date(show.date_start)
+        if date_start is not None and date_start >= today:
+            days_ahead = (date_start - today).days
+            if days_ahead <= self.opening_soon_days:
+                return self.due(age, min(self.opening_soon_after, self.refresh_after)), "opening_soon"
+            if days_ahead > self.far_future_days:
+                return self.due(age, max(self.far_future_after, self.refresh_after)), "far_future"
+        if unchanged_runs > 0:
+            interval = min(self.refresh_after * 2 ** min(unchanged_runs, 16), max(self.max_interval, self.refresh_after))
+            return self.due(age, interval), "stable"
+        return self.due(age, self.refresh_after), "age"
+
+
+class ShowStore:
+    """Cache des fiches sur disque (SQLite en WAL), indexé par URL et par section.
+
+    Les fiches ne sont décodées qu'à la lecture (`get`) et les fiches du crawl y sont réécrites
+    au fil de l'eau : ni le démarrage ni la mémoire ne dépendent de la taille du catalogue.
+    Une ligne n'est remplacée que par une fiche crawlée au moins aussi récemment.
+    """
+
+    COMMIT_EVERY = 100
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._closed = False
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS shows ("
+            "url TEXT PRIMARY KEY, section TEXT, crawled_at TEXT, payload TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS shows_section ON shows(section)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        # Nombre de refetchs consécutifs sans changement de contenu, pour le refresh à backoff
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS refresh (url TEXT PRIMARY KEY, unchanged_runs INTEGER NOT NULL)"
+        )
+        venue_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(venues)")}
+        if venue_columns and "updated_at" not in venue_columns:
+            # Lieux indexés avant le contrôle de provenance (nom de carte, adresse du texte libre) : relus
+            logging.info("Index des lieux antérieur au contrôle de provenance : vidé")
+            self._conn.execute("DROP TABLE venues")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS venues ("
+            "slug TEXT PRIMARY KEY, name TEXT NOT NULL, address TEXT NOT NULL, updated_at TEXT)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _fingerprint(path: str) -> Optional[str]:
+        """Empreinte du contenu : survit aux copies et déplacements du wrapper, contrairement au mtime."""
+        digest = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return f"sha256:{digest.hexdigest()}"
+
+    def get(self, url: str) -> Optional[Show]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM shows WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        payload = json.loads(row[0])
+        return Show(**{name: payload.get(name) for name in SHOW_FIELDS})
+
+    def put(self, show: Show) -> None:
+        self.put_many([show])
+
+    def put_many(self, shows) -> int:
+        rows = [
+            (show.url, show.section, show.crawled_at, json.dumps(asdict(show), ensure_ascii=False))
+            for show in shows
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO shows (url, section, crawled_at, payload) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET section = excluded.section, crawled_at = excluded.crawled_at, "
+                "payload = excluded.payload "
+                "WHERE shows.crawled_at IS NULL OR excluded.crawled_at >= shows.crawled_at",
+                rows,
+            )
+            self._pending += len(rows)
+            if self._pending >= self.COMMIT_EVERY:
+                self._conn.commit()
+                self._pending = 0
+        return len(rows)
+
+    def unchanged_runs(self, url: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT unchanged_runs FROM refresh WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else 0
+
+    def record_refresh(self, url: str, changed: bool) -> None:
+        """Après un refetch : remet le compteur à zéro si la fiche a changé, l'incrémente sinon."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO refresh (url, unchanged_runs) VALUES (?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET unchanged_runs = "
+                "CASE WHEN excluded.unchanged_runs = 0 THEN 0 ELSE refresh.unchanged_runs + 1 END",
+                (url, 0 if changed else 1),
+            )
+            self._pending += 1
+            if self._pending >= self.COMMIT_EVERY:
+                self._conn.commit()
+                self._pending = 0
+
+    def delete_many(self, urls) -> int:
+        urls = [(url,) for url in urls]
+        with self._lock:
+            self._conn.executemany("DELETE FROM refresh WHERE url = ?", urls)
+            deleted = self._conn.executemany("DELETE FROM shows WHERE url = ?", urls).rowcount
+            self._conn.commit()
+            self._pending = 0
+        return deleted
+
+    def delete_unseen_before(self, seen_urls: set[str], before: str, sections) -> list[str]:
+        """Supprime les fiches de `sections` absentes de `seen_urls` et crawlées avant `before` (ISO 8601).
+
+        Les autres sections n'ont pas été parcourues : leurs fiches ne sont pas dans `seen_urls`.
+        """
+        sections = list(sections)
+        if not sections:
+            return []
+        placeholders = ",".join("?" * len(sections))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url FROM shows WHERE (crawled_at IS NULL OR crawled_at < ?) AND section IN ({placeholders})",
+                (before, *sections),
+            ).fetchall()
+        stale = [url for (url,) in rows if url not in seen_urls]
+        self.delete_many(stale)
+        return stale
+
+    def venues(self) -> list["Venue"]:
+        with self._lock:
+            rows = self._conn.execute("SELECT slug, name, address, updated_at FROM venues").fetchall()
+        return [Venue(*row) for row in rows]
+
+    def put_venue(self, venue: "Venue") -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO venues (slug, name, address, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(slug) DO UPDATE SET "
+                "name = excluded.name, address = excluded.address, updated_at = excluded.updated_at",
+                (venue.slug, venue.name, venue.address, venue.updated_at),
+            )
+            self._conn.commit()
+            self._pending = 0
+
+    def delete_venue(self, slug: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM venues WHERE slug = ?", (slug,))
+            self._conn.commit()
+            self._pending = 0
+
+    def urls(self, section: str) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT url FROM shows WHERE section = ?", (section,))]
+
+    def count(self, section: Optional[str] = None) -> int:
+        with self._lock:
+            if section is None:
+                return self._conn.execute("SELECT COUNT(*) FROM shows").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM shows WHERE section = ?", (section,)).fetchone()[0]
+
+    def is_synced_with(self, path: str) -> bool:
+        """Vrai si le JSONL `path` a déjà été importé (ou écrit par un crawl qui a alimenté ce cache)."""
+        fingerprint = self._fingerprint(path)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'synced_source'").fetchone()
+        return fingerprint is not None and row is not None and row[0] == fingerprint
+
+    def mark_synced(self, path: str) -> None:
+        fingerprint = self._fingerprint(path)
+        if fingerprint is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('synced_source', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (fingerprint,),
+            )
+            self._conn.commit()
+            self._pending = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._conn.commit()
+            self._conn.close()
+            self._closed = True
+
+
+@dataclass(frozen=True)
+class Venue:
+    slug: str
+    name: str
+    address: str
+    # Dernière lecture du lieu sur une fiche (ISO 8601)
+    updated_at: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "slug": self.slug,
+            "name": self.name,
+            "address": self.address,
+            "url": f"{BASE_URL}/theatre/{self.slug}.html",
+        }
+
+    def is_fresh(self, max_age: Optional[timedelta]) -> bool:
+        if max_age is None:
+            return True
+        try:
+            updated_at = datetime.fromisoformat(self.updated_at) if self.updated_at else None
+        except ValueError:
+            return False
+        return updated_at is not None and datetime.now(timezone.utc) - updated_at < max_age
+
+
+class VenueIndex:
+    """Lieux connus, indexés par le slug de l'URL des fiches (`theatre-montparnasse-2825`).
+
+    Nom canonique et adresse d'un lieu sont lus sur une fiche, puis repris pour toutes ses autres
+    fiches. Seul un lieu lu sur ses sources de référence (fil d'Ariane pour le nom, sélecteurs
+    d'adresse pour l'adresse) est proposé (`propose`), puis indexé quand sa fiche est acceptée
+    (`accept`). Un lieu non relu depuis `max_age` n'est plus servi : la fiche suivante le relit et
+    met l'entrée à jour. Avec un cache de fiches, l'index est persisté dans sa table `venues`.
+    """
+
+    def __init__(self, store: Optional[ShowStore] = None, max_age: Optional[timedelta] = VENUE_MAX_AGE):
+        self._store = store
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._venues: dict[str, Venue] = {venue.slug: venue for venue in store.venues()} if store else {}
+        self._proposed: dict[str, Venue] = {}
+
+    def __len__(self) -> int:
+        return len(self._venues)
+
+    def get(self, slug: Optional[str]) -> Optional[Venue]:
+        """Lieu indexé et encore frais, ou None."""
+        venue = self._venues.get(slug) if slug else None
+        return venue if venue is not None and venue.is_fresh(self.max_age) else None
+
+    def propose(self, show_url: str, venue: Venue) -> None:
+        """Lieu lu sur la fiche `show_url`, indexé si la fiche est acceptée."""
+        with self._lock:
+            self._proposed[show_url] = venue
+
+    def pop_proposed(self, show_url: str) -> Optional[Venue]:
+        with self._lock:
+            return self._proposed.pop(show_url, None)
+
+    def clear_proposed(self) -> None:
+        """Oublie les lieux proposés par des fiches jamais acceptées (crawl précédent interrompu)."""
+        with self._lock:
+            self._proposed.clear()
+
+    def accept(self, show_url: str) -> Optional[str]:
+        """Indexe le lieu proposé par la fiche : "added", "changed" (nom ou adresse relus différents) ou None."""
+        venue = self.pop_proposed(show_url)
+        if venue is None:
+            return None
+        venue = replace(venue, updated_at=datetime.now(timezone.utc).isoformat())
+        with self._lock:
+            previous = self._venues.get(venue.slug)
+            self._venues[venue.slug] = venue
+        if self._store is not None:
+            self._store.put_venue(venue)
+        if previous is None:
+            return "added"
+        if (previous.name, previous.address) != (venue.name, venue.address):
+            return "changed"
+        return None
+
+    def invalidate(self, slug: str) -> bool:
+        """Retire un lieu de l'index (et du cache) ; la prochaine fiche du lieu le relira."""
+        with self._lock:
+            removed = self._venues.pop(slug, None) is not None
+        if self._store is not None:
+            self._store.delete_venue(slug)
+        return removed
+
+    def write_jsonl(self, path: str, compress: str = "none") -> bool:
+        writer = JsonlWriter(path, compress=compress)
+        try:
+            with self._lock:
+                venues = sorted(self._venues.values(), key=lambda venue: venue.slug)
+            for venue in venues:
+                writer.write(venue.to_dict())
+        finally:
+            writer.close()
+        return writer.commit()
+
+
+PIPELINE_DONE = object()
+
+
+class PipelineStage:
+    """Une étape du moteur `--engine pipeline` : sa file d'entrée bornée et l'occupation de ses workers.
+
+    `get` et `put` attendent par tranches courtes pour rester interruptibles par `stop` ; la
+    profondeur de la file est échantillonnée à chaque lecture.
+    """
+
+    def __init__(self, name: str, workers: int, inbox: Optional[queue.Queue] = None):
+        self.name = name
+        self.workers = workers
+        self.inbox = inbox
+        self.items = 0
+        self.busy_s = 0.0
+        self.depth_max = 0
+        self._depth_total = 0
+        self._samples = 0
+        self._lock = threading.Lock()
+
+    def get(self, stop: threading.Event):
+        depth = self.inbox.qsize()
+        with self._lock:
+            self.depth_max = max(self.depth_max, depth)
+            self._depth_total += depth
+            self._samples += 1
+        while True:
+            try:
+                return self.inbox.get(timeout=0.1)
+            except queue.Empty:
+                if stop.is_set():
+                    return PIPELINE_DONE
+
+    @staticmethod
+    def put(target: queue.Queue, item, stop: threading.Event) -> bool:
+        while True:
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if stop.is_set():
+                    return False
+
+    @contextmanager
+    def busy(self):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.busy_s += time.monotonic() - started
+                self.items += 1
+
+    def report(self, wall_s: float) -> dict:
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "utilization": round(self.busy_s / (wall_s * self.workers), 3) if wall_s > 0 else 0.0,
+            "queue_size": self.inbox.maxsize if self.inbox is not None else 0,
+            "queue_max": self.depth_max,
+            "queue_mean": round(self._depth_total / self._samples, 2) if self._samples else 0.0,
+        }
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def open_jsonl(path: str):
+    """Ouvre un JSONL en lecture texte, compressé gzip ou non (détecté sur les premiers octets)."""
+    with open(path, "rb") as raw:
+        compressed = raw.read(2) == GZIP_MAGIC
+    if compressed:
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+class JsonlWriter:
+    """Sortie JSONL du crawl : tamponnée, éventuellement gzip, publiée par renommage atomique.
+
+    Les lignes s'accumulent en mémoire et partent dans `<path>.partial` par blocs de `buffer_bytes`.
+    `sync()` est un point de durabilité (tampon vidé, membre gzip refermé, fsync) qui renvoie la
+    taille du fichier partiel : c'est l'offset noté dans le checkpoint, auquel une reprise tronque.
+    Un fichier gzip fait de plusieurs membres reste lisible d'un bloc par gzip/zcat.
+    `commit()` remplace `path` par le fichier partiel ; sans commit, ce dernier reste pour `--resume`.
+    """
+
+    def __init__(
+        self, path: str, compress: str = "none", buffer_bytes: int = 64 * 1024, resume_offset: int = 0
+    ):
+        if compress not in COMPRESS_VALUES:
+            raise ValueError(f"Compression inconnue: {compress}")
+        self.path = path
+        self.partial_path = self.partial_path_for(path)
+        self.compress = compress
+        self.buffer_bytes = max(0, buffer_bytes)
+        self.records = 0
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._member: Optional[gzip.GzipFile] = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if resume_offset:
+            # Les écritures postérieures au dernier point de durabilité sont tronquées
+            os.truncate(self.partial_path, resume_offset)
+            self._raw = open(self.partial_path, "ab")
+        else:
+            self._raw = open(self.partial_path, "wb")
+        self._resumed = resume_offset > 0
+
+    @staticmethod
+    def partial_path_for(path: str) -> str:
+        return f"{path}.partial"
+
+    def write(self, payload: dict) -> None:
+        line = json.dumps(payload, ensure_ascii=False) + "\n"
+        self._buffer.append(line)
+        self._buffered += len(line)
+        self.records += 1
+        if self._buffered >= self.buffer_bytes:
+            self._flush_buffer()
+
+    def _flush_buffer(self) -> None:
+        if not self._buffer:
+            return
+        data = "".join(self._buffer).encode("utf-8")
+        self._buffer.clear()
+        self._buffered = 0
+        if self.compress == "gzip":
+            if self._member is None:
+                self._member = gzip.GzipFile(fileobj=self._raw, mode="wb", mtime=0)
+            self._member.write(data)
+        else:
+            self._raw.write(data)
+
+    def sync(self) -> int:
+        """Point de durabilité : tout ce qui est écrit jusqu'ici est sur disque et lisible."""
+        self._flush_buffer()
+        if self._member is not None:
+            self._member.close()
+            self._member = None
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        return self._raw.tell()
+
+    def close(self) -> None:
+        """Ferme sans publier : le fichier partiel reste en place."""
+        if self._raw.closed:
+            return
+        self.sync()
+        self._raw.close()
+
+    def commit(self, allow_empty: bool = False) -> bool:
+        """Publie la sortie ; sauf `allow_empty`, une sortie vide est écartée et `path` reste inchangé."""
+        self.close()
+        if not self.records and not self._resumed and not allow_empty:
+            os.remove(self.partial_path)
+            return False
+        os.replace(self.partial_path, self.path)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return True
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+        return True
+
+
+@dataclass
+class CrawlCheckpoint:
+    """Progression d'un crawl, réécrite après chaque page programme pour `--resume`.
+
+    `output_offset` est la taille de la sortie partielle (`JsonlWriter.partial_path`) à cette page :
+    tout ce qui suit est une écriture incomplète, tronquée à la reprise. Les URLs vues sont
+    ajoutées page par page à un fichier voisin (`seen_path_for`), valide jusqu'à `seen_offset` ;
+    le JSON garde ainsi une taille constante. Un checkpoint plus vieux que CHECKPOINT_MAX_AGE
+    (depuis `created_at`, début du crawl) n'est pas repris.
+    """
+
+    output_file: str
+    sections: list[str]
+    max_pages: int
+    compress: str = "none"
+    sections_done: list[str] = field(default_factory=list)
+    section: Optional[str] = None
+    page_index: int = 0
+    seen_offset: int = 0
+    created_at: Optional[str] = None
+    output_offset: int = 0
+    shows_written: int = 0
+    delta_file: Optional[str] = None
+    delta_offset: int = 0
+    sections_ended: list[str] = field(default_factory=list)
+    sections_incomplete: list[str] = field(default_factory=list)
+    changes: dict[str, int] = field(default_factory=dict)
+
+    @staticmethod
+    def path_for(output_file: str) -> str:
+        return f"{output_file}.checkpoint.json"
+
+    @staticmethod
+    def seen_path_for(output_file: str) -> str:
+        return f"{output_file}.checkpoint.seen"
+
+    def age(self) -> Optional[timedelta]:
+        try:
+            created_at = datetime.fromisoformat(self.created_at) if self.created_at else None
+        except ValueError:
+            return None
+        return datetime.now(timezone.utc) - created_at if created_at else None
+
+    def append_seen(self, urls) -> None:
+        """Ajoute `urls` aux URLs vues, après la partie validée (une fin non validée est écrasée)."""
+        path = self.seen_path_for(self.output_file)
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.seek(self.seen_offset)
+            f.truncate()
+            f.write("".join(f"{url}\n" for url in urls).encode("utf-8"))
+            self.seen_offset = f.tell()
+
+    def read_seen(self) -> Optional[set[str]]:
+        """URLs vues jusqu'à `seen_offset`, ou None si le fichier est plus court (checkpoint incohérent)."""
+        if not self.seen_offset:
+            return set()
+        try:
+            with open(self.seen_path_for(self.output_file), "rb") as f:
+                data = f.read(self.seen_offset)
+        except OSError:
+            return None
+        if len(data) < self.seen_offset:
+            return None
+        return set(data.decode("utf-8").splitlines())
+
+    @classmethod
+    def load(cls, output_file: str) -> Optional["CrawlCheckpoint"]:
+        path = cls.path_for(output_file)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            return cls(**payload)
+        except (OSError, TypeError, json.JSONDecodeError) as exc:
+            logging.warning("Checkpoint illisible %s: %s", path, exc)
+            return None
+
+    def pages_done(self, section: str) -> Optional[int]:
+        """Pages programme déjà traitées pour `section`, ou None si la section est terminée."""
+        if section in self.sections_done:
+            return None
+        return self.page_index if section == self.section else 0
+
+    def save(self) -> None:
+        path = self.path_for(self.output_file)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def remove(self) -> None:
+        for path in (self.path_for(self.output_file), self.seen_path_for(self.output_file)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+@dataclass(frozen=True)
+class PageDone:
+    """Événement des moteurs de crawl : page programme `page_index` traitée (section terminée si None).
+
+    Les fiches de la page ont été produites avant lui ; `urls` sont les URLs que la page a fait
+    découvrir (ses seeds), ajoutées aux URLs vues du checkpoint.
+    """
+
+    section: str
+    page_index: Optional[int]
+    urls: tuple[str, ...] = ()
+
+
+@dataclass
+class TextBlock:
+    text: str
+    tags: frozenset[str]
+    position: int
+
+
+@dataclass
+class DomIndex:
+    """Ce qu'un parcours du DOM relève d'une fiche détail (cf. `PageContext.dom`)."""
+
+    blocks: list[TextBlock]
+    selections: dict[str, list[Tag]]
+    metas: dict[tuple[str, str], Tag]
+    jsonld_scripts: list[Tag]
+    strings: list[str]
+
+
+class PageContext:
+    """Fiche détail en cours d'extraction.
+
+    Un seul parcours du DOM (`dom`) relève les blocs de texte, les éléments de chaque sélecteur
+    de `selectors`, les balises <meta>, les scripts JSON-LD et le texte complet. Le reste (JSON-LD
+    parsé, sélecteurs non indexés, texte d'un élément) est calculé à la demande, au plus une fois.
+    """
+
+    def __init__(self, soup: BeautifulSoup, selectors: Optional[SelectorIndex] = None):
+        self.soup = soup
+        self.selectors = selectors or DETAIL_SELECTORS
+        self._selections: dict[str, list[Tag]] = {}
+        self._texts: dict[int, str] = {}
+
+    def select(self, selector: str) -> list[Tag]:
+        if selector not in self._selections:
+            if selector in self.selectors.selectors:
+                self._selections[selector] = self.dom.selections.get(selector, [])
+            else:
+                self._selections[selector] = self.soup.select(selector)
+        return self._selections[selector]
+
+    def text(self, el) -> str:
+        if el is None:
+            return ""
+        key = id(el)
+        if key not in self._texts:
+            self._texts[key] = OffiScraper._extract_text(el)
+        return self._texts[key]
+
+    def meta(self, attr: str, value: str) -> Optional[str]:
+        """Contenu de la première balise <meta> dont `attr` vaut `value` (None si absente)."""
+        el = self.dom.metas.get((attr, value))
+        return el.get("content") if el is not None else None
+
+    @cached_property
+    def full_text(self) -> str:
+        return re.sub(r"\s+", " ", " ".join(part.strip() for part in self.dom.strings if part.strip())).strip()
+
+    @cached_property
+    def dom(self) -> DomIndex:
+        """Parcours unique du DOM.
+
+        Chaque chaîne n'apparaît que dans un bloc : celui de son plus proche ancêtre de niveau
+        bloc. Le texte d'un élément inline (ex. `<time>`) reste donc dans la phrase qui le contient.
+        """
+        builders: list[tuple[list[str], set[str]]] = []
+        selections: dict[str, list[Tag]] = {}
+        metas: dict[tuple[str, str], Tag] = {}
+        jsonld_scripts: list[Tag] = []
+        strings: list[str] = []
+        labels = self.selectors.labels
+
+        def enter(node: Tag, inherited: frozenset[str], current: Optional[tuple[list[str], set[str]]]):
+            matched = labels(node, inherited)
+            for label in matched:
+                selections.setdefault(label, []).append(node)
+            own = inherited.union(matched) if matched else inherited
+            if node.name == "meta":
+                for attr in ("name", "property"):
+                    if node.get(attr):
+                        metas.setdefault((attr, node[attr]), node)
+            elif node.name == "script" and node.get("type") == "application/ld+json":
+                jsonld_scripts.append(node)
+            if current is None or node.name in BLOCK_TAGS:
+                current = ([], set(own))
+                builders.append(current)
+            else:
+                current[1].update(own)
+            return iter(node.children), own, current
+
+        # Pile explicite plutôt que récursion : une page mal formée peut imbriquer des milliers de balises
+        stack = [enter(self.soup, frozenset(), None)]
+        while stack:
+            children, own, current = stack[-1]
+            for child in children:
+                if isinstance(child, Tag):
+                    if child.name not in ("html", "head", "body") and not _keep_detail_tag(child.name, child.attrs):
+                        # Balises que le strainer n'écarte qu'au premier niveau (scripts, SVG, iframes…)
+                        continue
+                    stack.append(enter(child, own, current))
+                    break
+                if type(child) in (NavigableString, CData):
+                    current[0].append(child)
+                    strings.append(child)
+            else:
+                stack.pop()
+        blocks: list[TextBlock] = []
+        for parts, tags in builders:
+            text = " ".join(" ".join(part.strip() for part in parts if part.strip()).split())
+            if text:
+                blocks.append(TextBlock(text=text, tags=frozenset(tags), position=len(blocks)))
+        return DomIndex(blocks, selections, metas, jsonld_scripts, strings)
+
+    @property
+    def text_blocks(self) -> list[TextBlock]:
+        return self.dom.blocks
+
+    def blocks_for(self, selectors: tuple[str, ...]) -> list[TextBlock]:
+        """Blocs couverts par `selectors`, rangés par priorité du premier sélecteur puis ordre du document."""
+        rank = {selector: index for index, selector in enumerate(selectors)}
+        matched = [
+            (min(rank[tag] for tag in block.tags if tag in rank), block.position, block)
+            for block in self.text_blocks
+            if any(tag in rank for tag in block.tags)
+        ]
+        return [block for _, _, block in sorted(matched, key=lambda item: item[:2])]
+
+    @cached_property
+    def jsonld(self) -> list:
+        documents = []
+        for script in self.dom.jsonld_scripts:
+            raw = script.string or script.get_text() or ""
+            if not raw.strip():
+                continue
+            try:
+                documents.append(json.loads(raw, strict=False))
+            except json.JSONDecodeError as exc:
+                logging.debug("[DEBUG] JSON-LD illisible ignoré: %s", exc)
+        return documents
+
+    def jsonld_values(self, *keys: str):
+        """Valeurs des clés `keys` (casse ignorée) dans tout le JSON-LD, dans l'ordre du document."""
+        wanted = {key.lower() for key in keys}
+
+        def walk(node):
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if isinstance(key, str) and key.lower() in wanted:
+                        yield value
+                    yield from walk(value)
+            elif isinstance(node, list):
+                for item in node:
+                    yield from walk(item)
+
+        for document in self.jsonld:
+            yield from walk(document)
 
 
 class OffiScraper:
@@ -199,28 +2015,116 @@ class OffiScraper:
         retries: int = 4,
         timeout: float = 20,
         cache_file: Optional[str] = None,
+        cache_db: Optional[str] = None,
         refresh_after_hours: int = 72,
+        refresh_policy: str | FixedRefreshPolicy = "lifecycle",
         sections: Optional[List[str]] = None,
+        concurrency: int = 1,
+        engine: str = "sync",
+        http_cache_dir: Optional[str] = None,
+        http_cache_max_age_days: float = 30,
+        http_cache_max_mb: Optional[int] = 512,
+        parser: str = "html.parser",
+        throttle: str = "adaptive",
+        min_rate: float = 0.1,
+        max_rate: Optional[float] = None,
+        record_dir: Optional[str] = None,
+        replay_dir: Optional[str] = None,
+        parse_workers: Optional[int] = None,
+        pipeline_queue_size: int = 32,
+        output_compress: str = "none",
+        output_buffer_kb: int = 64,
+        delta_file: Optional[str] = None,
+        parallel_sections: bool = True,
+        max_requests: Optional[int] = None,
+        deadline_s: Optional[float] = None,
+        venues_file: Optional[str] = None,
+        forget_venues: Optional[List[str]] = None,
+        card_refresh: bool = False,
         debug: bool = False,
     ):
+        if engine not in ENGINE_VALUES:
+            raise ValueError(f"Moteur inconnu: {engine}")
+        if parser not in PARSER_VALUES:
+            raise ValueError(f"Parser inconnu: {parser}")
+        if throttle not in THROTTLE_VALUES:
+            raise ValueError(f"Throttle inconnu: {throttle}")
+        if output_compress not in COMPRESS_VALUES:
+            raise ValueError(f"Compression inconnue: {output_compress}")
+        if isinstance(refresh_policy, str) and refresh_policy not in REFRESH_POLICY_VALUES:
+            raise ValueError(f"Politique de refresh inconnue: {refresh_policy}")
+        if record_dir and replay_dir:
+            raise ValueError("--record et --replay sont exclusifs")
+        self.engine = engine
+        self.parser = parser
+        self.concurrency = max(concurrency, 1)
+        self.parse_workers = max(1, parse_workers or os.cpu_count() or 1)
+        self.pipeline_queue_size = max(1, pipeline_queue_size)
+        self.output_compress = output_compress
+        self.output_buffer_bytes = max(0, output_buffer_kb) * 1024
         self.session = requests.Session()
         self.session.headers.update({
             "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.8",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "User-Agent": random.choice(USER_AGENTS),
         })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(10, self.concurrency))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.min_delay = min_delay
         self.max_delay = max_delay
-        self.last_request = 0
+        self._adaptive = self._build_adaptive_rate(throttle, min_rate, max_rate)
+        self._limiter = RateLimiter(min_delay, max_delay, self._adaptive)
+        self._http_cache = None
+        if http_cache_dir and not replay_dir:
+            self._http_cache = HttpCache(
+                http_cache_dir,
+                max_age=timedelta(days=http_cache_max_age_days) if http_cache_max_age_days > 0 else None,
+                max_bytes=http_cache_max_mb * 1024 * 1024 if http_cache_max_mb else None,
+            )
+        self._archive = PageArchive(record_dir) if record_dir else None
+        self.replay = bool(replay_dir)
+        if replay_dir:
+            # Rejeu : aucune requête réseau, donc ni throttle, ni cache HTTP, ni attente de retry
+            self.session = ReplaySession(PageArchive(replay_dir))
+            logging.info("Rejeu depuis %s (%s réponses archivées)", replay_dir, len(self.session.archive))
+            self._adaptive = None
+            self.min_delay = self.max_delay = 0
+            self._limiter = RateLimiter(0, 0)
         self.retries = retries
         self.timeout = timeout
         self.cache_file = cache_file
         self.refresh_after = timedelta(hours=max(refresh_after_hours, 0))
+        if refresh_policy == "lifecycle":
+            refresh_policy = LifecycleRefreshPolicy(self.refresh_after)
+        elif refresh_policy == "fixed":
+            refresh_policy = FixedRefreshPolicy(self.refresh_after)
+        self.refresh_policy = refresh_policy
         self.sections = self._normalize_sections(sections)
         self._seen_urls: set[str] = set()
+        self._sections_ended: set[str] = set()
+        self._sections_incomplete: set[str] = set()
         self.debug = debug
         self.stats = CrawlStats()
-        self._cache: dict[str, Show] = self._load_cache(cache_file)
+        self.stats.current_rate = self._adaptive.rate if self._adaptive else self._fixed_rate()
+        self._bucket = TokenBucket(rate=self._fixed_rate(), adaptive=self._adaptive)
+        self._checkpoint: Optional[CrawlCheckpoint] = None
+        self.delta_file = delta_file
+        self._delta: Optional[JsonlWriter] = None
+        self.parallel_sections = parallel_sections
+        self._part_file: Optional[str] = None
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._budget: Optional[CrawlBudget] = None
+        if max_requests is not None or deadline_s is not None:
+            self._budget = CrawlBudget(max_requests, deadline_s)
+        self._cache: Optional[ShowStore] = self._load_cache(cache_file, cache_db)
+        self.venues_file = venues_file
+        # Sélecteurs de cartes non vérifiés sur le balisage réel (`cards`) : la carte ne remplace pas le refresh par défaut
+        self.card_refresh = card_refresh
+        self._venues = VenueIndex(self._cache)
+        for slug in forget_venues or ():
+            if self._venues.invalidate(slug):
+                logging.info("Lieu %s retiré de l'index", slug)
 
     @staticmethod
     def _normalize_sections(sections: Optional[List[str]]) -> list[str]:
@@ -243,45 +2147,155 @@ class OffiScraper:
 
     # ---------------- Utils réseau ----------------
 
+    def _fixed_rate(self) -> float:
+        mean_delay = (self.min_delay + self.max_delay) / 2
+        return 1 / mean_delay if mean_delay > 0 else 0
+
+    def _build_adaptive_rate(self, throttle: str, min_rate: float, max_rate: Optional[float]) -> Optional[AdaptiveRate]:
+        """Débit AIMD qui démarre au rythme moyen des délais ; plafond par défaut : un départ par `min_delay`."""
+        if throttle != "adaptive":
+            return None
+        ceiling = max_rate or (1 / self.min_delay if self.min_delay > 0 else None)
+        if not ceiling:
+            return None
+        return AdaptiveRate(rate=self._fixed_rate() or ceiling, min_rate=min_rate, max_rate=ceiling)
+
+    def _observe_rate(self, status_code: Optional[int], latency: float) -> None:
+        if not self._adaptive:
+            return
+        reason = self._adaptive.observe(status_code, latency)
+        self.stats.current_rate = self._adaptive.rate
+        if reason:
+            self.stats.incr("backoff_events")
+            logging.warning("Débit réduit à %.2f req/s (%s)", self._adaptive.rate, reason)
+
+    @_timed("throttle")
     def _throttle(self):
-        now = time.time()
-        if self.last_request > 0:
-            elapsed = now - self.last_request
-            if elapsed < self.min_delay:
-                time.sleep(random.uniform(self.min_delay - elapsed, self.max_delay))
-        self.last_request = time.time()
-
-    def _fetch_page(self, url: str) -> Optional[BeautifulSoup]:
+        """Attend le créneau du limiteur, sans jamais attendre au-delà de la deadline du budget."""
+        deadline = self._budget.deadline if self._budget is not None else None
+        if not self._limiter.wait(deadline):
+            raise _DeadlineReached(self._budget.exhausted())
+
+    def _fetch_html(self, url: str) -> Optional[FetchedPage]:
+        """Page `url`, None après échec des tentatives.
+
+        Sous `--deadline`, lève `_DeadlineReached` au lieu d'attendre (créneau du limiteur ou
+        pause avant nouvelle tentative) au-delà de la deadline.
+        """
+        cached = self._http_cache.get(url) if self._http_cache else None
         for attempt in range(self.retries + 1):
+            if attempt and self._budget is not None and self._budget.exhausted():
+                return None
             self._throttle()
-            self.stats.requests += 1
-            self.session.headers["User-Agent"] = random.choice(USER_AGENTS)
-            try:
-                resp = self.session.get(url, timeout=self.timeout)
-                if resp.status_code == 200 and "text/html" in resp.headers.get("content-type", ""):
-                    resp.encoding = resp.encoding or "utf-8"
-                    return BeautifulSoup(resp.text, "html.parser")
+            page, retry_delay = self._fetch_attempt(url, attempt, cached)
+            if retry_delay is None:
+                return page
+            deadline = self._budget.deadline if self._budget is not None else None
+            if deadline is not None and time.monotonic() + retry_delay >= deadline:
+                raise _DeadlineReached("deadline atteinte")
+            with self.stats.timed("retry_wait"):
+                time.sleep(retry_delay)
+        return None
 
-                if resp.status_code in RETRYABLE_STATUS_CODES and attempt < self.retries:
-                    self._sleep_before_retry(url, attempt, f"HTTP {resp.status_code}", resp)
-                    continue
+    def _fetch_page(self, url: str, page_type: Optional[str] = None) -> Optional[BeautifulSoup]:
+        page = self._fetch_html(url)
+        return self._parse_html(page.html, page_type) if page else None
 
-                if self.debug:
-                    logging.debug(f"[DEBUG] Statut HTTP {resp.status_code} sur {url}")
-                self.stats.request_failures += 1
-                return None
-            except requests.RequestException as e:
-                logging.warning(f"Erreur sur {url} (tentative {attempt+1}/{self.retries+1}): {e}")
-                if attempt < self.retries:
-                    self._sleep_before_retry(url, attempt, type(e).__name__)
-                    continue
-                self.stats.request_failures += 1
-            except Exception as e:
-                logging.exception(f"Erreur inattendue sur {url}: {e}")
-                self.stats.request_failures += 1
-                return None
+    async def _fetch_html_async(self, url: str, bucket: TokenBucket) -> Optional[FetchedPage]:
+        """Pendant asyncio de `_fetch_html` : mêmes tentatives, attentes non bloquantes."""
+        cached = await asyncio.to_thread(self._http_cache.get, url) if self._http_cache else None
+        for attempt in range(self.retries + 1):
+            with self.stats.timed("throttle"):
+                await bucket.acquire()
+            page, retry_delay = await asyncio.to_thread(self._fetch_attempt, url, attempt, cached)
+            if retry_delay is None:
+                return page
+            with self.stats.timed("retry_wait"):
+                await asyncio.sleep(retry_delay)
         return None
 
+    async def _fetch_page_async(
+        self, url: str, bucket: TokenBucket, page_type: Optional[str] = None
+    ) -> Optional[BeautifulSoup]:
+        page = await self._fetch_html_async(url, bucket)
+        return await asyncio.to_thread(self._parse_html, page.html, page_type) if page else None
+
+    @_timed("soup")
+    def _parse_html(self, html: str, page_type: Optional[str] = None) -> BeautifulSoup:
+        """Construit la soupe avec le parser choisi, restreinte aux régions utiles du type de page."""
+        return BeautifulSoup(html, self.parser, parse_only=PAGE_STRAINERS.get(page_type))
+
+    def _fetch_attempt(
+        self, url: str, attempt: int, cached: Optional[HttpCacheEntry] = None
+    ) -> tuple[Optional[FetchedPage], Optional[float]]:
+        """Une tentative HTTP, partagée par les deux moteurs.
+
+        Renvoie `(page, None)` en cas de succès ou d'échec définitif (`page` vaut alors None),
+        `(None, délai)` s'il faut réessayer après `délai` secondes. Avec une entrée `cached` du
+        cache HTTP (lue une fois pour toutes les tentatives), la requête est conditionnelle et un
+        304 renvoie le corps mis en cache.
+        """
+        self.stats.incr("requests")
+        if self._budget is not None:
+            self._budget.charge()
+        headers = {"User-Agent": random.choice(USER_AGENTS)}
+        if cached:
+            headers.update(cached.validator_headers())
+        started = time.monotonic()
+        try:
+            resp = self.session.get(url, timeout=self.timeout, headers=headers)
+            latency = time.monotonic() - started
+            self.stats.observe("http_get", latency)
+            self._observe_rate(resp.status_code, latency)
+            size = self._response_size(resp)
+            self.stats.incr("bytes_downloaded", size)
+            resp.encoding = resp.encoding or "utf-8"
+            if self._archive is not None:
+                # Un 304 est archivé avec le corps servi depuis le cache HTTP
+                body = cached.body if resp.status_code == 304 and cached else resp.text
+                self._archive.record(url, resp.status_code, resp.headers, body)
+                self.stats.incr("archived_responses")
+            if resp.status_code == 304 and cached:
+                self.stats.incr("not_modified")
+                saved = cached.size if cached.size is not None else len(cached.body.encode("utf-8"))
+                self.stats.incr("bytes_saved", max(saved - size, 0))
+                self._http_cache.touch(url)
+                return FetchedPage(url=url, html=cached.body, not_modified=True), None
+
+            if resp.status_code == 200 and "text/html" in resp.headers.get("content-type", ""):
+                html = resp.text
+                if self._http_cache:
+                    self._http_cache.store(url, resp.headers, html, size)
+                return FetchedPage(url=url, html=html), None
+
+            if resp.status_code in RETRYABLE_STATUS_CODES and attempt < self.retries:
+                return None, self._schedule_retry(url, attempt, f"HTTP {resp.status_code}", resp)
+
+            if self.debug:
+                logging.debug(f"[DEBUG] Statut HTTP {resp.status_code} sur {url}")
+            self.stats.incr("request_failures")
+            return None, None
+        except requests.RequestException as e:
+            self.stats.observe("http_get", time.monotonic() - started)
+            self._observe_rate(None, time.monotonic() - started)
+            logging.warning(f"Erreur sur {url} (tentative {attempt+1}/{self.retries+1}): {e}")
+            if attempt < self.retries:
+                return None, self._schedule_retry(url, attempt, type(e).__name__)
+            self.stats.incr("request_failures")
+            return None, None
+        except Exception as e:
+            logging.exception(f"Erreur inattendue sur {url}: {e}")
+            self.stats.incr("request_failures")
+            return None, None
+
+    @staticmethod
+    def _response_size(resp) -> int:
+        """Taille du corps reçu ; les réponses sans `content` (replay) sont mesurées sur leur texte."""
+        content = getattr(resp, "content", None)
+        if isinstance(content, bytes):
+            return len(content)
+        return len((resp.text or "").encode("utf-8"))
+
     @staticmethod
     def _extract_text(el) -> str:
         if not el:
@@ -306,6 +2320,8 @@ class OffiScraper:
             return False
 
     def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        if self.replay:
+            return 0.0
         if response is not None:
             retry_after = response.headers.get("Retry-After")
             if retry_after and retry_after.isdigit():
@@ -316,9 +2332,11 @@ class OffiScraper:
             base = max(base, 5.0)
         return base + random.uniform(0.1, 0.8)
 
-    def _sleep_before_retry(self, url: str, attempt: int, reason: str, response: Optional[requests.Response] = None):
+    def _schedule_retry(
+        self, url: str, attempt: int, reason: str, response: Optional[requests.Response] = None
+    ) -> float:
         delay = self._retry_delay(attempt, response)
-        self.stats.retries += 1
+        self.stats.incr("retries")
         logging.warning(
             "Retry %s/%s pour %s dans %.1fs (%s)",
             attempt + 2,
@@ -327,31 +2345,61 @@ class OffiScraper:
             delay,
             reason,
         )
-        time.sleep(delay)
-
-    def _load_cache(self, cache_file: Optional[str]) -> dict[str, Show]:
-        cache: dict[str, Show] = {}
-        if not cache_file or not os.path.exists(cache_file):
-            return cache
+        return delay
 
+    def _load_cache(self, cache_file: Optional[str], cache_db: Optional[str] = None) -> Optional[ShowStore]:
+        """Ouvre le cache de fiches ; le JSONL `cache_file` n'y est importé que s'il a changé depuis."""
+        if not cache_db:
+            if not cache_file or not os.path.exists(cache_file):
+                return None
+            cache_db = f"{cache_file}.sqlite"
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    row = line.strip()
-                    if not row:
-                        continue
-                    try:
-                        payload = json.loads(row)
-                    except json.JSONDecodeError:
-                        continue
-                    show = self._show_from_payload(payload)
-                    if show:
-                        cache[show.url] = show
-            self.stats.cached_loaded = len(cache)
-            logging.info("Cache chargé depuis %s (%s fiches)", cache_file, len(cache))
-        except Exception as exc:
-            logging.warning("Impossible de charger le cache %s: %s", cache_file, exc)
-        return cache
+            store = ShowStore(cache_db)
+        except sqlite3.Error as exc:
+            logging.warning("Impossible d'ouvrir le cache %s: %s", cache_db, exc)
+            return None
+
+        if cache_file and os.path.exists(cache_file) and not store.is_synced_with(cache_file):
+            try:
+                imported = self._import_cache_file(store, cache_file)
+                store.mark_synced(cache_file)
+                logging.info("Cache importé depuis %s (%s fiches)", cache_file, imported)
+            except Exception as exc:
+                logging.warning("Impossible de charger le cache %s: %s", cache_file, exc)
+
+        counts = {section: store.count(section) for section in self.sections}
+        self.stats.cached_loaded = sum(counts.values())
+        logging.info(
+            "Cache %s : %s",
+            cache_db,
+            ", ".join(f"{section} {count} fiches" for section, count in counts.items()),
+        )
+        return store
+
+    def _import_cache_file(self, store: ShowStore, cache_file: str, batch_size: int = 500) -> int:
+        imported = 0
+        batch: list[Show] = []
+        with open_jsonl(cache_file) as f:
+            for line in f:
+                row = line.strip()
+                if not row:
+                    continue
+                try:
+                    payload = json.loads(row)
+                except json.JSONDecodeError:
+                    continue
+                show = self._show_from_payload(payload)
+                if show:
+                    batch.append(show)
+                if len(batch) >= batch_size:
+                    imported += store.put_many(batch)
+                    batch = []
+        imported += store.put_many(batch)
+        store.flush()
+        return imported
+
+    def _cached_show(self, url: str) -> Optional[Show]:
+        return self._cache.get(url) if self._cache else None
 
     def _show_from_payload(self, payload: dict) -> Optional[Show]:
         url = payload.get("url")
@@ -406,26 +2454,44 @@ class OffiScraper:
             return bool(show.title and show.description)
         return bool(show.title and show.category and show.venue and show.description)
 
-    def _should_refresh_detail(self, cached_show: Optional[Show]) -> bool:
+    def _should_refresh_detail(self, cached_show: Optional[Show], seed: Optional[Show] = None) -> bool:
+        """Une fiche absente ou incomplète est toujours refetchée ; sinon `refresh_policy` décide.
+
+        Avec `card_refresh`, si la carte du `seed` couvre les champs de programmation, elle tient lieu
+        de refresh : la page détail n'est refetchée que passé `CARD_REFRESH_AFTER`. Chaque décision est comptée par règle,
+        avec les refetchs évités par rapport au refresh à âge fixe.
+        """
         if cached_show is None:
             return True
         if not self._is_cache_complete(cached_show):
             return True
-        if self.refresh_after == timedelta(0):
-            return False
+        now = datetime.now(timezone.utc)
         crawled_at = self._parse_crawled_at(cached_show.crawled_at)
-        if crawled_at is None:
-            return True
-        return datetime.now(timezone.utc) - crawled_at > self.refresh_after
+        age = now - crawled_at if crawled_at is not None else None
+        unchanged_runs = self._cache.unchanged_runs(cached_show.url) if self._cache else 0
+        refresh, rule = self.refresh_policy.decide(cached_show, age, unchanged_runs, now.date())
+        if refresh and self.card_refresh and seed is not None and self._card_covers(seed):
+            refresh, rule = FixedRefreshPolicy.due(age, CARD_REFRESH_AFTER), "card"
+        avoided = not refresh and FixedRefreshPolicy.due(age, self.refresh_after)
+        self.stats.incr_labelled("refresh_rules", rule)
+        if avoided:
+            self.stats.incr_labelled("refresh_avoided", rule)
+        return refresh
 
     @staticmethod
     def _merge_seed_with_cache(seed: Show, cached_show: Show) -> Show:
+        """Fiche en cache complétée par le seed ; les champs de programmation lus sur la carte la remplacent.
+
+        `crawled_at` reste celui du cache : la fiche détail n'a pas été refetchée.
+        """
         merged = Show(**asdict(cached_show))
         merged.url = seed.url
-        if seed.section and not merged.section:
-            merged.section = seed.section
-        if seed.title and not merged.title:
-            merged.title = seed.title
+        for name in SHOW_FIELDS:
+            value = getattr(seed, name)
+            if name in ("url", "crawled_at") or value is None:
+                continue
+            if name in CARD_LISTING_FIELDS or not getattr(merged, name):
+                setattr(merged, name, value)
         return merged
 
     # ---------------- Helpers dates ----------------
@@ -438,16 +2504,7 @@ class OffiScraper:
         return MONTHS.get(key)
 
     def _to_iso(self, day: str, month_name: str, year: str) -> Optional[str]:
-        m = self._month_to_int(month_name)
-        if not m:
-            return None
-        try:
-            y = int(year)
-            if y < 100:  # 24 -> 2024 naïf
-                y += 2000
-            return f"{y:04d}-{m:02d}-{int(day):02d}"
-        except ValueError:
-            return None
+        return _word_date_iso(day, month_name, year)
 
     @staticmethod
     def _iso_from_any(s: str) -> Optional[str]:
@@ -459,84 +2516,23 @@ class OffiScraper:
         """Parsing hiérarchique d'un blob de texte (priorité aux vraies plages)."""
         if not text:
             return None, None
-        t = " ".join(text.lower().split())
-
-        # 1) Plage numérique: du 05/10/2025 au 12/11/2025
-        m = RANGE_NUMERIC_RE.search(t)
-        if m:
-            d1, mo1, y1, d2, mo2, y2 = m.group(1), m.group(2), m.group(3), m.group(4), m.group(5), m.group(6)
-            s = f"{int(y1) + (2000 if len(y1) == 2 else 0):04d}-{int(mo1):02d}-{int(d1):02d}"
-            e = f"{int(y2) + (2000 if len(y2) == 2 else 0):04d}-{int(mo2):02d}-{int(d2):02d}"
-            return s, e
-
-        # 2) du 30 décembre 2025 au 3 janvier 2026
-        m = RANGE_BOTH_YEARS_RE.search(t)
-        if m:
-            d1, m1, y1, d2, m2, y2 = m.groups()
-            return self._to_iso(d1, m1, y1), self._to_iso(d2, m2, y2)
-
-        # 3) du 7 septembre au 12 octobre 2025
-        m = RANGE_YEAR_AT_END_RE.search(t)
-        if m:
-            d1, m1, d2, m2, y = m.groups()
-            return self._to_iso(d1, m1, y), self._to_iso(d2, m2, y)
-
-        # 4) du 5 au 12 octobre 2025
-        m = RANGE_SAME_MONTH_RE.search(t)
-        if m:
-            d1, d2, mo, y = m.groups()
-            return self._to_iso(d1, mo, y), self._to_iso(d2, mo, y)
-
-        # 5) à partir du X (seulement start)
-        m = A_PARTIR_DU_RE.search(t)
-        if m:
-            d, mo, y = m.groups()
-            return self._to_iso(d, mo, y), None
-
-        # 6) jusqu'au Y (seulement end)
-        m = JUSQU_AU_RE.search(t)
-        if m:
-            d, mo, y = m.groups()
-            return None, self._to_iso(d, mo, y)
-
-        # 7) Fallback : repérer toutes les dates (mots + numériques) et prendre min/max
-        dates: List[str] = []
-        for mm in DATE_WORD_RE.finditer(t):
-            d, mo, y = mm.groups()
-            iso = self._to_iso(d, mo, y)
-            if iso:
-                dates.append(iso)
-        for mm in DATE_NUMERIC_RE.finditer(t):
-            d, mo, y = mm.groups()
-            yy = int(y) + 2000 if len(y) == 2 else int(y)
-            iso = f"{yy:04d}-{int(mo):02d}-{int(d):02d}"
-            dates.append(iso)
-
-        dates = sorted(set(dates))
-        if dates:
-            if len(dates) == 1:
-                return dates[0], dates[0]
-            return dates[0], dates[-1]
+        return parse_date_range(text)
 
-        return None, None
-
-    def _dates_from_jsonld(self, soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
-        """Cherche des startDate/endDate ISO dans le JSON-LD et renvoie min/max."""
+    def _date_bounds(self, values: list) -> Optional[Tuple[str, str]]:
+        """Plus petite et plus grande date ISO parmi des startDate/endDate JSON-LD."""
         iso_candidates: List[str] = []
-        for script in soup.find_all("script", type="application/ld+json"):
-            try:
-                raw = script.string or script.get_text() or ""
-                for m in re.finditer(r'"(?:startDate|endDate)"\s*:\s*"([^"]+)"', raw, flags=re.IGNORECASE):
-                    iso = self._iso_from_any(m.group(1))
-                    if iso:
-                        iso_candidates.append(iso)
-            except Exception:
-                continue
+        for value in values:
+            iso = self._iso_from_any(value) if isinstance(value, str) else None
+            if iso:
+                iso_candidates.append(iso)
         if not iso_candidates:
-            return None, None
+            return None
         iso_candidates = sorted(set(iso_candidates))
         return iso_candidates[0], iso_candidates[-1]
 
+    def _date_range_from_blocks(self, blocks: list[TextBlock]) -> Tuple[Optional[str], Optional[str]]:
+        return self._parse_date_range_text(" • ".join(block.text for block in blocks if len(block.text) > 6))
+
     # ---------------- Parsing autres champs ----------------
 
     def _parse_duration(self, text: str) -> Optional[int]:
@@ -594,14 +2590,20 @@ class OffiScraper:
         except Exception:
             return None
 
+    @staticmethod
+    def _venue_slug(show_url: str) -> Optional[str]:
+        """Slug du lieu dans l'URL d'une fiche théâtre (1er segment), ex. `theatre-montparnasse-2825`."""
+        parts = urlparse(show_url).path.strip("/").split("/")
+        if len(parts) >= 2 and parts[0] == "theatre":
+            return parts[1] or None
+        return None
+
     def _venue_from_show_url(self, show_url: str) -> Optional[str]:
         """Extrait le théâtre depuis l’URL de la fiche (1er segment)."""
         try:
-            path = urlparse(show_url).path
-            parts = path.strip("/").split("/")
-            if len(parts) >= 2 and parts[0] == "theatre":
-                first = parts[1]  # ex: theatre-montparnasse-2825
-                base = re.sub(r"-\d+$", "", first)
+            slug = self._venue_slug(show_url)
+            if slug:
+                base = re.sub(r"-\d+$", "", slug)
                 if base:
                     name = base.replace("-", " ").strip()
                     return " ".join(w.capitalize() for w in name.split())
@@ -629,31 +2631,31 @@ class OffiScraper:
             return False
         return True
 
-    def _extract_address(self, soup: BeautifulSoup) -> Optional[str]:
-        candidates: List[str] = []
-
-        for sel in [
-            "[itemprop='streetAddress']",
-            "[itemprop='address']",
-            "[class*=address]",
-            "[id*=address]",
-            "address",
-        ]:
-            for el in soup.select(sel):
-                txt = self._clean_text(self._extract_text(el))
-                if txt:
-                    candidates.append(txt)
-
-        for txt in candidates:
-            match = ADDRESS_RE.search(txt)
-            if match:
-                return self._clean_text(match.group(0))
-
-        full_text = self._extract_text(soup)
-        match = ADDRESS_RE.search(full_text)
-        if match:
-            return self._clean_text(match.group(0))
+    def _venue_from_breadcrumbs(self, links: list[Tag]) -> Optional[str]:
+        """Dernier lien du fil d'Ariane vers une page de lieu dont le texte ressemble à un nom de salle."""
+        for link in reversed(links):
+            path = urlparse(urljoin(BASE_URL, link.get("href", ""))).path or ""
+            if not any(config.venue_path_re and config.venue_path_re.match(path) for config in SECTION_CONFIGS.values()):
+                continue
+            venue_text = self._extract_text(link)
+            if self._looks_like_venue_text(venue_text):
+                return venue_text
+        return None
+
+    def _extract_address(self, page: PageContext | BeautifulSoup) -> Optional[str]:
+        """Adresse d'une fiche théâtre selon la spec `address` : sélecteurs d'adresse, puis texte libre."""
+        page = page if isinstance(page, PageContext) else PageContext(page)
+        spec = next(spec for spec in SECTION_CONFIGS["theatre"].fields if spec.name == "address")
+        return self._complete_fields(Show(url=""), page, (spec,)).address
+
+    def _address_in_text(self, text: str) -> Optional[str]:
+        return self._clean_text(find_address(text))
 
+    def _address_in_elements(self, elements: list[Tag]) -> Optional[str]:
+        for el in elements:
+            address = self._address_in_text(self._extract_text(el))
+            if address:
+                return address
         return None
 
     def _extract_theatre_category(self, text: str) -> Optional[str]:
@@ -678,15 +2680,6 @@ class OffiScraper:
     def _extract_category(self, text: str) -> Optional[str]:
         return self._extract_theatre_category(text)
 
-    @staticmethod
-    def _jsonld_blobs(soup: BeautifulSoup) -> list[str]:
-        blobs: list[str] = []
-        for script in soup.find_all("script", type="application/ld+json"):
-            raw = script.string or script.get_text() or ""
-            if raw:
-                blobs.append(raw)
-        return blobs
-
     @staticmethod
     def _parse_iso8601_duration(value: Optional[str]) -> Optional[int]:
         if not value:
@@ -709,19 +2702,20 @@ class OffiScraper:
             day, month_name, year = word_match.groups()
             return self._to_iso(day, month_name, year)
 
-        numeric_match = DATE_NUMERIC_RE.fullmatch(text)
-        if numeric_match:
-            day, month, year = numeric_match.groups()
-            year_num = int(year) + 2000 if len(year) == 2 else int(year)
-            return f"{year_num:04d}-{int(month):02d}-{int(day):02d}"
+        numeric_iso = _numeric_date_iso(text)
+        if numeric_iso:
+            return numeric_iso
 
         return self._iso_from_any(text)
 
-    def _extract_description(self, soup: BeautifulSoup) -> Optional[str]:
-        desc_keywords = ["présentation", "résumé", "synopsis", "à propos"]
-        for heading in soup.find_all(["h2", "h3", "h4"]):
-            ht = self._extract_text(heading).lower()
-            if any(k in ht for k in desc_keywords):
+    def _first_element_text(self, elements: list[Tag]) -> str:
+        return self._extract_text(elements[0])
+
+    def _description_after_heading(self, headings: list[Tag]) -> Optional[str]:
+        """Paragraphes qui suivent le premier intertitre de présentation (jusqu'à l'intertitre suivant)."""
+        for heading in headings:
+            heading_text = self._extract_text(heading).lower()
+            if any(keyword in heading_text for keyword in DESCRIPTION_HEADING_KEYWORDS):
                 parts = []
                 for sib in heading.find_next_siblings():
                     if sib.name in ["h2", "h3", "h4"]:
@@ -732,60 +2726,59 @@ class OffiScraper:
                             parts.append(text)
                 if parts:
                     return " ".join(parts)
-
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        if meta_desc and meta_desc.get("content"):
-            return meta_desc["content"].strip()
-
         return None
 
-    def _extract_cinema_category(self, soup: BeautifulSoup) -> Optional[str]:
-        for raw in self._jsonld_blobs(soup):
-            for match in JSONLD_GENRE_RE.finditer(raw):
-                if match.group(1):
-                    return self._clean_text(match.group(1).lower())
-                items = [self._clean_text(item.lower()) for item in re.findall(r'"([^"]+)"', match.group(2) or "")]
+    def _lowercase_text(self, text: str) -> Optional[str]:
+        return self._clean_text(text.lower())
+
+    def _genre_from_jsonld(self, values: list) -> Optional[str]:
+        for value in values:
+            if isinstance(value, str):
+                genre = self._lowercase_text(value)
+                if genre:
+                    return genre
+            elif isinstance(value, list):
+                items = [self._lowercase_text(item) for item in value if isinstance(item, str)]
                 items = [item for item in items if item]
                 if items:
                     return ", ".join(items)
+        return None
 
-        full_text = self._extract_text(soup)
-        match = re.search(
-            r"\bgenre(?:s)?\s*:\s*(.+?)(?=\b(?:durée|duree|date\s+de\s+sortie|sortie|nationalité|réalisateur|réalisation|avec|casting|titre\s+original)\b|$)",
-            full_text,
-            flags=re.IGNORECASE,
-        )
-        if not match:
-            return None
-        return self._clean_text(match.group(1).lower())
-
-    def _extract_cinema_release_date(self, soup: BeautifulSoup) -> Optional[str]:
-        for raw in self._jsonld_blobs(soup):
-            for match in JSONLD_DATE_RE.finditer(raw):
-                iso = self._parse_single_date_text(match.group(1))
-                if iso:
-                    return iso
-
-        full_text = self._extract_text(soup)
-        match = CINEMA_RELEASE_RE.search(full_text)
-        if not match:
-            return None
-        return self._parse_single_date_text(match.group(1))
-
-    def _extract_cinema_duration(self, soup: BeautifulSoup) -> Optional[int]:
-        for raw in self._jsonld_blobs(soup):
-            for match in JSONLD_DURATION_RE.finditer(raw):
-                duration = self._parse_iso8601_duration(match.group(1))
-                if duration:
-                    return duration
+    def _first_jsonld_date(self, values: list) -> Optional[str]:
+        for value in values:
+            iso = self._parse_single_date_text(value) if isinstance(value, str) else None
+            if iso:
+                return iso
+        return None
 
-        full_text = self._extract_text(soup)
-        match = re.search(r"\bdur(?:ée|e)?\s*:\s*([^\s•|]+)", full_text, flags=re.IGNORECASE)
-        if match:
-            return self._parse_duration(match.group(1))
+    def _first_jsonld_duration(self, values: list) -> Optional[int]:
+        for value in values:
+            duration = self._parse_iso8601_duration(value) if isinstance(value, str) else None
+            if duration:
+                return duration
+        return None
 
+    def _prices_from_blocks(self, blocks: list[TextBlock]) -> Optional[tuple[float, float]]:
+        """Prix du premier bloc qui parle de tarif."""
+        for block in blocks:
+            if not PRICE_CONTEXT_RE.search(block.text):
+                continue
+            lo, hi = self._parse_prices(block.text)
+            if lo is not None:
+                return lo, hi
         return None
 
+    def _duration_from_blocks(self, blocks: list[TextBlock]) -> Optional[int]:
+        duration_texts = [
+            block.text
+            for block in blocks
+            if self._looks_like_duration_text(block.text, allow_hour_only=bool(block.tags & HOUR_ONLY_DURATION_SELECTORS))
+        ]
+        if not duration_texts:
+            return None
+        return self._parse_duration(" • ".join(duration_texts))
+
+    @_timed("validate_show")
     def _validate_show(self, show: Show) -> Optional[Show]:
         show.title = self._clean_text(show.title)
         show.section = self._clean_text(show.section)
@@ -797,7 +2790,7 @@ class OffiScraper:
 
         if not show.title:
             logging.warning("Show ignoré sans titre: %s", show.url)
-            self.stats.invalid_shows += 1
+            self.stats.incr("invalid_shows")
             return None
 
         if not show.section:
@@ -805,7 +2798,7 @@ class OffiScraper:
 
         if show.section not in SECTION_VALUES:
             logging.warning("Show ignoré car section invalide: %s (%s)", show.url, show.section)
-            self.stats.invalid_shows += 1
+            self.stats.incr("invalid_shows")
             return None
 
         if not show.category and show.section == "theatre":
@@ -847,124 +2840,119 @@ class OffiScraper:
 
         if show.is_empty():
             logging.warning("Show ignoré car insuffisamment renseigné: %s", show.url)
-            self.stats.invalid_shows += 1
+            self.stats.incr("invalid_shows")
             return None
 
         return show
 
     # ---------------- Extraction depuis page détail ----------------
 
-    def _complete_theatre_show_from_detail_page(self, show: Show, soup: BeautifulSoup) -> Show:
-        if not show.venue:
-            venue = self._venue_from_show_url(show.url)
-            if venue:
-                show.venue = venue
-
-        config = self._get_section_config("theatre")
-        breadcrumbs = soup.select("nav.breadcrumb a, .breadcrumb a, ol.breadcrumb a") or []
-        for bc in reversed(breadcrumbs):
-            href = bc.get("href", "")
-            if config and config.venue_path_re and config.venue_path_re.match(urlparse(urljoin(BASE_URL, href)).path or ""):
-                venue_text = self._extract_text(bc)
-                if self._looks_like_venue_text(venue_text):
-                    show.venue = venue_text
-                    break
-
-        if not show.address:
-            show.address = self._extract_address(soup)
-
-        if not (show.date_start and show.date_end):
-            date_bins: List[str] = []
-            for sel in [
-                "time", ".date", ".dates", ".informations", ".meta",
-                "[class*=date]", "[id*=date]", "section", "article"
-            ]:
-                for el in soup.select(sel):
-                    txt = self._extract_text(el)
-                    if txt and len(txt) > 6:
-                        date_bins.append(txt)
-            date_text = " • ".join(date_bins[:30])
-            date_start, date_end = self._parse_date_range_text(date_text)
-            if date_start:
-                show.date_start = date_start
-            if date_end:
-                show.date_end = date_end
-
-        if not (show.date_start and show.date_end):
-            date_start, date_end = self._dates_from_jsonld(soup)
-            if date_start and (not show.date_start or date_start < show.date_start):
-                show.date_start = date_start
-            if date_end and (not show.date_end or date_end > show.date_end):
-                show.date_end = date_end
-
-        if not show.category:
-            show.category = self._extract_theatre_category(show.description or "")
-
-        if show.price_min_eur is None:
-            for el in soup.find_all(string=re.compile(r"tarif|prix|billet", re.IGNORECASE)):
-                parent_text = self._extract_text(getattr(el, "parent", None))
-                if parent_text:
-                    lo, hi = self._parse_prices(parent_text)
-                    if lo is not None:
-                        show.price_min_eur, show.price_max_eur = lo, hi
-                        break
-
-        if not show.duration_min:
-            duration_texts = []
-            for sel, allow_hour_only in [
-                (".informations", False),
-                (".meta", False),
-                ("section", False),
-                ("article", False),
-                ("p", False),
-                ("[class*=durée]", True),
-                ("[class*=duree]", True),
-            ]:
-                for el in soup.select(sel):
-                    text = self._extract_text(el)
-                    if text and self._looks_like_duration_text(text, allow_hour_only=allow_hour_only):
-                        duration_texts.append(text)
-            if duration_texts:
-                show.duration_min = self._parse_duration(" • ".join(duration_texts[:8]))
-
-        return show
-
-    def _complete_cinema_show_from_detail_page(self, show: Show, soup: BeautifulSoup) -> Show:
-        if not show.category:
-            show.category = self._extract_cinema_category(soup)
-
-        if not show.date_start:
-            show.date_start = self._extract_cinema_release_date(soup)
+    def _source_value(self, page: PageContext, source: FieldSource, show: Show):
+        """Valeur brute d'une source, telle que la reçoit son lecteur (vide si la page ne la fournit pas)."""
+        if source.kind == "elements":
+            return [el for selector in source.keys for el in page.select(selector)]
+        if source.kind == "blocks":
+            return page.blocks_for(source.keys) if source.keys else page.text_blocks
+        if source.kind == "jsonld":
+            return list(page.jsonld_values(*source.keys))
+        if source.kind == "meta":
+            for key in source.keys:
+                content = page.meta(*key.split("=", 1))
+                if content:
+                    return urljoin(show.url, content) if source.url else content.strip()
+            return None
+        if source.kind == "text":
+            if source.pattern is None:
+                return page.full_text
+            match = source.pattern.search(page.full_text)
+            return match.group(1) if match else None
+        if source.kind == "url":
+            return show.url
+        if source.kind == "field":
+            return getattr(show, source.keys[0])
+        raise ValueError(f"Source de champ inconnue: {source.kind}")
 
-        if not show.duration_min:
-            show.duration_min = self._extract_cinema_duration(soup)
+    @staticmethod
+    def _is_missing(value) -> bool:
+        return value is None or value == ""
 
+    def _merge_field(self, show: Show, targets: tuple[str, ...], found, merge: str) -> None:
+        values = found if len(targets) > 1 else (found,)
+        for index, (target, value) in enumerate(zip(targets, values)):
+            if self._is_missing(value):
+                continue
+            current = getattr(show, target)
+            if self._is_missing(current):
+                setattr(show, target, value)
+            elif merge == "widen" and (value < current if index == 0 else value > current):
+                setattr(show, target, value)
+
+    def _complete_fields(self, show: Show, page: PageContext, specs: tuple[FieldSpec, ...]) -> Show:
+        """Remplit les champs manquants de `show` selon la spec : chaque source dans l'ordre, tant qu'il manque une cible.
+
+        Toutes les sources lisent l'index du DOM de `page`, construit en un seul parcours.
+        """
+        for spec in specs:
+            if not any(self._is_missing(getattr(show, target)) for target in spec.targets):
+                continue
+            with self.stats.timed(spec.timing_stage):
+                for source in spec.sources:
+                    value = self._source_value(page, source, show)
+                    if not value:
+                        continue
+                    found = source.parse(self, value) if source.parse else value
+                    if found is not None:
+                        self._merge_field(show, spec.targets, found, source.merge)
+                    if not any(self._is_missing(getattr(show, target)) for target in spec.targets):
+                        break
         return show
 
-    def _complete_show_from_detail_page(self, show: Show) -> Show:
+    def _complete_show_from_detail_page(self, show: Show, cached_show: Optional[Show] = None) -> Show:
         show.section = show.section or self._infer_section_from_url(show.url)
 
-        soup = self._fetch_page(show.url)
-        if not soup:
+        page = self._fetch_html(show.url)
+        if not page:
             return show
+        return self._complete_show_from_page(show, page, cached_show)
+
+    def _complete_show_from_page(self, show: Show, page: FetchedPage, cached_show: Optional[Show] = None) -> Show:
+        """Page inchangée (304) + fiche complète en cache : on la reprend telle quelle, sans parsing."""
+        if page.not_modified and cached_show is not None and self._is_cache_complete(cached_show):
+            revalidated = self._merge_seed_with_cache(show, cached_show)
+            revalidated.crawled_at = show.crawled_at
+            return revalidated
+        return self._complete_show_from_soup(show, self._parse_html(page.html, "detail"))
+
+    @_timed("extract")
+    def _complete_show_from_soup(self, show: Show, soup: BeautifulSoup) -> Show:
+        """Complète la fiche ; sans lieu servi par l'index, propose celui lu sur la page à `VenueIndex`."""
+        show.section = show.section or self._infer_section_from_url(show.url)
+        config = self._get_section_config(show.section) or SECTION_CONFIGS["theatre"]
+        page = PageContext(soup)
+        read_venue = config.venue_path_re is not None and self._is_missing(show.address)
+        show = self._complete_fields(show, page, config.fields)
+        if read_venue:
+            venue = self._venue_from_reference_sources(show, page, config.fields)
+            if venue is not None:
+                self._venues.propose(show.url, venue)
+        return show
 
-        if not show.title:
-            h1 = soup.find("h1")
-            if h1:
-                show.title = self._extract_text(h1)
-
-        if not show.image:
-            og = soup.find("meta", property="og:image")
-            if og and og.get("content"):
-                show.image = urljoin(show.url, og["content"])
-
-        if not show.description:
-            show.description = self._extract_description(soup)
-
-        if show.section == "cinema":
-            return self._complete_cinema_show_from_detail_page(show, soup)
+    def _venue_from_reference_sources(self, show: Show, page: PageContext, specs: tuple[FieldSpec, ...]) -> Optional[Venue]:
+        """Lieu de la fiche lu sur les seules sources `venue_index` : nom et adresse, ou None.
 
-        return self._complete_theatre_show_from_detail_page(show, soup)
+        Un nom de carte ou tiré de l'URL, une adresse trouvée dans le texte libre ne sont pas indexés.
+        """
+        slug = self._venue_slug(show.url)
+        if not slug:
+            return None
+        found: dict[str, Optional[str]] = {}
+        for spec in specs:
+            for source in spec.sources:
+                if source.venue_index and spec.targets[0] not in found:
+                    value = self._source_value(page, source, show) or None
+                    found[spec.targets[0]] = source.parse(self, value) if value and source.parse else value
+        name, address = self._clean_text(found.get("venue")), self._clean_text(found.get("address"))
+        return Venue(slug, name, address) if name and address else None
 
     # ---------------- Génération des pages programme ----------------
 
@@ -980,95 +2968,1048 @@ class OffiScraper:
 
     # ---------------- Crawl principal ----------------
 
-    def crawl_programme(self, output_file: str, max_pages: int = 150) -> CrawlStats:
-        logging.info("Démarrage crawl programme - Sections: %s - Max pages: %s", ",".join(self.sections), max_pages)
-        output_dir = os.path.dirname(output_file)
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
+    @_timed("extract_show_links")
+    def _extract_show_links(self, soup: BeautifulSoup, section: str) -> list[tuple[str, Tag]]:
+        """Liens de fiches détail d'une page programme, normalisés et dédupliqués (ordre conservé)."""
+        candidate_links: list[tuple[str, Tag]] = []
+        for link in soup.find_all("a", href=True):
+            href = link.get("href")
+            if not href:
+                continue
+            link_text = (link.get_text(strip=True) or "").strip()
+            if link_text.isdigit():
+                continue
+            normalized_url = self._normalize_show_url(href, section)
+            if normalized_url:
+                candidate_links.append((normalized_url, link))
+
+        if self.debug:
+            logging.debug("[DEBUG] Candidats %s (normalisés): %s", section, len(candidate_links))
+            for candidate_url, link in candidate_links[:20]:
+                logging.debug("[DEBUG] candidat %s: %s | txt: %s", section, candidate_url, (link.get_text(strip=True) or "")[:80])
+
+        deduped_urls: list[tuple[str, Tag]] = []
+        seen: set[str] = set()
+        for normalized_url, link_el in candidate_links:
+            if normalized_url in seen:
+                continue
+            deduped_urls.append((normalized_url, link_el))
+            seen.add(normalized_url)
+        return deduped_urls
+
+    def _seed_show(self, abs_url: str, section: str, link_el: Tag) -> Show:
+        show = Show(url=abs_url, section=section, crawled_at=datetime.now(timezone.utc).isoformat())
+        link_text = (link_el.get_text(strip=True) or "").strip()
+        if link_text and not link_text.isdigit():
+            show.title = link_text
+        config = self._get_section_config(section)
+        if config and config.card:
+            card = self._listing_card(link_el, config.card)
+            if card is not None:
+                self._complete_show_from_card(show, card, config.card, link_el)
+        venue = self._venues.get(self._venue_slug(abs_url))
+        if venue is not None:
+            show.venue, show.address = venue.name, venue.address
+            self.stats.incr("venue_index_hits")
+        return show
+
+    @staticmethod
+    def _listing_card(link_el: Tag, spec: ListingCardConfig) -> Optional[Tag]:
+        """Carte englobant le lien : premier ancêtre (à `max_depth` niveaux au plus) qui matche `containers`."""
+        matchers = [_compile_simple_selector(selector) for selector in spec.containers]
+        el = link_el.parent
+        for _ in range(spec.max_depth):
+            if el is None or el.name == BeautifulSoup.ROOT_TAG_NAME:
+                return None
+            if any(match(el) for match in matchers):
+                return el
+            el = el.parent
+        return None
+
+    @_timed("extract_card")
+    def _complete_show_from_card(self, show: Show, card: Tag, spec: ListingCardConfig, link_el: Tag) -> Show:
+        """Remplit le seed avec les champs affichés sur sa carte ; chaque champ lu est compté dans les stats.
+
+        Une carte ne compte que quelques balises : elles sont listées une fois, puis testées par sélecteur.
+        """
+        before = {name: getattr(show, name) for name in SHOW_FIELDS}
+        tags = [el for el in card.descendants if isinstance(el, Tag)]
+        if not show.title:
+            # Lien image : le titre est sur un autre lien de la carte vers la même fiche
+            href = link_el.get("href")
+            for el in tags:
+                if el.name == "a" and el.get("href") == href:
+                    text = self._extract_text(el)
+                    if text and not text.isdigit():
+                        show.title = text
+                        break
+        for kind, selectors in spec.fields.items():
+            text = self._card_text(tags, selectors)
+            if not text:
+                continue
+            if kind == "title":
+                show.title = show.title or text
+            elif kind == "venue":
+                if self._looks_like_venue_text(text):
+                    show.venue = text
+            elif kind == "category":
+                show.category = self._clean_text(text.lower())
+            elif kind == "dates":
+                show.date_start, show.date_end = self._parse_date_range_text(text)
+            elif kind == "release_date":
+                show.date_start = self._parse_single_date_text(text)
+            elif kind == "price":
+                show.price_min_eur, show.price_max_eur = self._parse_prices(text)
+            elif kind == "duration":
+                if self._looks_like_duration_text(text, allow_hour_only=True):
+                    show.duration_min = self._parse_duration(text)
+        for name, value in before.items():
+            if value is None and getattr(show, name) is not None:
+                self.stats.incr_labelled("card_fields", name)
+        return show
+
+    def _card_text(self, tags: list[Tag], selectors: tuple[str, ...]) -> Optional[str]:
+        for selector in selectors:
+            match = _compile_simple_selector(selector)
+            for el in tags:
+                if match(el):
+                    text = self._extract_text(el)
+                    if text:
+                        return text
+        return None
+
+    def _card_covers(self, seed: Show) -> bool:
+        config = self._get_section_config(seed.section)
+        return bool(config and config.card) and all(getattr(seed, name) is not None for name in config.card.covers)
+
+    def _page_seeds(self, soup: BeautifulSoup, section: str) -> list[Show]:
+        """Fiches d'une page programme pas encore vues dans ce crawl."""
+        seeds: list[Show] = []
+        for abs_url, link_el in self._extract_show_links(soup, section):
+            if abs_url in self._seen_urls:
+                continue
+            self._seen_urls.add(abs_url)
+            seeds.append(self._seed_show(abs_url, section, link_el))
+        return seeds
+
+    def _record_completion(self, before: Show, show: Show) -> Show:
+        self.stats.incr("shows_completed")
+        self.stats.incr("detail_fetches")
+        if self.debug:
+            logging.debug("[DEBUG] Complété: %s", show.url)
+            logging.debug("[DEBUG]   avant: %s", json.dumps(asdict(before), ensure_ascii=False))
+            logging.debug("[DEBUG]   après: %s", json.dumps(asdict(show), ensure_ascii=False))
+        return show
+
+    def _reuse_cached(self, show: Show, cached_show: Show) -> Show:
+        show = self._merge_seed_with_cache(show, cached_show)
+        self.stats.incr("cached_reused")
+        if self.debug:
+            logging.debug("[DEBUG] Réutilisé depuis cache: %s", show.url)
+        return show
+
+    def _resolve_show(self, show: Show) -> Show:
+        """Complète une fiche depuis sa page détail, ou la reprend du cache si elle est encore fraîche."""
+        cached_show = self._cached_show(show.url)
+        if not self._should_refresh_detail(cached_show, show):
+            return self._reuse_cached(show, cached_show)
+        return self._refresh_show(show, cached_show)
+
+    def _refresh_show(self, show: Show, cached_show: Optional[Show]) -> Show:
+        before = Show(**asdict(show))
+        return self._record_completion(before, self._complete_show_from_detail_page(show, cached_show))
+
+    async def _resolve_show_async(self, show: Show, bucket: TokenBucket, slots: asyncio.Semaphore) -> Show:
+        cached_show = self._cached_show(show.url)
+        if not self._should_refresh_detail(cached_show, show):
+            return self._reuse_cached(show, cached_show)
+        before = Show(**asdict(show))
+        show.section = show.section or self._infer_section_from_url(show.url)
+        async with slots:
+            page = await self._fetch_html_async(show.url, bucket)
+        if page:
+            show = await asyncio.to_thread(self._complete_show_from_page, show, page, cached_show)
+        return self._record_completion(before, show)
+
+    def _resolve_shows(self, seeds: list[Show], executor: Optional[ThreadPoolExecutor]):
+        """Résout les fiches d'une page, en parallèle si un pool est fourni, dans l'ordre des seeds."""
+        if executor is None:
+            return map(self._resolve_show, seeds)
+        return executor.map(self._resolve_show, seeds)
+
+    def _accept_show(self, show: Show) -> Optional[Show]:
+        """Fiche validée, comptée, versée au delta, à l'index des lieux et au cache ; None si rejetée."""
+        validated = self._validate_show(show)
+        if not validated:
+            self._venues.pop_proposed(show.url)
+            return None
+        self.stats.incr("shows_extracted")
+        self._record_change(validated)
+        venue_change = self._venues.accept(validated.url)
+        if venue_change:
+            self.stats.incr(f"venues_{venue_change}")
+        if self._cache:
+            self._cache.put(validated)
+            self.stats.incr("cached_written")
+        return validated
+
+    def _record_change(self, show: Show) -> None:
+        """Compare la fiche à sa version en cache (avant écrasement) ; ajouts et changements vont au delta."""
+        previous = self._cache.get(show.url) if self._cache else None
+        fingerprint = show.fingerprint()
+        changed = previous is not None and previous.fingerprint() != fingerprint
+        if previous is not None and previous.crawled_at != show.crawled_at:
+            # Fiche refetchée (une fiche reprise du cache garde son `crawled_at`) : suivi pour le backoff
+            self._cache.record_refresh(show.url, changed)
+        if previous is None:
+            change = "added"
+        elif changed:
+            change = "changed"
+        else:
+            self.stats.incr("shows_unchanged")
+            return
+        self.stats.incr(f"shows_{change}")
+        if self._delta is not None:
+            self._delta.write(
+                {"change": change, "url": show.url, "section": show.section, "fingerprint": fingerprint, "show": asdict(show)}
+            )
+
+    def _emit_removals(self) -> list[str]:
+        """Fiches en cache absentes de ce crawl, pour les seules sections parcourues jusqu'au bout.
+
+        Une section coupée par `max_pages` ou dont une page programme a échoué n'a pas été vue en
+        entier : rien n'y est marqué supprimé. Les fiches supprimées sortent aussi du cache.
+        """
+        if not self._cache:
+            return []
+        removed: list[str] = []
+        for section in self.sections:
+            if section not in self._sections_ended or section in self._sections_incomplete:
+                logging.info("Section %s incomplète : pas de détection des fiches retirées", section)
+                continue
+            for url in self._cache.urls(section):
+                if url in self._seen_urls:
+                    continue
+                removed.append(url)
+                if self._delta is not None:
+                    previous = self._cache.get(url)
+                    self._delta.write(
+                        {"change": "removed", "url": url, "section": section, "fingerprint": previous.fingerprint()}
+                    )
+        self.stats.shows_removed = len(removed)
+        return removed
+
+    def _end_of_pagination(self, section: str, section_page_index: int, page_shows: int) -> bool:
+        logging.info("Page %s/%s: %s fiches extraites", section, section_page_index, page_shows)
+        if page_shows == 0 and section_page_index > 1:
+            logging.info("Aucune fiche trouvée pour %s, fin de pagination probable", section)
+            self._sections_ended.add(section)
+            return True
+        return False
+
+    def _programme_page_failed(self, section: str, url: str) -> None:
+        logging.warning("Impossible de récupérer %s", url)
+        self.stats.incr("pages_failed")
+        self._sections_incomplete.add(section)
 
-        with open(output_file, "w", encoding="utf-8") as f:
+    @staticmethod
+    def _partial_size(path: str) -> int:
+        partial_path = JsonlWriter.partial_path_for(path)
+        return os.path.getsize(partial_path) if os.path.exists(partial_path) else -1
+
+    def _open_checkpoint(self, output_file: str, max_pages: int, resume: bool) -> CrawlCheckpoint:
+        """Checkpoint à reprendre si `resume` et s'il correspond à ce crawl, sinon un checkpoint vierge."""
+        fresh = CrawlCheckpoint(
+            output_file=output_file,
+            sections=list(self.sections),
+            max_pages=max_pages,
+            compress=self.output_compress,
+            delta_file=self.delta_file,
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+        if not resume:
+            return fresh
+        checkpoint = CrawlCheckpoint.load(output_file)
+        if checkpoint is None:
+            logging.info("Aucun checkpoint pour %s, crawl complet", output_file)
+            return fresh
+        age = checkpoint.age()
+        if age is None or age > CHECKPOINT_MAX_AGE:
+            logging.warning(
+                "Checkpoint de %s trop ancien (%s), reprise ignorée", output_file, age or "date inconnue"
+            )
+            return fresh
+        output_size = self._partial_size(output_file)
+        delta_size = self._partial_size(checkpoint.delta_file) if checkpoint.delta_file else 0
+        seen_urls = checkpoint.read_seen()
+        if (
+            checkpoint.sections != fresh.sections
+            or checkpoint.max_pages != max_pages
+            or checkpoint.compress != fresh.compress
+            or checkpoint.delta_file != fresh.delta_file
+            or output_size < checkpoint.output_offset
+            or delta_size < checkpoint.delta_offset
+            or seen_urls is None
+        ):
+            logging.warning("Checkpoint de %s incompatible avec ce crawl, reprise ignorée", output_file)
+            return fresh
+        self._seen_urls = seen_urls
+        self._sections_ended = set(checkpoint.sections_ended)
+        self._sections_incomplete = set(checkpoint.sections_incomplete)
+        self.stats.shows_extracted = checkpoint.shows_written
+        for name, count in checkpoint.changes.items():
+            setattr(self.stats, name, count)
+        logging.info(
+            "Reprise du crawl après %s page %s (%s fiches déjà écrites)",
+            checkpoint.section or "-",
+            checkpoint.page_index,
+            checkpoint.shows_written,
+        )
+        return checkpoint
+
+    def _save_checkpoint(
+        self, writer: JsonlWriter, section: str, section_page_index: Optional[int], urls: tuple[str, ...] = ()
+    ) -> None:
+        """Enregistre la page `section_page_index` comme traitée, ou la section comme terminée si None.
+
+        `urls` (les URLs découvertes par la page) sont ajoutées aux URLs vues du checkpoint : le
+        coût d'une sauvegarde ne croît pas avec le nombre de pages déjà crawlées.
+        """
+        checkpoint = self._checkpoint
+        if section_page_index is None:
+            if section not in checkpoint.sections_done:
+                checkpoint.sections_done.append(section)
+            checkpoint.section, checkpoint.page_index = None, 0
+        else:
+            checkpoint.section, checkpoint.page_index = section, section_page_index
+        if urls:
+            checkpoint.append_seen(urls)
+        checkpoint.output_offset = writer.sync()
+        if self._delta is not None:
+            checkpoint.delta_offset = self._delta.sync()
+        checkpoint.shows_written = self.stats.shows_extracted
+        checkpoint.sections_ended = sorted(self._sections_ended)
+        checkpoint.sections_incomplete = sorted(self._sections_incomplete)
+        checkpoint.changes = {name: getattr(self.stats, name) for name in CHANGE_COUNTERS}
+        checkpoint.save()
+
+    def _crawl_sync(self, max_pages: int) -> Iterator[Show | PageDone]:
+        pool = ThreadPoolExecutor(max_workers=self.concurrency) if self.concurrency > 1 else nullcontext()
+        with pool as executor:
             for section in self.sections:
+                done = self._checkpoint.pages_done(section)
+                if done is None:
+                    continue
                 programme_urls = self._get_programme_pages(section, max_pages)
-                for section_page_index, url in enumerate(programme_urls, start=1):
+                for section_page_index, url in enumerate(programme_urls[done:], start=done + 1):
                     logging.info("Crawling %s page %s: %s", section, section_page_index, url)
-                    soup = self._fetch_page(url)
+                    soup = self._fetch_page(url, "programme")
                     if not soup:
-                        logging.warning("Impossible de récupérer %s", url)
-                        self.stats.pages_failed += 1
+                        self._programme_page_failed(section, url)
+                        yield PageDone(section, section_page_index)
                         continue
-                    self.stats.pages_crawled += 1
-
-                    all_links = soup.find_all("a", href=True)
-                    candidate_links: list[tuple[str, Tag]] = []
-                    for link in all_links:
-                        href = link.get("href")
-                        if not href:
-                            continue
-                        link_text = (link.get_text(strip=True) or "").strip()
-                        if link_text.isdigit():
-                            continue
-                        normalized_url = self._normalize_show_url(href, section)
-                        if normalized_url:
-                            candidate_links.append((normalized_url, link))
-
-                    if self.debug:
-                        logging.debug("[DEBUG] Candidats %s (normalisés): %s", section, len(candidate_links))
-                        for candidate_url, link in candidate_links[:20]:
-                            logging.debug("[DEBUG] candidat %s: %s | txt: %s", section, candidate_url, (link.get_text(strip=True) or "")[:80])
-
-                    deduped_urls: list[tuple[str, Tag]] = []
-                    seen: set[str] = set()
-                    for normalized_url, link_el in candidate_links:
-                        if normalized_url in seen:
-                            continue
-                        deduped_urls.append((normalized_url, link_el))
-                        seen.add(normalized_url)
+                    self.stats.incr("pages_crawled")
 
+                    seeds = self._page_seeds(soup, section)
                     page_shows = 0
-                    for abs_url, link_el in deduped_urls:
-                        if abs_url in self._seen_urls:
+                    for show in self._resolve_shows(seeds, executor):
+                        validated = self._accept_show(show)
+                        if validated:
+                            page_shows += 1
+                            yield validated
+                    yield PageDone(section, section_page_index, tuple(seed.url for seed in seeds))
+                    if self._end_of_pagination(section, section_page_index, page_shows):
+                        break
+                yield PageDone(section, None)
+
+    async def _crawl_async(self, max_pages: int) -> AsyncIterator[Show | PageDone]:
+        """Moteur asyncio : la page programme suivante est prefetchée pendant les fiches détail
+        de la page courante, le tout sous un seul token bucket. Les fiches suivent l'ordre des seeds."""
+        bucket = self._bucket
+        slots = asyncio.Semaphore(self.concurrency)
+        for section in self.sections:
+            done = self._checkpoint.pages_done(section)
+            if done is None:
+                continue
+            programme_urls = self._get_programme_pages(section, max_pages)
+            next_page = None
+            if done < len(programme_urls):
+                next_page = asyncio.create_task(self._fetch_page_async(programme_urls[done], bucket, "programme"))
+            for section_page_index, url in enumerate(programme_urls[done:], start=done + 1):
+                logging.info("Crawling %s page %s: %s", section, section_page_index, url)
+                soup = await next_page
+                next_page = None
+                if section_page_index < len(programme_urls):
+                    next_page = asyncio.create_task(
+                        self._fetch_page_async(programme_urls[section_page_index], bucket, "programme")
+                    )
+                if not soup:
+                    self._programme_page_failed(section, url)
+                    yield PageDone(section, section_page_index)
+                    continue
+                self.stats.incr("pages_crawled")
+
+                seeds = self._page_seeds(soup, section)
+                tasks = [asyncio.create_task(self._resolve_show_async(seed, bucket, slots)) for seed in seeds]
+                page_shows = 0
+                for task in tasks:
+                    validated = self._accept_show(await task)
+                    if validated:
+                        page_shows += 1
+                        yield validated
+                yield PageDone(section, section_page_index, tuple(seed.url for seed in seeds))
+                if self._end_of_pagination(section, section_page_index, page_shows):
+                    break
+            if next_page is not None:
+                next_page.cancel()
+            yield PageDone(section, None)
+
+    def _start_parse_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(
+            max_workers=self.parse_workers, initializer=_init_parse_worker, initargs=(self.parser,)
+        )
+        # Les processus sont créés avant les threads du crawl (fork d'un processus mono-thread)
+        pool.submit(_parse_worker_ready).result()
+        return pool
+
+    def _crawl_pipeline(self, max_pages: int) -> Iterator[Show | PageDone]:
+        """Moteur en étapes reliées par des files bornées (la file pleine bloque l'étape amont) :
+        découverte des liens programme -> fetchers détail (threads, I/O) -> parsing (pool de
+        processus, hors GIL) -> écrivain unique qui remet les fiches dans l'ordre des seeds.
+
+        La découverte prend de l'avance sur l'écriture ; si l'écrivain constate la fin de pagination
+        d'une section, les fiches des pages suivantes déjà lancées sont écartées, si bien que la
+        sortie et les checkpoints sont ceux du moteur `sync`. L'écrivain est le générateur lui-même :
+        une fiche n'est produite qu'une fois toutes les précédentes remises dans l'ordre.
+        """
+        stop = threading.Event()
+        fetch_q: queue.Queue = queue.Queue(maxsize=self.pipeline_queue_size)
+        parse_q: queue.Queue = queue.Queue(maxsize=self.pipeline_queue_size)
+        write_q: queue.Queue = queue.Queue(maxsize=self.pipeline_queue_size)
+        stages = {
+            "discover": PipelineStage("discover", 1),
+            "fetch": PipelineStage("fetch", self.concurrency, fetch_q),
+            "parse": PipelineStage("parse", self.parse_workers, parse_q),
+            "write": PipelineStage("write", 1, write_q),
+        }
+        section_stops = {section: threading.Event() for section in self.sections}
+        fetchers_left = [self.concurrency]
+        fetchers_lock = threading.Lock()
+        put = PipelineStage.put
+
+        def run_stage(body):
+            def target():
+                try:
+                    body()
+                except BaseException as exc:  # remonté à l'écrivain, qui arrête tout
+                    put(write_q, ("error", exc), stop)
+                    stop.set()
+                finally:
+                    put(write_q, PIPELINE_DONE, stop)
+            return threading.Thread(target=target, daemon=True)
+
+        def discover():
+            stage = stages["discover"]
+            seq = 0
+            try:
+                for section in self.sections:
+                    done = self._checkpoint.pages_done(section)
+                    if done is None:
+                        continue
+                    programme_urls = self._get_programme_pages(section, max_pages)
+                    for section_page_index, url in enumerate(programme_urls[done:], start=done + 1):
+                        if stop.is_set() or section_stops[section].is_set():
+                            break
+                        with stage.busy():
+                            logging.info("Crawling %s page %s: %s", section, section_page_index, url)
+                            soup = self._fetch_page(url, "programme")
+                            seeds = self._page_seeds(soup, section) if soup else []
+                        if not soup:
+                            logging.warning("Impossible de récupérer %s", url)
+                            self.stats.incr("pages_failed")
+                        else:
+                            self.stats.incr("pages_crawled")
+                        for seed in seeds:
+                            if not put(fetch_q, ("show", seq, section, section_page_index, seed), stop):
+                                return
+                            seq += 1
+                        urls = [seed.url for seed in seeds]
+                        if not put(write_q, ("page", seq, section, section_page_index, urls, soup is None), stop):
+                            return
+                        seq += 1
+                    if not put(write_q, ("section", seq, section), stop):
+                        return
+                    seq += 1
+            finally:
+                for _ in range(self.concurrency):
+                    put(fetch_q, PIPELINE_DONE, stop)
+
+        def fetch():
+            stage = stages["fetch"]
+            try:
+                while (item := stage.get(stop)) is not PIPELINE_DONE:
+                    _, seq, section, section_page_index, show = item
+                    with stage.busy():
+                        cached_show = self._cached_show(show.url)
+                        if not self._should_refresh_detail(cached_show, show):
+                            result, html = self._reuse_cached(show, cached_show), None
+                        else:
+                            before = Show(**asdict(show))
+                            show.section = show.section or self._infer_section_from_url(show.url)
+                            page = self._fetch_html(show.url)
+                            html = page.html if page else None
+                            if page and page.not_modified and cached_show is not None and self._is_cache_complete(cached_show):
+                                show, html = self._complete_show_from_page(show, page, cached_show), None
+                            result = self._record_completion(before, show) if html is None else None
+                    if html is not None:
+                        item = ("parse", seq, section, section_page_index, before, show, html)
+                        if not put(parse_q, item, stop):
+                            return
+                    elif not put(write_q, ("show", seq, section, section_page_index, result), stop):
+                        return
+            finally:
+                with fetchers_lock:
+                    fetchers_left[0] -= 1
+                    last = fetchers_left[0] == 0
+                if last:
+                    for _ in range(self.parse_workers):
+                        put(parse_q, PIPELINE_DONE, stop)
+
+        def parse(pool: ProcessPoolExecutor):
+            stage = stages["parse"]
+            while (item := stage.get(stop)) is not PIPELINE_DONE:
+                _, seq, section, section_page_index, before, show, html = item
+                with stage.busy():
+                    show, timings, venue = pool.submit(_complete_show_in_worker, show, html).result()
+                    self.stats.merge_timings(timings)
+                    if venue is not None:
+                        self._venues.propose(show.url, venue)
+                    show = self._record_completion(before, show)
+                if not put(write_q, ("show", seq, section, section_page_index, show), stop):
+                    return
+
+        started = time.monotonic()
+        owns_pool = self._parse_pool is None
+        pool = self._start_parse_pool() if owns_pool else self._parse_pool
+        threads = [run_stage(discover)]
+        threads += [run_stage(fetch) for _ in range(self.concurrency)]
+        threads += [run_stage(lambda: parse(pool)) for _ in range(self.parse_workers)]
+        for thread in threads:
+            thread.start()
+
+        write_stage = stages["write"]
+        committed_seen = set(self._seen_urls)
+        stopped_sections: set[str] = set()
+        page_shows: dict[tuple[str, int], int] = {}
+        pending: dict[int, tuple] = {}
+        next_seq = 0
+        producers_left = len(threads)
+        try:
+            while producers_left:
+                item = write_stage.get(stop)
+                if item is PIPELINE_DONE:
+                    producers_left -= 1
+                    continue
+                if item[0] == "error":
+                    raise item[1]
+                pending[item[1]] = item
+                while next_seq in pending:
+                    entry = pending.pop(next_seq)
+                    next_seq += 1
+                    with write_stage.busy():
+                        kind, section = entry[0], entry[2]
+                        if section in stopped_sections and kind != "section":
                             continue
-                        self._seen_urls.add(abs_url)
-
-                        show = Show(url=abs_url, section=section, crawled_at=datetime.now(timezone.utc).isoformat())
-
-                        link_text = (link_el.get_text(strip=True) or "").strip()
-                        if link_text and not link_text.isdigit():
-                            show.title = link_text
-
-                        cached_show = self._cache.get(abs_url)
-                        if self._should_refresh_detail(cached_show):
-                            before = asdict(show)
-                            show = self._complete_show_from_detail_page(show)
-                            self.stats.shows_completed += 1
-                            self.stats.detail_fetches += 1
-                            if self.debug:
-                                logging.debug("[DEBUG] Complété: %s", show.url)
-                                logging.debug("[DEBUG]   avant: %s", json.dumps(before, ensure_ascii=False))
-                                logging.debug("[DEBUG]   après: %s", json.dumps(asdict(show), ensure_ascii=False))
+                        if kind == "show":
+                            validated = self._accept_show(entry[4])
+                            if validated:
+                                key = (section, entry[3])
+                                page_shows[key] = page_shows.get(key, 0) + 1
+                                yield validated
+                        elif kind == "page":
+                            _, _, _, section_page_index, urls, failed = entry
+                            committed_seen.update(urls)
+                            if failed:
+                                self._sections_incomplete.add(section)
+                            yield PageDone(section, section_page_index, tuple(urls))
+                            count = page_shows.pop((section, section_page_index), 0)
+                            if not failed and self._end_of_pagination(section, section_page_index, count):
+                                stopped_sections.add(section)
+                                section_stops[section].set()
                         else:
-                            show = self._merge_seed_with_cache(show, cached_show)
-                            self.stats.cached_reused += 1
-                            if self.debug:
-                                logging.debug("[DEBUG] Réutilisé depuis cache: %s", show.url)
+                            yield PageDone(section, None)
+            self._seen_urls = committed_seen
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            if owns_pool:
+                pool.shutdown(cancel_futures=True)
+            wall_s = time.monotonic() - started
+            self.stats.pipeline_stages = {name: stage.report(wall_s) for name, stage in stages.items()}
+            for name, report in self.stats.pipeline_stages.items():
+                logging.info(
+                    "Étape %s : %s workers, %s éléments, occupation %.0f %%, file max %s/%s (moyenne %.1f)",
+                    name,
+                    report["workers"],
+                    report["items"],
+                    report["utilization"] * 100,
+                    report["queue_max"],
+                    report["queue_size"],
+                    report["queue_mean"],
+                )
+
+    def _refresh_priority(self, cached_show: Optional[Show]) -> tuple[int, float]:
+        """Ordre des refreshs sous budget : fiches nouvelles, puis incomplètes, puis les plus anciennes."""
+        if cached_show is None:
+            return 0, 0.0
+        if not self._is_cache_complete(cached_show):
+            return 1, 0.0
+        crawled_at = self._parse_crawled_at(cached_show.crawled_at)
+        return 2, crawled_at.timestamp() if crawled_at is not None else 0.0
+
+    def _crawl_budgeted(self, max_pages: int) -> Iterator[Show | PageDone]:
+        """Crawl sous `--max-requests` / `--deadline`, quel que soit le moteur.
+
+        Les pages programme de toutes les sections sont d'abord parcourues ; les fiches à rafraîchir
+        passent ensuite par une file de priorité (`_refresh_priority`) jusqu'à épuisement du budget.
+        Une fiche non rafraîchie reprend sa version en cache ; une fiche nouvelle non crawlée est
+        laissée au prochain run. L'écriture garde l'ordre des seeds : chaque page programme est émise
+        (et donc checkpointée) dès que toutes ses fiches sont résolues, sans attendre la fin de la file.
+        """
+        pages: list[tuple[str, int, list[int]]] = []
+        seeds: list[Show] = []
+        cut_sections: set[str] = set()
+        for section in self.sections:
+            done = self._checkpoint.pages_done(section)
+            if done is None:
+                continue
+            for section_page_index, url in enumerate(self._get_programme_pages(section, max_pages)[done:], start=done + 1):
+                reason = self._budget.exhausted()
+                if reason:
+                    logging.warning("Budget épuisé (%s) : pages programme %s non parcourues", reason, section)
+                    self._sections_incomplete.add(section)
+                    cut_sections.add(section)
+                    break
+                logging.info("Crawling %s page %s: %s", section, section_page_index, url)
+                try:
+                    soup = self._fetch_page(url, "programme")
+                except _DeadlineReached as exc:
+                    logging.warning("Budget épuisé (%s) : pages programme %s non parcourues", exc, section)
+                    self._sections_incomplete.add(section)
+                    cut_sections.add(section)
+                    break
+                if not soup:
+                    self._programme_page_failed(section, url)
+                    pages.append((section, section_page_index, []))
+                    continue
+                self.stats.incr("pages_crawled")
+                page_seeds = self._page_seeds(soup, section)
+                pages.append((section, section_page_index, list(range(len(seeds), len(seeds) + len(page_seeds)))))
+                seeds.extend(page_seeds)
+                if self._end_of_pagination(section, section_page_index, len(page_seeds)):
+                    break
 
-                        validated = self._validate_show(show)
-                        if not validated:
-                            continue
+        resolved: dict[int, Optional[Show]] = {}
+        cached_shows: dict[int, Show] = {}
+        pending: list[tuple[tuple[int, float], int]] = []
+        for seq, seed in enumerate(seeds):
+            cached_show = self._cached_show(seed.url)
+            if not self._should_refresh_detail(cached_show, seed):
+                resolved[seq] = self._reuse_cached(seed, cached_show)
+                continue
+            if cached_show is not None:
+                cached_shows[seq] = cached_show
+            heapq.heappush(pending, (self._refresh_priority(cached_show), seq))
 
-                        f.write(json.dumps(asdict(validated), ensure_ascii=False) + "\n")
-                        f.flush()
-                        self.stats.shows_extracted += 1
-                        page_shows += 1
+        progress = threading.Condition()
+        stopped = threading.Event()
+        workers_running = [self.concurrency]
 
-                    logging.info("Page %s/%s: %s fiches extraites", section, section_page_index, page_shows)
+        def refresh_worker() -> None:
+            try:
+                while not stopped.is_set():
+                    with progress:
+                        if not pending or self._budget.exhausted():
+                            return
+                        priority, seq = heapq.heappop(pending)
+                    try:
+                        show = self._refresh_show(seeds[seq], cached_shows.get(seq))
+                    except _DeadlineReached:
+                        with progress:
+                            heapq.heappush(pending, (priority, seq))
+                        return
+                    with progress:
+                        resolved[seq] = show
+                        progress.notify()
+            finally:
+                with progress:
+                    workers_running[0] -= 1
+                    progress.notify()
+
+        emitted = 0
+
+        def page_ready() -> bool:
+            return emitted < len(pages) and all(seq in resolved for seq in pages[emitted][2])
+
+        def emit_ready_pages() -> Iterator[Show | PageDone]:
+            nonlocal emitted
+            while True:
+                with progress:
+                    if not page_ready():
+                        return
+                section, section_page_index, page_seqs = pages[emitted]
+                for seq in page_seqs:
+                    validated = self._accept_show(resolved[seq]) if resolved[seq] is not None else None
+                    if validated:
+                        yield validated
+                yield PageDone(section, section_page_index, tuple(seeds[seq].url for seq in page_seqs))
+                emitted += 1
+                last_of_section = emitted == len(pages) or pages[emitted][0] != section
+                if last_of_section and section not in cut_sections:
+                    yield PageDone(section, None)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(refresh_worker) for _ in range(self.concurrency)]
+            try:
+                while True:
+                    yield from emit_ready_pages()
+                    with progress:
+                        if not workers_running[0]:
+                            break
+                        if not page_ready():
+                            progress.wait()
+            finally:
+                # Générateur fermé en cours de route : les workers s'arrêtent après leur fiche en cours
+                stopped.set()
+            for future in futures:
+                future.result()
+        if pending:
+            logging.warning(
+                "Budget épuisé (%s) : %s fiches à rafraîchir reportées au prochain run",
+                self._budget.exhausted(),
+                len(pending),
+            )
+        for _, seq in pending:
+            if seq in cached_shows:
+                self.stats.incr("budget_deferred")
+                resolved[seq] = self._reuse_cached(seeds[seq], cached_shows[seq])
+            else:
+                self.stats.incr("budget_skipped_new")
+                resolved[seq] = None
+        yield from emit_ready_pages()
 
-                    if page_shows == 0 and section_page_index > 1:
-                        logging.info("Aucune fiche trouvée pour %s, fin de pagination probable", section)
-                        break
+    @staticmethod
+    def _iter_async(events: AsyncIterator) -> Iterator:
+        """Parcourt un générateur asynchrone depuis du code synchrone, sur une boucle asyncio dédiée.
+
+        À la fermeture, comme `asyncio.run` : les tâches restantes (prefetch, fiches lancées, étape
+        interrompue par une exception) sont annulées, puis le générateur est fermé avant l'arrêt
+        de la boucle.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(events.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            try:
+                tasks = asyncio.all_tasks(loop)
+                for task in tasks:
+                    task.cancel()
+                if tasks:
+                    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+                loop.run_until_complete(events.aclose())
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.run_until_complete(loop.shutdown_default_executor())
+            finally:
+                loop.close()
+
+    def _crawl_events(self, max_pages: int) -> Iterator[Show | PageDone]:
+        """Fiches validées et pages programme traitées (`PageDone`), dans l'ordre de la sortie."""
+        if self._budget is not None:
+            return self._crawl_budgeted(max_pages)
+        if self.engine == "async":
+            return self._iter_async(self._crawl_async(max_pages))
+        if self.engine == "pipeline":
+            return self._crawl_pipeline(max_pages)
+        return self._crawl_sync(max_pages)
+
+    def _write_events(self, writer: JsonlWriter, events: Iterator[Show | PageDone]) -> None:
+        """Écrit les fiches et enregistre le checkpoint à chaque page programme traitée."""
+        with closing(events):
+            for event in events:
+                if isinstance(event, PageDone):
+                    self._save_checkpoint(writer, event.section, event.page_index, event.urls)
+                else:
+                    writer.write(asdict(event))
+
+    def _reset_crawl_state(self) -> None:
+        """État propre à un crawl (URLs vues, sections, stats, lieux proposés) : le scraper est réutilisable."""
+        self._seen_urls = set()
+        self._sections_ended = set()
+        self._sections_incomplete = set()
+        # Le cache est chargé une fois, à la construction : son compte vaut pour chaque crawl
+        self.stats = CrawlStats(current_rate=self.stats.current_rate, cached_loaded=self.stats.cached_loaded)
+        self._venues.clear_proposed()
+
+    def _start_stream(self, max_pages: int) -> None:
+        """État d'un crawl en flux : checkpoint en mémoire jamais enregistré, pas de delta."""
+        self._reset_crawl_state()
+        self._checkpoint = CrawlCheckpoint(output_file="", sections=list(self.sections), max_pages=max_pages)
+        self._delta = None
+        if self._budget is not None:
+            self._budget.start()
+
+    def iter_shows(self, max_pages: int = 150) -> Iterator[Show]:
+        """Crawl en flux : les fiches validées, au fil du crawl et dans l'ordre de `crawl_programme`.
+
+        Mêmes moteurs, budget, caches et stats que `crawl_programme`, mais rien n'est écrit hors des
+        caches : ni sortie, ni checkpoint, ni delta, ni index des lieux, et pas de détection des
+        fiches retirées. Les sections sont crawlées l'une après l'autre (`parallel_sections` ne
+        vaut que pour `crawl_programme`). Fermer le générateur arrête le crawl.
+        """
+        self._start_stream(max_pages)
+        try:
+            with closing(self._crawl_events(max_pages)) as events:
+                for event in events:
+                    if not isinstance(event, PageDone):
+                        yield event
+        finally:
+            if self._cache:
+                self._cache.flush()
+
+    async def aiter_shows(self, max_pages: int = 150) -> AsyncIterator[Show]:
+        """Pendant asynchrone de `iter_shows`, à parcourir depuis une boucle asyncio existante.
+
+        Le moteur `async` (hors budget) tourne sur la boucle appelante ; les autres moteurs sont
+        bloquants et avancent dans un thread, une fiche à la fois.
+        """
+        if self.engine != "async" or self._budget is not None:
+            shows = self.iter_shows(max_pages)
+            try:
+                while (show := await asyncio.to_thread(next, shows, None)) is not None:
+                    yield show
+            finally:
+                shows.close()
+            return
+        self._start_stream(max_pages)
+        events = self._crawl_async(max_pages)
+        try:
+            async for event in events:
+                if not isinstance(event, PageDone):
+                    yield event
+        finally:
+            await events.aclose()
+            if self._cache:
+                self._cache.flush()
+
+    def _section_crawl(self, section: str, output_file: str) -> "OffiScraper":
+        """Copie limitée à `section`, avec son propre état de crawl (URLs vues, stats, checkpoint).
+
+        Session, throttle (`RateLimiter`, `TokenBucket`, `AdaptiveRate`) et caches restent partagés :
+        les sections parallèles se partagent le même budget de politesse.
+        """
+        section_crawl = copy.copy(self)
+        section_crawl.sections = [section]
+        section_crawl.parallel_sections = False
+        section_crawl.stats = CrawlStats(current_rate=self.stats.current_rate)
+        section_crawl._seen_urls = set()
+        section_crawl._sections_ended = set()
+        section_crawl._sections_incomplete = set()
+        section_crawl._checkpoint = None
+        section_crawl._delta = None
+        section_crawl._part_file = f"{output_file}.{section}"
+        section_crawl.delta_file = f"{self.delta_file}.{section}" if self.delta_file else None
+        return section_crawl
+
+    def _crawl_section_part(self, max_pages: int, resume: bool) -> None:
+        """Crawl d'une section vers `<sortie>.<section>.partial`, repris par son propre checkpoint."""
+        self._checkpoint = self._open_checkpoint(self._part_file, max_pages, resume)
+        writer = JsonlWriter(
+            self._part_file,
+            compress=self.output_compress,
+            buffer_bytes=self.output_buffer_bytes,
+            resume_offset=self._checkpoint.output_offset,
+        )
+        if self.delta_file:
+            self._delta = JsonlWriter(
+                self.delta_file, compress=self.output_compress, resume_offset=self._checkpoint.delta_offset
+            )
+        try:
+            self._write_events(writer, self._crawl_events(max_pages))
+        finally:
+            writer.close()
+            if self._delta is not None:
+                self._delta.close()
+
+    def _remove_section_part(self) -> None:
+        self._checkpoint.remove()
+        for path in (self._part_file, self.delta_file):
+            if path:
+                try:
+                    os.remove(JsonlWriter.partial_path_for(path))
+                except FileNotFoundError:
+                    pass
+
+    def _crawl_sections_in_parallel(
+        self, writer: JsonlWriter, output_file: str, max_pages: int, resume: bool
+    ) -> list["OffiScraper"]:
+        """Une section par thread ; les sorties sont fusionnées dans l'ordre de `sections`.
+
+        La sortie et le delta sont donc ceux d'un crawl séquentiel, quel que soit l'entrelacement.
+        """
+        if self.engine == "pipeline":
+            # Un seul pool de parsing pour toutes les sections, forké avant leurs threads
+            self._parse_pool = self._start_parse_pool()
+        section_crawls = [self._section_crawl(section, output_file) for section in self.sections]
+        try:
+            with ThreadPoolExecutor(max_workers=len(section_crawls), thread_name_prefix="section") as executor:
+                futures = [executor.submit(crawl._crawl_section_part, max_pages, resume) for crawl in section_crawls]
+                for future in futures:
+                    future.result()
+        finally:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(cancel_futures=True)
+                self._parse_pool = None
+
+        for section_crawl in section_crawls:
+            section = section_crawl.sections[0]
+            with open_jsonl(JsonlWriter.partial_path_for(section_crawl._part_file)) as f:
+                for line in f:
+                    if line.strip():
+                        writer.write(json.loads(line))
+            if self._delta is not None:
+                with open_jsonl(JsonlWriter.partial_path_for(section_crawl.delta_file)) as f:
+                    for line in f:
+                        if line.strip():
+                            self._delta.write(json.loads(line))
+            self._seen_urls |= section_crawl._seen_urls
+            self._sections_ended |= section_crawl._sections_ended
+            self._sections_incomplete |= section_crawl._sections_incomplete
+            self.stats.merge_counters(section_crawl.stats)
+            self.stats.merge_timings(section_crawl.stats.timings)
+            for stage, report in section_crawl.stats.pipeline_stages.items():
+                self.stats.pipeline_stages[f"{section}:{stage}"] = report
+            self.stats.sections[section] = section_crawl.stats.counters()
+            logging.info(
+                "Section %s - Pages OK: %s, Pages KO: %s, Fiches: %s, Requêtes: %s, Retries: %s",
+                section,
+                section_crawl.stats.pages_crawled,
+                section_crawl.stats.pages_failed,
+                section_crawl.stats.shows_extracted,
+                section_crawl.stats.requests,
+                section_crawl.stats.retries,
+            )
+        if self._adaptive:
+            self.stats.current_rate = self._adaptive.rate
+        return section_crawls
+
+    def crawl_programme(self, output_file: str, max_pages: int = 150, resume: bool = False) -> CrawlStats:
+        """Crawl complet vers `output_file`. Le cache de fiches est fermé en fin de crawl, même en erreur."""
+        try:
+            return self._crawl_programme(output_file, max_pages, resume)
+        finally:
+            if self._cache:
+                self._cache.close()
+
+    def _crawl_programme(self, output_file: str, max_pages: int, resume: bool) -> CrawlStats:
+        logging.info(
+            "Démarrage crawl programme - Sections: %s - Max pages: %s - Moteur: %s - Concurrence: %s",
+            ",".join(self.sections),
+            max_pages,
+            self.engine,
+            self.concurrency,
+        )
+        self._reset_crawl_state()
+        if self._budget is not None:
+            # La deadline couvre le crawl, pas le chargement des caches ni la construction du scraper
+            self._budget.start()
+        # Sous budget, une seule file de priorité couvre toutes les sections
+        parallel = self.parallel_sections and len(self.sections) > 1 and self._budget is None
+        if parallel:
+            # Chaque section a sa sortie et son checkpoint ; la sortie finale est refaite à la fusion
+            self._checkpoint = None
+            writer = JsonlWriter(output_file, compress=self.output_compress, buffer_bytes=self.output_buffer_bytes)
+        else:
+            self._checkpoint = self._open_checkpoint(output_file, max_pages, resume)
+            writer = JsonlWriter(
+                output_file,
+                compress=self.output_compress,
+                buffer_bytes=self.output_buffer_bytes,
+                resume_offset=self._checkpoint.output_offset,
+            )
+        if self.delta_file:
+            self._delta = JsonlWriter(
+                self.delta_file,
+                compress=self.output_compress,
+                resume_offset=self._checkpoint.delta_offset if self._checkpoint else 0,
+            )
+        section_crawls: list[OffiScraper] = []
+        try:
+            if parallel:
+                section_crawls = self._crawl_sections_in_parallel(writer, output_file, max_pages, resume)
+            else:
+                self._write_events(writer, self._crawl_events(max_pages))
+            removed = self._emit_removals()
+        finally:
+            writer.close()
+            if self._delta is not None:
+                self._delta.close()
+        if not writer.commit():
+            logging.warning("Aucune fiche écrite : %s laissé inchangé", output_file)
+        if self._delta is not None:
+            # Un delta vide est publié aussi : l'ingestion ne doit pas rejouer celui de la veille
+            self._delta.commit(allow_empty=True)
+        if self._checkpoint is not None:
+            self._checkpoint.remove()
+        for section_crawl in section_crawls:
+            section_crawl._remove_section_part()
+        if self._cache:
+            self._cache.delete_many(removed)
+            stale = self._cache.delete_unseen_before(
+                self._seen_urls, (datetime.now(timezone.utc) - CACHE_UNSEEN_TTL).isoformat(), self.sections
+            )
+            if stale:
+                logging.info("Cache : %s fiches absentes du programme depuis plus de %s jours purgées", len(stale), CACHE_UNSEEN_TTL.days)
+            # La sortie est déjà dans le cache : inutile de la réimporter si elle sert de cache au prochain run
+            self._cache.mark_synced(output_file)
+        if self.venues_file and not self._venues.write_jsonl(self.venues_file, self.output_compress):
+            logging.warning("Aucun lieu indexé : %s laissé inchangé", self.venues_file)
+        logging.info(
+            "Changements depuis le cache - Ajoutées: %s, Modifiées: %s, Inchangées: %s, Retirées: %s",
+            self.stats.shows_added,
+            self.stats.shows_changed,
+            self.stats.shows_unchanged,
+            self.stats.shows_removed,
+        )
+        logging.info(
+            "Lieux - Indexés: %s, Ajoutés: %s, Modifiés: %s, Fiches complétées depuis l'index: %s",
+            len(self._venues),
+            self.stats.venues_added,
+            self.stats.venues_changed,
+            self.stats.venue_index_hits,
+        )
+        if self._budget is not None:
+            logging.info(
+                "Budget - Requêtes: %s/%s, Fiches reportées: %s, Nouvelles fiches non crawlées: %s",
+                self._budget.requests,
+                self._budget.max_requests if self._budget.max_requests is not None else "-",
+                self.stats.budget_deferred,
+                self.stats.budget_skipped_new,
+            )
+        if self.stats.refresh_rules:
+            logging.info(
+                "Refresh (%s) - Règles: %s - Refetchs évités: %s",
+                self.refresh_policy.name,
+                ", ".join(f"{rule}: {count}" for rule, count in sorted(self.stats.refresh_rules.items())),
+                ", ".join(f"{rule}: {count}" for rule, count in sorted(self.stats.refresh_avoided.items())) or "0",
+            )
 
         logging.info(
-            "Terminé - Pages OK: %s, Pages KO: %s, Fiches: %s, Complétions: %s, Invalides: %s, Requêtes: %s, Retries: %s, Erreurs réseau: %s, Cache chargé: %s, Cache réutilisé: %s, Détails fetchés: %s",
+            "Terminé - Pages OK: %s, Pages KO: %s, Fiches: %s, Complétions: %s, Invalides: %s, Requêtes: %s, Retries: %s, Erreurs réseau: %s, Cache chargé: %s, Cache réutilisé: %s, Cache écrit: %s, Détails fetchés: %s, 304: %s, Octets économisés: %s, Débit: %.2f req/s, Backoffs: %s",
             self.stats.pages_crawled,
             self.stats.pages_failed,
             self.stats.shows_extracted,
@@ -1079,12 +4020,397 @@ class OffiScraper:
             self.stats.request_failures,
             self.stats.cached_loaded,
             self.stats.cached_reused,
+            self.stats.cached_written,
             self.stats.detail_fetches,
+            self.stats.not_modified,
+            self.stats.bytes_saved,
+            self.stats.current_rate,
+            self.stats.backoff_events,
+        )
+        timings = {stage: h.total_s for stage, h in self.stats.timings.items() if stage in LOGGED_TIMINGS}
+        logging.info(
+            "Temps cumulé par étape - %s, Téléchargé: %s octets",
+            ", ".join(f"{stage}: {timings.get(stage, 0.0):.1f}s" for stage in LOGGED_TIMINGS),
+            self.stats.bytes_downloaded,
         )
         return self.stats
 
 
-def main():
+# ---------------- Configuration des sections ----------------
+
+# Les lecteurs (`FieldSource.parse`) sont des méthodes d'OffiScraper : les specs sont déclarées après la classe.
+# `stage` garde les noms de séries des extracteurs d'avant les specs (extract_theatre_category, extract_cinema_*).
+COMMON_DETAIL_FIELDS = (
+    FieldSpec("title", ("title",), (FieldSource("elements", ("h1",), OffiScraper._first_element_text),)),
+    FieldSpec("image", ("image",), (FieldSource("meta", ("property=og:image",), url=True),)),
+    FieldSpec(
+        "description",
+        ("description",),
+        (
+            FieldSource("elements", ("h2, h3, h4",), OffiScraper._description_after_heading),
+            FieldSource("meta", ("name=description",)),
+        ),
+    ),
+)
+
+
+@dataclass(frozen=True)
+class SectionConfig:
+    programme_url: str
+    show_path_re: re.Pattern[str]
+    venue_path_re: Optional[re.Pattern[str]]
+    default_category: Optional[str]
+    card: Optional[ListingCardConfig] = None
+    # Extraction des fiches détail, champ par champ et dans cet ordre (une source `field` lit un champ précédent)
+    fields: tuple[FieldSpec, ...] = COMMON_DETAIL_FIELDS
+
+
+SECTION_CONFIGS = {
+    "theatre": SectionConfig(
+        programme_url=THEATRE_PROGRAMME_URL,
+        show_path_re=re.compile(r"^/theatre/[^/]+-\d+/[^/]+-\d+\.html$"),
+        venue_path_re=re.compile(r"^/theatre/[^/]+-\d+(?:\.html)?$"),
+        default_category="théâtre",
+        card=ListingCardConfig(
+            containers=(".event-card", "[class*=mini-fiche]"),
+            fields={
+                "title": ("[class*=titre]", "[class*=title]", "h2", "h3"),
+                "venue": (".lieu", "[class*=lieu]", "[class*=venue]"),
+                "dates": (".dates", "[class*=date]"),
+                "price": ("[class*=prix]", "[class*=tarif]", "[class*=price]"),
+            },
+            covers=("venue", "date_end"),
+        ),
+        fields=COMMON_DETAIL_FIELDS + (
+            FieldSpec(
+                "venue",
+                ("venue",),
+                (
+                    FieldSource("elements", (".breadcrumb a",), OffiScraper._venue_from_breadcrumbs, venue_index=True),
+                    FieldSource("url", parse=OffiScraper._venue_from_show_url),
+                ),
+            ),
+            FieldSpec(
+                "address",
+                ("address",),
+                (
+                    FieldSource("elements", ADDRESS_SELECTORS, OffiScraper._address_in_elements, venue_index=True),
+                    FieldSource("text", parse=OffiScraper._address_in_text),
+                ),
+            ),
+            FieldSpec(
+                "dates",
+                ("date_start", "date_end"),
+                (
+                    FieldSource("blocks", THEATRE_DATE_SELECTORS, OffiScraper._date_range_from_blocks),
+                    FieldSource("jsonld", ("startDate", "endDate"), OffiScraper._date_bounds, merge="widen"),
+                ),
+            ),
+            FieldSpec(
+                "category",
+                ("category",),
+                (FieldSource("field", ("description",), OffiScraper._extract_theatre_category),),
+                stage="extract_theatre_category",
+            ),
+            FieldSpec(
+                "price",
+                ("price_min_eur", "price_max_eur"),
+                (FieldSource("blocks", parse=OffiScraper._prices_from_blocks),),
+            ),
+            FieldSpec(
+                "duration",
+                ("duration_min",),
+                (FieldSource("blocks", THEATRE_DURATION_SELECTORS, OffiScraper._duration_from_blocks),),
+            ),
+        ),
+    ),
+    "cinema": SectionConfig(
+        programme_url=CINEMA_PROGRAMME_URL,
+        show_path_re=re.compile(r"^/cinema/evenement/[^/]+-\d+\.html$"),
+        venue_path_re=None,
+        default_category=None,
+        card=ListingCardConfig(
+            containers=(".event-card", "[class*=mini-fiche]"),
+            fields={
+                "title": ("[class*=titre]", "[class*=title]", "h2", "h3"),
+                "category": ("[class*=genre]",),
+                "release_date": ("[class*=sortie]", "[class*=date]"),
+                "duration": ("[class*=duree]", "[class*=durée]"),
+            },
+            covers=("date_start",),
+        ),
+        fields=COMMON_DETAIL_FIELDS + (
+            FieldSpec(
+                "category",
+                ("category",),
+                (
+                    FieldSource("jsonld", ("genre",), OffiScraper._genre_from_jsonld),
+                    FieldSource("text", pattern=CINEMA_GENRE_RE, parse=OffiScraper._lowercase_text),
+                ),
+                stage="extract_cinema_category",
+            ),
+            FieldSpec(
+                "release_date",
+                ("date_start",),
+                (
+                    FieldSource("jsonld", JSONLD_RELEASE_KEYS, OffiScraper._first_jsonld_date),
+                    FieldSource("text", pattern=CINEMA_RELEASE_RE, parse=OffiScraper._parse_single_date_text),
+                ),
+                stage="extract_cinema_release_date",
+            ),
+            FieldSpec(
+                "duration",
+                ("duration_min",),
+                (
+                    FieldSource("jsonld", ("duration",), OffiScraper._first_jsonld_duration),
+                    FieldSource("text", pattern=CINEMA_DURATION_RE, parse=OffiScraper._parse_duration),
+                ),
+                stage="extract_cinema_duration",
+            ),
+        ),
+    ),
+}
+
+CARD_CONTAINER_SELECTORS = tuple(
+    dict.fromkeys(selector for config in SECTION_CONFIGS.values() if config.card for selector in config.card.containers)
+)
+
+# Sélecteurs de toutes les specs de champs, relevés en un seul parcours de chaque fiche détail
+DETAIL_SELECTORS = SelectorIndex(
+    key
+    for config in SECTION_CONFIGS.values()
+    for spec in config.fields
+    for source in spec.sources
+    if source.kind in ("elements", "blocks")
+    for key in source.keys
+)
+
+
+# ---------------- Re-extraction depuis une archive ----------------
+
+_parse_scraper: Optional[OffiScraper] = None
+
+
+def _init_parse_worker(parser: str) -> None:
+    global _parse_scraper
+    _parse_scraper = OffiScraper(parser=parser)
+
+
+def _parse_worker_ready() -> bool:
+    return _parse_scraper is not None
+
+
+def _complete_show_in_worker(
+    show: Show, html: str
+) -> tuple[Show, dict[str, TimingHistogram], Optional[Venue]]:
+    """Étape parsing du moteur pipeline, exécutée dans un processus du pool.
+
+    Les durées mesurées dans le processus (soupe, extracteurs) et le lieu lu sur la page sont
+    renvoyés avec la fiche.
+    """
+    _parse_scraper.stats = CrawlStats()
+    show = _parse_scraper._complete_show_from_soup(show, _parse_scraper._parse_html(html, "detail"))
+    return show, _parse_scraper.stats.timings, _parse_scraper._venues.pop_proposed(show.url)
+
+
+_reparse_scraper: Optional[OffiScraper] = None
+_reparse_archive: Optional[PageArchive] = None
+
+
+def _init_reparse_worker(archive_dir: str, parser: str) -> None:
+    global _reparse_scraper, _reparse_archive
+    _reparse_scraper = OffiScraper(parser=parser)
+    _reparse_archive = PageArchive(archive_dir)
+
+
+def _reparse_entry(entry: ArchivedResponse) -> Optional[dict]:
+    """Extracteurs + validation courants sur une fiche archivée ; la date de crawl est celle du fetch."""
+    scraper = _reparse_scraper
+    show = Show(url=entry.url, section=scraper._infer_section_from_url(entry.url), crawled_at=entry.recorded_at)
+    soup = scraper._parse_html(_reparse_archive.body(entry), "detail")
+    validated = scraper._validate_show(scraper._complete_show_from_soup(show, soup))
+    # La re-extraction ne tient pas d'index des lieux
+    scraper._venues.pop_proposed(show.url)
+    return asdict(validated) if validated else None
+
+
+def reparse_archive(
+    archive_dir: str,
+    output_file: str,
+    workers: Optional[int] = None,
+    parser: str = "html.parser",
+    sections: Optional[List[str]] = None,
+    compress: str = "none",
+) -> CrawlStats:
+    """Ré-extrait les fiches détail d'une archive `--record` sur un pool de processus.
+
+    Le parsing BeautifulSoup étant CPU-bound, le pool est dimensionné aux cœurs par défaut ;
+    la sortie suit l'ordre de l'archive quel que soit le nombre de workers.
+    """
+    selected = OffiScraper._normalize_sections(sections)
+    workers = max(1, workers or os.cpu_count() or 1)
+    entries = [
+        entry for entry in PageArchive(archive_dir).latest_pages()
+        if any(SECTION_CONFIGS[section].show_path_re.match(urlparse(entry.url).path) for section in selected)
+    ]
+    logging.info("Reparse de %s fiches archivées dans %s - Workers: %s", len(entries), archive_dir, workers)
+
+    stats = CrawlStats()
+    writer = JsonlWriter(output_file, compress=compress)
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, initializer=_init_reparse_worker, initargs=(archive_dir, parser))
+        if workers > 1
+        else nullcontext()
+    )
+    started = time.monotonic()
+    try:
+        with pool as executor:
+            if executor is None:
+                _init_reparse_worker(archive_dir, parser)
+                results = map(_reparse_entry, entries)
+            else:
+                results = executor.map(_reparse_entry, entries, chunksize=4)
+            for payload in results:
+                stats.pages_crawled += 1
+                if payload is None:
+                    stats.invalid_shows += 1
+                    continue
+                writer.write(payload)
+                stats.shows_extracted += 1
+    finally:
+        writer.close()
+    writer.commit()
+
+    elapsed = time.monotonic() - started
+    logging.info(
+        "Reparse terminé - Pages: %s, Fiches: %s, Invalides: %s, Durée: %.1fs (%.1f pages/s)",
+        stats.pages_crawled,
+        stats.shows_extracted,
+        stats.invalid_shows,
+        elapsed,
+        stats.pages_crawled / elapsed if elapsed > 0 else 0,
+    )
+    return stats
+
+
+def reparse_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="offi_scraper.py reparse",
+        description="Ré-extrait les fiches d'une archive --record avec les extracteurs actuels, sans réseau",
+    )
+    parser.add_argument("archive", help="Répertoire d'archive produit par --record")
+    parser.add_argument("--out", default="spectacles.jsonl", help="Fichier JSONL de sortie")
+    parser.add_argument("--workers", type=int, default=None, help="Processus de parsing (défaut : nombre de cœurs)")
+    parser.add_argument("--sections", default="theatre,cinema", help="Sections à ré-extraire")
+    parser.add_argument("--out-compress", choices=COMPRESS_VALUES, default="none", help="Compression de la sortie")
+    parser.add_argument("--parser", choices=PARSER_VALUES, default="html.parser", help="Parser HTML de BeautifulSoup")
+    parser.add_argument("--debug", action="store_true", help="Logs détaillés de diagnostic")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=(logging.DEBUG if args.debug else logging.INFO),
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    stats = reparse_archive(
+        args.archive,
+        args.out,
+        workers=args.workers,
+        parser=args.parser,
+        sections=[section.strip() for section in args.sections.split(",")],
+        compress=args.out_compress,
+    )
+    if stats.shows_extracted == 0:
+        logging.error("Aucune fiche extraite")
+        return 2
+    return 0
+
+
+def card_report(archive_dir: str, sections: Optional[List[str]] = None, parser: str = "html.parser") -> dict:
+    """Confronte les sélecteurs de cartes (`ListingCardConfig`) aux pages programme d'une archive `--record`.
+
+    Par section : pages programme et liens de fiches archivés, liens dont la carte est trouvée telle
+    que le crawl la voit (strainer compris), champs de `Show` lus sur les cartes, cartes couvrant
+    `covers`, et classes les plus fréquentes des ancêtres des liens (page complète, jusqu'à
+    `max_depth` niveaux) : les candidats pour `containers` quand les cartes ne sont pas trouvées.
+    """
+    archive = PageArchive(archive_dir)
+    pages = archive.latest_pages()
+    report = {}
+    for section in OffiScraper._normalize_sections(sections):
+        config = SECTION_CONFIGS[section]
+        programme_path = urlparse(config.programme_url).path
+        max_depth = config.card.max_depth if config.card else 4
+        scraper = OffiScraper(parser=parser, sections=[section])
+        programme_pages = links = cards = covered = 0
+        ancestor_classes: Counter[str] = Counter()
+        for entry in pages:
+            if urlparse(entry.url).path != programme_path:
+                continue
+            html = archive.body(entry)
+            programme_pages += 1
+            for abs_url, link_el in scraper._extract_show_links(scraper._parse_html(html, "programme"), section):
+                links += 1
+                if config.card and scraper._listing_card(link_el, config.card) is not None:
+                    cards += 1
+                if scraper._card_covers(scraper._seed_show(abs_url, section, link_el)):
+                    covered += 1
+            for _, link_el in scraper._extract_show_links(scraper._parse_html(html), section):
+                # Du plus proche au plus lointain ancêtre, chaque classe comptée une fois par lien
+                classes: dict[str, None] = {}
+                el = link_el.parent
+                for _ in range(max_depth):
+                    if el is None or el.name == BeautifulSoup.ROOT_TAG_NAME:
+                        break
+                    classes.update(dict.fromkeys(f".{name}" for name in el.get("class") or ()))
+                    el = el.parent
+                ancestor_classes.update(classes.keys())
+        report[section] = {
+            "programme_pages": programme_pages,
+            "show_links": links,
+            "cards": cards,
+            "card_fields": dict(scraper.stats.card_fields),
+            "covered": covered,
+            "ancestor_classes": ancestor_classes.most_common(15),
+        }
+    return report
+
+
+def cards_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="offi_scraper.py cards",
+        description="Vérifie les sélecteurs de cartes sur les pages programme d'une archive --record, sans réseau",
+    )
+    parser.add_argument("archive", help="Répertoire d'archive produit par --record")
+    parser.add_argument("--sections", default="theatre,cinema", help="Sections à vérifier")
+    parser.add_argument("--parser", choices=PARSER_VALUES, default="html.parser", help="Parser HTML de BeautifulSoup")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    report = card_report(
+        args.archive, sections=[section.strip() for section in args.sections.split(",")], parser=args.parser
+    )
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if not any(section["programme_pages"] for section in report.values()):
+        logging.error("Aucune page programme dans %s", args.archive)
+        return 2
+    return 0
+
+
+def _duration_arg(value: str) -> float:
+    """Durée de `--deadline` en secondes : `90s`, `45m`, `2h` ; sans unité, en minutes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Durée invalide: {value} (ex. 90s, 45m, 2h)")
+    return float(match.group(1)) * {"s": 1, "m": 60, "": 60, "h": 3600}[match.group(2)]
+
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["reparse"]:
+        return reparse_main(argv[1:])
+    if argv[:1] == ["cards"]:
+        return cards_main(argv[1:])
+
     parser = argparse.ArgumentParser(description="Scraper Offi.fr - fiches 2 segments, venue fiable, dates robustes")
     parser.add_argument("--out", default="spectacles.jsonl", help="Fichier de sortie")
     parser.add_argument("--max-pages", type=int, default=150, help="Nombre max de pages de programme")
@@ -1094,9 +4420,146 @@ def main():
     parser.add_argument("--retries", type=int, default=4, help="Nombre de retries HTTP")
     parser.add_argument("--timeout", type=float, default=20, help="Timeout HTTP par requête en secondes")
     parser.add_argument("--cache-file", default=None, help="Fichier JSONL précédent à réutiliser comme cache")
+    parser.add_argument(
+        "--cache-db",
+        default=None,
+        help="Cache SQLite des fiches (défaut : <cache-file>.sqlite), alimenté au fil du crawl",
+    )
     parser.add_argument("--refresh-after-hours", type=int, default=72, help="Âge max du cache détail avant refresh")
+    parser.add_argument(
+        "--refresh-policy",
+        choices=REFRESH_POLICY_VALUES,
+        default="lifecycle",
+        help="lifecycle: jamais de refresh après la date de fin, refresh fréquent avant la première, backoff des fiches stables ; fixed: âge max seul",
+    )
+    parser.add_argument(
+        "--http-cache-dir",
+        default=None,
+        help="Répertoire du cache HTTP (ETag/Last-Modified) pour les requêtes conditionnelles",
+    )
+    parser.add_argument(
+        "--http-cache-max-age-days",
+        type=float,
+        default=30,
+        help="Entrées du cache HTTP ni réécrites ni revalidées depuis ce nombre de jours supprimées (0 : jamais)",
+    )
+    parser.add_argument(
+        "--http-cache-max-mb",
+        type=int,
+        default=512,
+        help="Taille max du cache HTTP ; au-delà, les entrées les plus anciennes sont supprimées (0 : illimitée)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Nombre de workers pour les fiches détail (le budget de requêtes reste global)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINE_VALUES,
+        default="sync",
+        help=(
+            "Moteur de crawl : requests séquentiel/pool de threads (sync), asyncio (async) ou étapes "
+            "fetch/parsing en parallèle reliées par des files bornées (pipeline)"
+        ),
+    )
+    parser.add_argument(
+        "--parallel-sections",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Crawle les sections en parallèle sous le même budget de requêtes (sortie identique au séquentiel)",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=None,
+        help="Budget de requêtes HTTP du run : les fiches à rafraîchir passent par ordre de priorité",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=_duration_arg,
+        default=None,
+        help="Durée max du run (90s, 45m, 2h ; minutes sans unité), mêmes priorités que --max-requests",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Processus de parsing du moteur pipeline (défaut : nombre de CPU)",
+    )
+    parser.add_argument(
+        "--throttle",
+        choices=THROTTLE_VALUES,
+        default="adaptive",
+        help="Débit adaptatif AIMD (latence, 403/429/5xx) ou délai aléatoire fixe entre --min-delay et --max-delay",
+    )
+    parser.add_argument("--min-rate", type=float, default=0.1, help="Débit plancher du throttle adaptatif (req/s)")
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=None,
+        help="Débit plafond du throttle adaptatif (req/s, défaut : 1 / --min-delay)",
+    )
+    parser.add_argument("--parser", choices=PARSER_VALUES, default="html.parser", help="Parser HTML de BeautifulSoup")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reprend un crawl interrompu depuis <out>.checkpoint.json en complétant la sortie partielle",
+    )
+    parser.add_argument(
+        "--out-compress",
+        choices=COMPRESS_VALUES,
+        default="none",
+        help="Compression de la sortie (gzip : fichier lisible par zcat et par --cache-file)",
+    )
+    parser.add_argument(
+        "--out-buffer-kb",
+        type=int,
+        default=64,
+        help="Tampon d'écriture de la sortie ; elle est de toute façon synchronisée à chaque page programme",
+    )
+    parser.add_argument(
+        "--delta-out",
+        default=None,
+        help="Écrit aussi les seules fiches ajoutées/modifiées/retirées par rapport au cache (JSONL)",
+    )
+    parser.add_argument(
+        "--venues-out",
+        default=None,
+        help="Écrit l'index des lieux (slug, nom, adresse) en JSONL, compressé comme la sortie",
+    )
+    parser.add_argument(
+        "--forget-venue",
+        metavar="SLUG",
+        action="append",
+        default=None,
+        help="Retire un lieu de l'index (répétable) ; il sera relu sur sa prochaine fiche",
+    )
+    parser.add_argument(
+        "--card-refresh",
+        action="store_true",
+        help=(
+            "Une carte programme couvrant dates et lieu tient lieu de refresh de la fiche détail (30 jours au plus) ; "
+            "à n'activer qu'une fois les sélecteurs de cartes vérifiés sur une archive --record (commande cards)"
+        ),
+    )
+    parser.add_argument("--metrics-out", default=None, help="Écrit compteurs et histogrammes de durée en JSON")
+    parser.add_argument(
+        "--metrics-textfile",
+        default=None,
+        help="Écrit les mêmes métriques au format Prometheus (collecteur textfile de node_exporter)",
+    )
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument("--record", metavar="ARCHIVE_DIR", default=None, help="Archive toutes les réponses HTTP reçues")
+    archive.add_argument(
+        "--replay",
+        metavar="ARCHIVE_DIR",
+        default=None,
+        help="Rejoue un crawl depuis une archive --record : aucun réseau, aucun throttle",
+    )
     parser.add_argument("--debug", action="store_true", help="Logs détaillés de diagnostic")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     logging.basicConfig(
         level=(logging.DEBUG if args.debug else logging.INFO),
@@ -1109,11 +4572,41 @@ def main():
         retries=args.retries,
         timeout=args.timeout,
         cache_file=args.cache_file,
+        cache_db=args.cache_db,
         refresh_after_hours=args.refresh_after_hours,
+        refresh_policy=args.refresh_policy,
         sections=[section.strip() for section in args.sections.split(",")],
+        concurrency=args.concurrency,
+        engine=args.engine,
+        parse_workers=args.parse_workers,
+        output_compress=args.out_compress,
+        output_buffer_kb=args.out_buffer_kb,
+        delta_file=args.delta_out,
+        parallel_sections=args.parallel_sections,
+        max_requests=args.max_requests,
+        deadline_s=args.deadline,
+        venues_file=args.venues_out,
+        forget_venues=args.forget_venue,
+        card_refresh=args.card_refresh,
+        http_cache_dir=args.http_cache_dir,
+        http_cache_max_age_days=args.http_cache_max_age_days,
+        http_cache_max_mb=args.http_cache_max_mb,
+        parser=args.parser,
+        throttle=args.throttle,
+        min_rate=args.min_rate,
+        max_rate=args.max_rate,
+        record_dir=args.record,
+        replay_dir=args.replay,
         debug=args.debug,
     )
-    stats = scraper.crawl_programme(args.out, args.max_pages)
+    try:
+        stats = scraper.crawl_programme(args.out, args.max_pages, resume=args.resume)
+    finally:
+        # Écrites aussi quand le crawl échoue : c'est là qu'elles servent le plus
+        if args.metrics_out:
+            scraper.stats.write_metrics_json(args.metrics_out, engine=args.engine)
+        if args.metrics_textfile:
+            scraper.stats.write_prometheus_textfile(args.metrics_textfile, engine=args.engine)
 
     if stats.shows_extracted == 0:
         logging.error("Aucune fiche extraite")
@@ -1,9 +1,143 @@
+import asyncio
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
 import unittest
+from dataclasses import asdict, replace
+from unittest import mock
 from datetime import datetime, timedelta, timezone
 
 from bs4 import BeautifulSoup
+from bs4.element import Tag
 
-from scraper.offi_scraper import OffiScraper, Show
+from scraper.offi_scraper import (
+    CINEMA_PROGRAMME_URL,
+    SECTION_CONFIGS,
+    THEATRE_PROGRAMME_URL,
+    AdaptiveRate,
+    CrawlCheckpoint,
+    HttpCache,
+    OffiScraper,
+    PageArchive,
+    PageContext,
+    RateLimiter,
+    Show,
+    ShowStore,
+    find_address,
+    card_report,
+    parse_date_range,
+    open_jsonl,
+    reparse_archive,
+)
+
+# Archive `--record` de pages programme réelles d'Offi (voir README) : vérifie les sélecteurs de cartes
+RECORDED_PROGRAMME_ARCHIVE = os.path.join(os.path.dirname(__file__), "fixtures", "offi-programme")
+
+
+CINEMA_DETAIL_HTML = """
+<html>
+  <head>
+    <meta property="og:image" content="https://files.offi.fr/cinema.jpg" />
+    <meta name="description" content="Une restauration flamboyante du mélodrame de Mizoguchi." />
+    <script type="application/ld+json">
+      {
+        "@context": "https://schema.org",
+        "@type": "Movie",
+        "genre": "drame",
+        "duration": "PT1H29M",
+        "datePublished": "2026-03-12"
+      }
+    </script>
+  </head>
+  <body>
+    <h1>Carmen de Kawachi</h1>
+    <section class="meta">
+      Genre : drame
+      Date de sortie (ou ressortie) en France : 12 mars 2026
+      Durée : 1h29
+    </section>
+    <h2>Synopsis</h2>
+    <p>Une jeune femme tente d'échapper à la violence de son milieu.</p>
+  </body>
+</html>
+"""
+
+
+def _programme_html(show_ids):
+    links = "".join(
+        f'<a href="/theatre/theatre-test-{i % 3}/spectacle-{i}.html">Spectacle {i}</a>' for i in show_ids
+    )
+    return f"<html><body>{links}<a href='?npage=2'>2</a></body></html>"
+
+
+def _detail_html(show_id):
+    return f"""
+    <html>
+      <body>
+        <h1>Spectacle {show_id}</h1>
+        <h2>Présentation</h2>
+        <p>Description détaillée du spectacle numéro {show_id}.</p>
+        <section class="informations">Du 5 au 12 octobre 2025 - Durée : 1h{show_id:02d}</section>
+      </body>
+    </html>
+    """
+
+
+def _fake_site(show_ids):
+    site = {THEATRE_PROGRAMME_URL: _programme_html(show_ids)}
+    for i in show_ids:
+        site[f"https://www.offi.fr/theatre/theatre-test-{i % 3}/spectacle-{i}.html"] = _detail_html(i)
+    return site
+
+
+class _FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {"content-type": "text/html; charset=utf-8", **(headers or {})}
+        self.encoding = "utf-8"
+
+
+class _FakeSession:
+    """Remplace `requests.Session` : sert `site`, après les réponses forcées de `scripted`."""
+
+    def __init__(self, site, scripted=None, jitter=0.0):
+        self.site = site
+        self.scripted = {url: list(responses) for url, responses in (scripted or {}).items()}
+        self.jitter = jitter
+        self.calls = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.calls.append((url, headers or {}))
+        if self.jitter:
+            time.sleep(random.uniform(0, self.jitter))
+        if self.scripted.get(url):
+            return self.scripted[url].pop(0)
+        if url in self.site:
+            return _FakeResponse(200, self.site[url])
+        return _FakeResponse(404)
+
+
+def _cinema_site(film_ids):
+    links = "".join(f'<a href="/cinema/evenement/film-{i}-{1000 + i}.html">Film {i}</a>' for i in film_ids)
+    site = {CINEMA_PROGRAMME_URL: f"<html><body>{links}</body></html>"}
+    for i in film_ids:
+        site[f"https://www.offi.fr/cinema/evenement/film-{i}-{1000 + i}.html"] = CINEMA_DETAIL_HTML.replace(
+            "Carmen de Kawachi", f"Film {i}"
+        )
+    return site
+
+
+def _read_jsonl(path):
+    with open_jsonl(path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    for row in rows:
+        row.pop("crawled_at", None)
+    return rows
 
 
 class OffiScraperTests(unittest.TestCase):
@@ -51,6 +185,19 @@ class OffiScraperTests(unittest.TestCase):
             "14 boulevard de Strasbourg 75010 Paris",
         )
 
+    def test_find_address_is_anchored_on_postcode(self):
+        cases = [
+            ("Adresse : 14 boulevard de Strasbourg 75010 Paris", "14 boulevard de Strasbourg 75010 Paris"),
+            ("Salle 2, 3 bis rue de l’Échaudé 75006 Paris", "3 bis rue de l’Échaudé 75006 Paris"),
+            ("Tél. 0140260000 ou 12 rue Blanche 75009 Paris 9e", "12 rue Blanche 75009 Paris "),
+            ("Code 750100 Paris, puis 75010 Paris", None),
+            ("1 " + "très longue voie " * 20 + "75001 Paris", None),
+            ("12" + " " * 50000 + "|", None),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text[:40]):
+                self.assertEqual(find_address(text), expected)
+
     def test_generic_rubric_is_not_a_venue(self):
         self.assertFalse(self.scraper._looks_like_venue_text("Pièces de théâtre"))
 
@@ -84,6 +231,41 @@ class OffiScraperTests(unittest.TestCase):
 
         self.assertTrue(self.scraper._should_refresh_detail(show))
 
+    def test_lifecycle_refresh_policy_follows_show_dates_and_stability(self):
+        today = datetime.now(timezone.utc).date()
+
+        def cached(hours_old, start_in=None, end_in=None, show_id=1):
+            return Show(
+                url=f"https://www.offi.fr/theatre/test-1/show-{show_id}.html",
+                title="Titre",
+                section="theatre",
+                category="théâtre",
+                venue="Lieu",
+                description="Description",
+                date_start=(today + timedelta(days=start_in)).isoformat() if start_in is not None else None,
+                date_end=(today + timedelta(days=end_in)).isoformat() if end_in is not None else None,
+                crawled_at=(datetime.now(timezone.utc) - timedelta(hours=hours_old)).isoformat(),
+            )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = OffiScraper(cache_db=os.path.join(tmp, "cache.sqlite"))
+            for _ in range(2):
+                scraper._cache.record_refresh(cached(0, show_id=2).url, changed=False)
+
+            self.assertFalse(scraper._should_refresh_detail(cached(96, start_in=-30, end_in=-1)))
+            self.assertTrue(scraper._should_refresh_detail(cached(13, start_in=3, end_in=40)))
+            self.assertFalse(scraper._should_refresh_detail(cached(96, start_in=90, end_in=120)))
+            self.assertTrue(scraper._should_refresh_detail(cached(96)))
+            self.assertFalse(scraper._should_refresh_detail(cached(96, show_id=2)))
+            self.assertTrue(scraper._should_refresh_detail(cached(300, show_id=2)))
+            self.assertEqual(scraper.stats.refresh_avoided, {"ended": 1, "far_future": 1, "stable": 1})
+            self.assertEqual(scraper.stats.refresh_rules["stable"], 2)
+            scraper._cache.close()
+
+        fixed = OffiScraper(refresh_policy="fixed")
+        self.assertTrue(fixed._should_refresh_detail(cached(96, start_in=-30, end_in=-1)))
+        self.assertEqual(fixed.stats.refresh_avoided, {})
+
     def test_show_from_legacy_payload_infers_theatre_section(self):
         show = self.scraper._show_from_payload(
             {
@@ -104,34 +286,8 @@ class OffiScraperTests(unittest.TestCase):
         self.assertEqual(normalized, "https://www.offi.fr/cinema/evenement/carmen-de-kawachi-45189.html")
 
     def test_complete_cinema_detail_page_extracts_fields(self):
-        html = """
-        <html>
-          <head>
-            <meta property="og:image" content="https://files.offi.fr/cinema.jpg" />
-            <meta name="description" content="Une restauration flamboyante du mélodrame de Mizoguchi." />
-            <script type="application/ld+json">
-              {
-                "@context": "https://schema.org",
-                "@type": "Movie",
-                "genre": "drame",
-                "duration": "PT1H29M",
-                "datePublished": "2026-03-12"
-              }
-            </script>
-          </head>
-          <body>
-            <h1>Carmen de Kawachi</h1>
-            <section class="meta">
-              Genre : drame
-              Date de sortie (ou ressortie) en France : 12 mars 2026
-              Durée : 1h29
-            </section>
-            <h2>Synopsis</h2>
-            <p>Une jeune femme tente d'échapper à la violence de son milieu.</p>
-          </body>
-        </html>
-        """
-        self.scraper._fetch_page = lambda url: BeautifulSoup(html, "html.parser")
+        html = CINEMA_DETAIL_HTML
+        self.scraper.session = _FakeSession({"https://www.offi.fr/cinema/evenement/carmen-de-kawachi-45189.html": html})
 
         show = self.scraper._complete_show_from_detail_page(
             Show(
@@ -149,6 +305,1002 @@ class OffiScraperTests(unittest.TestCase):
         self.assertIn("Une jeune femme", show.description)
         self.assertIsNone(show.venue)
 
+    def test_concurrent_crawl_keeps_sequential_output_order(self):
+        site = _fake_site(range(1, 13))
+        outputs = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for concurrency in (1, 4):
+                scraper = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], concurrency=concurrency)
+                scraper.session = _FakeSession(site, jitter=0.01 if concurrency > 1 else 0)
+                out = os.path.join(tmp, f"out-{concurrency}.jsonl")
+                stats = scraper.crawl_programme(out, max_pages=2)
+                self.assertEqual(stats.detail_fetches, 12)
+                outputs.append(_read_jsonl(out))
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual([row["title"] for row in outputs[1]], [f"Spectacle {i}" for i in range(1, 13)])
+
+    def test_rate_limiter_spaces_reserved_slots(self):
+        limiter = RateLimiter(min_delay=0.5, max_delay=0.5)
+
+        waits = [limiter.reserve() for _ in range(3)]
+
+        self.assertAlmostEqual(waits[0], 0.0, places=2)
+        self.assertAlmostEqual(waits[1], 0.5, places=2)
+        self.assertAlmostEqual(waits[2], 1.0, places=2)
+
+    def test_async_engine_matches_sync_output_and_retry_semantics(self):
+        site = _fake_site(range(1, 8))
+        throttled_url = "https://www.offi.fr/theatre/theatre-test-1/spectacle-4.html"
+        outputs = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for engine in ("sync", "async"):
+                scraper = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], engine=engine, concurrency=3)
+                scraper.session = _FakeSession(
+                    site, scripted={throttled_url: [_FakeResponse(429, headers={"Retry-After": "0"})]}
+                )
+                out = os.path.join(tmp, f"out-{engine}.jsonl")
+                stats = scraper.crawl_programme(out, max_pages=2)
+                self.assertEqual(stats.retries, 1)
+                self.assertEqual(stats.shows_extracted, 7)
+                outputs.append(_read_jsonl(out))
+
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_pipeline_engine_matches_sync_output_and_reports_stages(self):
+        page_2 = f"{THEATRE_PROGRAMME_URL}?npage=2"
+        site = _fake_site(range(1, 10))
+        site[THEATRE_PROGRAMME_URL] = _programme_html(range(1, 6))
+        site[page_2] = _programme_html(range(6, 10))
+        outputs = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for engine in ("sync", "pipeline"):
+                scraper = OffiScraper(
+                    min_delay=0, max_delay=0, sections=["theatre"], engine=engine, concurrency=3, parse_workers=2
+                )
+                scraper.session = _FakeSession(site, jitter=0.01)
+                out = os.path.join(tmp, f"out-{engine}.jsonl")
+                stats = scraper.crawl_programme(out, max_pages=4)
+                outputs.append(_read_jsonl(out))
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual([row["title"] for row in outputs[1]], [f"Spectacle {i}" for i in range(1, 10)])
+        self.assertEqual(set(stats.pipeline_stages), {"discover", "fetch", "parse", "write"})
+        self.assertEqual(stats.pipeline_stages["parse"]["items"], 9)
+        self.assertEqual(stats.pipeline_stages["fetch"]["workers"], 3)
+        self.assertEqual(stats.timings["extract"].count, 9)
+        for report in stats.pipeline_stages.values():
+            self.assertGreaterEqual(report["utilization"], 0.0)
+            self.assertLessEqual(report["queue_max"], report["queue_size"])
+
+    def test_iter_shows_streams_the_crawl_output_without_writing_files(self):
+        site = _fake_site(range(1, 8))
+        with tempfile.TemporaryDirectory() as tmp:
+            reference = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"])
+            reference.session = _FakeSession(site)
+            out = os.path.join(tmp, "out.jsonl")
+            reference.crawl_programme(out, max_pages=2)
+            expected = _read_jsonl(out)
+
+            for engine in ("sync", "async", "pipeline"):
+                with self.subTest(engine=engine):
+                    scraper = OffiScraper(
+                        min_delay=0, max_delay=0, sections=["theatre"], engine=engine, concurrency=3, parse_workers=1
+                    )
+                    scraper.session = _FakeSession(site, jitter=0.01)
+                    shows = list(scraper.iter_shows(max_pages=2))
+                    self.assertTrue(all(isinstance(show, Show) for show in shows))
+                    rows = [asdict(show) for show in shows]
+                    for row in rows:
+                        row.pop("crawled_at")
+                    self.assertEqual(rows, expected)
+                    self.assertEqual(scraper.stats.shows_extracted, 7)
+            self.assertEqual(sorted(os.listdir(tmp)), ["out.jsonl"])
+
+        # Fermer le générateur arrête le crawl : les pages programme suivantes ne sont pas demandées
+        scraper = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], engine="async", concurrency=3)
+        scraper.session = _FakeSession(site)
+        shows = scraper.iter_shows(max_pages=2)
+        self.assertEqual(next(shows).title, "Spectacle 1")
+        shows.close()
+        self.assertEqual(scraper.stats.pages_crawled, 1)
+
+    def test_scraper_can_be_iterated_again_and_after_a_full_crawl(self):
+        site = _fake_site(range(1, 8))
+        titles = [f"Spectacle {i}" for i in range(1, 8)]
+        scraper = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"])
+        scraper.session = _FakeSession(site)
+        self.assertEqual([show.title for show in scraper.iter_shows(max_pages=2)], titles)
+        self.assertEqual([show.title for show in scraper.iter_shows(max_pages=2)], titles)
+        self.assertEqual(scraper.stats.shows_extracted, 7)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"])
+            scraper.session = _FakeSession(site)
+            scraper.crawl_programme(os.path.join(tmp, "out.jsonl"), max_pages=2)
+            self.assertEqual([show.title for show in scraper.iter_shows(max_pages=2)], titles)
+            self.assertEqual(scraper.stats.shows_extracted, 7)
+
+    def test_aiter_shows_yields_the_same_shows_on_the_caller_loop(self):
+        site = _fake_site(range(1, 6))
+
+        async def collect(scraper):
+            return [show.title async for show in scraper.aiter_shows(max_pages=2)]
+
+        for engine in ("sync", "async"):
+            with self.subTest(engine=engine):
+                scraper = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], engine=engine, concurrency=2)
+                scraper.session = _FakeSession(site)
+                titles = asyncio.run(collect(scraper))
+                self.assertEqual(titles, [f"Spectacle {i}" for i in range(1, 6)])
+
+    def test_stage_timings_are_exported_as_json_and_prometheus_text(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"])
+            scraper.session = _FakeSession(_fake_site(range(1, 4)))
+            stats = scraper.crawl_programme(os.path.join(tmp, "out.jsonl"), max_pages=1)
+            json_path = os.path.join(tmp, "metrics", "offi.json")
+            prom_path = os.path.join(tmp, "offi.prom")
+            stats.write_metrics_json(json_path, engine="sync")
+            stats.write_prometheus_textfile(prom_path, engine="sync")
+            with open(json_path, encoding="utf-8") as f:
+                metrics = json.load(f)
+            with open(prom_path, encoding="utf-8") as f:
+                prom = f.read().splitlines()
+
+        for stage in ("throttle", "http_get", "soup", "extract", "extract_show_links", "validate_show"):
+            self.assertIn(stage, metrics["timings"])
+        self.assertEqual(metrics["timings"]["http_get"]["count"], 4)
+        self.assertEqual(metrics["counters"]["requests"], 4)
+        self.assertGreater(metrics["counters"]["bytes_downloaded"], 0)
+        self.assertIn('offi_crawl_shows_extracted{engine="sync"} 3', prom)
+        self.assertIn('offi_crawl_stage_duration_seconds_bucket{engine="sync",le="+Inf",stage="http_get"} 4', prom)
+        self.assertIn('offi_crawl_stage_duration_seconds_count{engine="sync",stage="soup"} 4', prom)
+
+    def test_gzip_output_is_published_atomically_and_readable_as_cache(self):
+        site = _fake_site(range(1, 5))
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "offi.jsonl.gz")
+            scraper = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], output_compress="gzip", output_buffer_kb=0)
+            scraper.session = _FakeSession(site)
+            scraper.crawl_programme(out, max_pages=1)
+
+            with open(out, "rb") as f:
+                self.assertEqual(f.read(2), b"\x1f\x8b")
+            self.assertEqual([row["title"] for row in _read_jsonl(out)], [f"Spectacle {i}" for i in range(1, 5)])
+            self.assertEqual(sorted(os.listdir(tmp)), ["offi.jsonl.gz"])
+
+            cached = OffiScraper(cache_file=out, cache_db=os.path.join(tmp, "cache.sqlite"), sections=["theatre"])
+            self.assertEqual(cached.stats.cached_loaded, 4)
+
+            # Une sortie vide ne remplace pas la précédente
+            empty = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], output_compress="gzip")
+            empty.session = _FakeSession({})
+            empty.crawl_programme(out, max_pages=1)
+            self.assertEqual(len(_read_jsonl(out)), 4)
+
+    def test_parallel_sections_merge_output_in_section_order(self):
+        site = {**_fake_site(range(1, 6)), **_cinema_site(range(1, 4))}
+        for engine in ("sync", "async"):
+            outputs = []
+            with self.subTest(engine=engine), tempfile.TemporaryDirectory() as tmp:
+                for parallel in (False, True):
+                    scraper = OffiScraper(min_delay=0, max_delay=0, engine=engine, parallel_sections=parallel)
+                    scraper.session = _FakeSession(site, jitter=0.01)
+                    out = os.path.join(tmp, f"out-{parallel}.jsonl")
+                    stats = scraper.crawl_programme(out, max_pages=1)
+                    outputs.append(_read_jsonl(out))
+
+                self.assertEqual(outputs[0], outputs[1])
+                self.assertEqual([row["section"] for row in outputs[1]], ["theatre"] * 5 + ["cinema"] * 3)
+                self.assertEqual(stats.sections["theatre"]["shows_extracted"], 5)
+                self.assertEqual(stats.sections["cinema"]["shows_extracted"], 3)
+                self.assertEqual(stats.requests, 10)
+                self.assertEqual(sorted(os.listdir(tmp)), ["out-False.jsonl", "out-True.jsonl"])
+
+    def test_parallel_sections_resume_only_the_unfinished_section(self):
+        site = {**_fake_site(range(1, 4)), **_cinema_site(range(1, 4))}
+        with tempfile.TemporaryDirectory() as tmp:
+            expected_out = os.path.join(tmp, "expected.jsonl")
+            reference = OffiScraper(min_delay=0, max_delay=0, parallel_sections=False)
+            reference.session = _FakeSession(site)
+            reference.crawl_programme(expected_out, max_pages=1)
+
+            out = os.path.join(tmp, "offi.jsonl")
+            crashing = OffiScraper(min_delay=0, max_delay=0)
+            crashing.session = _FakeSession(site)
+            get = crashing.session.get
+
+            def crash_on_film_2(url, **kwargs):
+                if "/film-2-" in url:
+                    raise KeyboardInterrupt
+                return get(url, **kwargs)
+
+            crashing.session.get = crash_on_film_2
+            with self.assertRaises(KeyboardInterrupt):
+                crashing.crawl_programme(out, max_pages=1)
+
+            resumed = OffiScraper(min_delay=0, max_delay=0)
+            resumed.session = _FakeSession(site)
+            resumed.crawl_programme(out, max_pages=1, resume=True)
+
+            self.assertNotIn(THEATRE_PROGRAMME_URL, [url for url, _ in resumed.session.calls])
+            self.assertEqual(_read_jsonl(out), _read_jsonl(expected_out))
+            self.assertEqual(sorted(os.listdir(tmp)), ["expected.jsonl", "offi.jsonl"])
+
+    def test_unknown_engine_is_rejected(self):
+        with self.assertRaises(ValueError):
+            OffiScraper(engine="twisted")
+
+    def test_not_modified_detail_page_reuses_cached_show_without_parsing(self):
+        url = "https://www.offi.fr/theatre/theatre-test-1/spectacle-1.html"
+        stale = Show(
+            url=url,
+            title="Spectacle 1",
+            section="theatre",
+            category="théâtre",
+            venue="Théâtre Test",
+            description="Description en cache.",
+            crawled_at=(datetime.now(timezone.utc) - timedelta(days=10)).isoformat(),
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = OffiScraper(min_delay=0, max_delay=0, http_cache_dir=os.path.join(tmp, "http"))
+            scraper.session = _FakeSession(
+                {},
+                scripted={
+                    url: [
+                        _FakeResponse(200, _detail_html(1), headers={"ETag": '"v1"'}),
+                        _FakeResponse(304),
+                    ]
+                },
+            )
+            scraper._fetch_html(url)
+            scraper._parse_html = lambda *args: self.fail("une réponse 304 ne doit pas être parsée")
+
+            show = scraper._complete_show_from_detail_page(Show(url=url, crawled_at="now"), stale)
+
+            self.assertEqual(scraper.session.calls[-1][1].get("If-None-Match"), '"v1"')
+            self.assertEqual(show.description, "Description en cache.")
+            self.assertEqual(show.crawled_at, "now")
+            self.assertEqual(scraper.stats.not_modified, 1)
+            self.assertEqual(scraper.stats.bytes_saved, len(_detail_html(1).encode("utf-8")))
+
+    def test_http_cache_is_read_once_per_fetch_and_bounded(self):
+        url = "https://www.offi.fr/theatre/theatre-test-1/spectacle-1.html"
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = os.path.join(tmp, "http")
+            scraper = OffiScraper(min_delay=0, max_delay=0, http_cache_dir=cache_dir)
+            scraper._http_cache.store(url, {"ETag": '"v1"'}, _detail_html(1), size=300)
+            scraper.session = _FakeSession(
+                {}, scripted={url: [_FakeResponse(503, headers={"Retry-After": "0"}), _FakeResponse(304)]}
+            )
+            with mock.patch.object(HttpCache, "get", wraps=scraper._http_cache.get) as get:
+                page = scraper._fetch_html(url)
+            self.assertTrue(page.not_modified)
+            self.assertEqual(get.call_count, 1)
+            self.assertEqual([call[1].get("If-None-Match") for call in scraper.session.calls], ['"v1"', '"v1"'])
+            self.assertEqual(scraper.stats.bytes_saved, 300)
+
+            stale = "https://www.offi.fr/theatre/theatre-test-2/spectacle-2.html"
+            scraper._http_cache.store(stale, {"ETag": '"v2"'}, _detail_html(2))
+            old = time.time() - 40 * 86400
+            os.utime(scraper._http_cache._path(stale), (old, old))
+            reopened = HttpCache(cache_dir, max_age=timedelta(days=30))
+            self.assertIsNone(reopened.get(stale))
+            self.assertFalse(os.path.exists(reopened._path(stale)))
+            self.assertIsNotNone(reopened.get(url))
+
+            HttpCache(cache_dir, max_age=None, max_bytes=0)
+            self.assertIsNone(reopened.get(url))
+
+    def test_parsers_and_strainers_give_identical_shows(self):
+        fixtures = [
+            ("https://www.offi.fr/cinema/evenement/carmen-de-kawachi-45189.html", "cinema", CINEMA_DETAIL_HTML),
+            ("https://www.offi.fr/theatre/theatre-test-1/spectacle-7.html", "theatre", _detail_html(7)),
+        ]
+        for url, section, html in fixtures:
+            shows = []
+            for parser in ("html.parser", "lxml"):
+                scraper = OffiScraper(parser=parser)
+                for page_type in (None, "detail"):
+                    show = scraper._complete_show_from_soup(
+                        Show(url=url, section=section), scraper._parse_html(html, page_type)
+                    )
+                    shows.append(show)
+            with self.subTest(url=url):
+                self.assertIsNotNone(shows[0].description)
+                for show in shows[1:]:
+                    self.assertEqual(show, shows[0])
+
+    def test_programme_strainer_keeps_show_links(self):
+        for parser in ("html.parser", "lxml"):
+            scraper = OffiScraper(parser=parser)
+            soup = scraper._parse_html(_programme_html([1, 2]), "programme")
+
+            links = scraper._extract_show_links(soup, "theatre")
+
+            self.assertEqual(
+                [url for url, _ in links],
+                [
+                    "https://www.offi.fr/theatre/theatre-test-1/spectacle-1.html",
+                    "https://www.offi.fr/theatre/theatre-test-2/spectacle-2.html",
+                ],
+            )
+
+    def test_nested_scripts_and_svg_are_ignored_by_the_detail_walk(self):
+        html = _detail_html(4).replace(
+            "<h2>",
+            '<div><script>var tracker = "Du 1 au 2 janvier 2020";</script><svg><text>Durée : 9h00</text></svg>'
+            "<style>.x { content: 'Tarif 99 €'; }</style></div><h2>",
+        )
+        for parser in ("html.parser", "lxml"):
+            with self.subTest(parser=parser):
+                scraper = OffiScraper(parser=parser)
+                page = PageContext(scraper._parse_html(html, "detail"))
+                self.assertNotIn("tracker", page.full_text)
+                self.assertNotIn("9h00", page.full_text)
+                self.assertNotIn("99 €", page.full_text)
+                self.assertIn("Du 5 au 12 octobre 2025", page.full_text)
+
+    def test_page_context_parses_jsonld_graph_once(self):
+        soup = BeautifulSoup(
+            """
+            <html><head><script type="application/ld+json">
+              {"@graph": [{"@type": "WebPage"}, {"@type": "Movie", "genre": ["Drame", "Com\\u00e9die"],
+               "dateCreated": "2026-01-07T00:00:00", "duration": "PT2H"}]}
+            </script></head><body><p>Genre : thriller</p></body></html>
+            """,
+            "html.parser",
+        )
+        page = PageContext(soup)
+
+        show = self.scraper._complete_fields(
+            Show(url="https://www.offi.fr/cinema/evenement/film-1.html", section="cinema"),
+            page,
+            SECTION_CONFIGS["cinema"].fields,
+        )
+
+        self.assertEqual((show.category, show.date_start, show.duration_min), ("drame, comédie", "2026-01-07", 120))
+        self.assertIs(page.jsonld, page.jsonld)
+        self.assertIs(page.select("p"), page.select("p"))
+
+    def test_theatre_scans_deduplicated_text_blocks(self):
+        soup = BeautifulSoup(
+            """
+            <html><body><article><section class="informations">
+              <p>Du <time>5</time> au 12 octobre 2025</p>
+              <p>Représentation à 20h30</p>
+              <p>Durée : 1h15</p>
+              <p><strong>Tarifs :</strong> 18 - 32 €</p>
+            </section></article></body></html>
+            """,
+            "html.parser",
+        )
+        page = PageContext(soup)
+
+        show = self.scraper._complete_fields(
+            Show(url="https://www.offi.fr/theatre/theatre-test-1/spectacle-1.html", section="theatre"),
+            page,
+            SECTION_CONFIGS["theatre"].fields,
+        )
+
+        self.assertEqual([block.text for block in page.text_blocks], [
+            "Du 5 au 12 octobre 2025", "Représentation à 20h30", "Durée : 1h15", "Tarifs : 18 - 32 €",
+        ])
+        self.assertEqual((show.date_start, show.date_end), ("2025-10-05", "2025-10-12"))
+        self.assertEqual(show.duration_min, 75)
+        self.assertEqual((show.price_min_eur, show.price_max_eur), (18.0, 32.0))
+
+    def test_detail_fields_are_read_from_one_dom_traversal(self):
+        theatre_html = _detail_html(7).replace(
+            "<body>",
+            '<body><nav class="breadcrumb"><a href="/theatre.html">Pièces de théâtre</a>'
+            '<a href="/theatre/theatre-test-1.html">Théâtre de la Ville</a></nav>'
+            '<div class="venue-address">2 place du Châtelet 75004 Paris</div>',
+        )
+        pages = [
+            ("https://www.offi.fr/theatre/theatre-test-1/spectacle-7.html", "theatre", theatre_html),
+            ("https://www.offi.fr/cinema/evenement/carmen-de-kawachi-45189.html", "cinema", CINEMA_DETAIL_HTML),
+        ]
+        shows = []
+        for url, section, html in pages:
+            soup = self.scraper._parse_html(html, "detail")
+            with mock.patch.object(Tag, "select", side_effect=AssertionError("select")), \
+                    mock.patch.object(Tag, "find_all", side_effect=AssertionError("find_all")), \
+                    mock.patch.object(Tag, "find", side_effect=AssertionError("find")):
+                shows.append(self.scraper._complete_show_from_soup(Show(url=url, section=section), soup))
+
+        theatre, cinema = shows
+        self.assertEqual(
+            (theatre.title, theatre.venue, theatre.address, theatre.date_end, theatre.duration_min, theatre.category),
+            ("Spectacle 7", "Théâtre de la Ville", "2 place du Châtelet 75004 Paris", "2025-10-12", 67, "théâtre"),
+        )
+        self.assertEqual((cinema.category, cinema.date_start, cinema.duration_min), ("drame", "2026-03-12", 89))
+        # Séries d'avant les specs conservées, sans collision entre les catégories théâtre et cinéma
+        stages = (
+            "extract_venue",
+            "extract_address",
+            "extract_theatre_category",
+            "extract_cinema_category",
+            "extract_cinema_release_date",
+            "extract_cinema_duration",
+        )
+        for stage in stages:
+            self.assertIn(stage, self.scraper.stats.timings)
+        self.assertNotIn("extract_category", self.scraper.stats.timings)
+
+    def test_deeply_nested_detail_page_does_not_exhaust_the_stack(self):
+        depth = 3000
+        html = _detail_html(3).replace(
+            "<h2>", "<div class=\"informations\">" + "<span>" * depth + "Du 5 au 12 octobre 2025" + "</span>" * depth + "</div><h2>"
+        )
+        for parser in ("html.parser", "lxml"):
+            with self.subTest(parser=parser):
+                scraper = OffiScraper(parser=parser)
+                soup = scraper._parse_html(html, "detail")
+                show = scraper._complete_show_from_soup(
+                    Show(url="https://www.offi.fr/theatre/theatre-test-0/spectacle-3.html", section="theatre"), soup
+                )
+                self.assertEqual((show.title, show.date_start, show.date_end), ("Spectacle 3", "2025-10-05", "2025-10-12"))
+
+    def test_date_range_rules_follow_priority(self):
+        cases = [
+            ("Du 05/10/2025 au 12/11/2025, le 1 janvier 2024", ("2025-10-05", "2025-11-12")),
+            ("Du 30 décembre 2025 au 3 janvier 2026", ("2025-12-30", "2026-01-03")),
+            ("du 7 sept. au 12 oct. 2025", ("2025-09-07", "2025-10-12")),
+            ("Du 5 au 12 octobre 2025", ("2025-10-05", "2025-10-12")),
+            ("À  partir du 4 mars 2026", ("2026-03-04", None)),
+            ("Jusqu’au 31 mai 2026", (None, "2026-05-31")),
+            ("Le 3 juin 2026, le 1 juin 2026 et le 02/06/2026", ("2026-06-01", "2026-06-03")),
+            ("perdu 5 au 12 octobre 2025", ("2025-10-12", "2025-10-12")),
+            ("Représentation à 20h30", (None, None)),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(self.scraper._parse_date_range_text(text), expected)
+
+    def test_date_range_parsing_is_memoized(self):
+        parse_date_range.cache_clear()
+        self.scraper._parse_date_range_text("Du 5 au 12 octobre 2025")
+        self.scraper._parse_date_range_text("Du 5 au 12 octobre 2025")
+        self.assertEqual(parse_date_range.cache_info().hits, 1)
+
+    def test_show_store_is_fed_during_crawl_and_reused_lazily(self):
+        site = _fake_site(range(1, 7))
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "cache.sqlite")
+            out = os.path.join(tmp, "offi.jsonl")
+            first = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], cache_db=db)
+            first.session = _FakeSession(site)
+            first.crawl_programme(out, max_pages=1)
+            self.assertEqual(first.stats.cached_written, 6)
+
+            second = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], cache_file=out, cache_db=db)
+            second.session = _FakeSession(site)
+            second._import_cache_file = lambda *args: self.fail("la sortie du run précédent est déjà dans le cache")
+            stats = second.crawl_programme(os.path.join(tmp, "offi-2.jsonl"), max_pages=1)
+
+            self.assertEqual(stats.cached_loaded, 6)
+            self.assertEqual((stats.cached_reused, stats.detail_fetches), (6, 0))
+            store = ShowStore(db)
+            self.assertEqual(len(store.urls("theatre")), 6)
+            self.assertEqual(store.urls("cinema"), [])
+            store.close()
+
+    def test_delta_lists_added_changed_and_removed_shows_since_the_cache(self):
+        page_2 = f"{THEATRE_PROGRAMME_URL}?npage=2"
+        site = _fake_site(range(1, 6))
+        site[page_2] = "<html><body></body></html>"
+        url = "https://www.offi.fr/theatre/theatre-test-{}/spectacle-{}.html".format
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "cache.sqlite")
+            delta = os.path.join(tmp, "offi.delta.jsonl")
+            options = dict(min_delay=0, max_delay=0, sections=["theatre"], cache_db=db, delta_file=delta)
+            site[THEATRE_PROGRAMME_URL] = _programme_html(range(1, 5))
+            first = OffiScraper(**options)
+            first.session = _FakeSession(site)
+            stats = first.crawl_programme(os.path.join(tmp, "offi-1.jsonl"), max_pages=3)
+            self.assertEqual((stats.shows_added, stats.shows_changed, stats.shows_removed), (4, 0, 0))
+
+            site[THEATRE_PROGRAMME_URL] = _programme_html([1, 2, 3, 5])
+            site[url(2, 2)] = site[url(2, 2)].replace("Description détaillée", "Nouvelle description")
+            second = OffiScraper(refresh_after_hours=1e-9, refresh_policy="fixed", **options)
+            second.session = _FakeSession(site)
+            stats = second.crawl_programme(os.path.join(tmp, "offi-2.jsonl"), max_pages=3)
+            with open(delta, encoding="utf-8") as f:
+                changes = [json.loads(line) for line in f]
+
+            self.assertEqual(
+                [(row["change"], row["url"]) for row in changes],
+                [("changed", url(2, 2)), ("added", url(2, 5)), ("removed", url(1, 4))],
+            )
+            self.assertIn("Nouvelle description", changes[0]["show"]["description"])
+            self.assertEqual(changes[0]["fingerprint"], Show(**changes[0]["show"]).fingerprint())
+            self.assertEqual(stats.shows_unchanged, 2)
+            store = ShowStore(db)
+            self.assertIsNone(store.get(url(1, 4)))
+            self.assertEqual(store.unchanged_runs(url(1, 1)), 1)
+            self.assertEqual(store.unchanged_runs(url(2, 2)), 0)
+            store.close()
+
+    def test_request_budget_refreshes_new_then_incomplete_then_oldest_shows(self):
+        page_2 = f"{THEATRE_PROGRAMME_URL}?npage=2"
+        site = _fake_site(range(1, 7))
+        site[page_2] = "<html><body></body></html>"
+        url = "https://www.offi.fr/theatre/theatre-test-{}/spectacle-{}.html".format
+        days_old = {1: 5, 2: 6, 3: 10, 4: 1}
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "cache.sqlite")
+            store = ShowStore(db)
+            store.put_many(
+                Show(
+                    url=url(i % 3, i),
+                    title=f"Spectacle {i}",
+                    section="theatre",
+                    category="théâtre",
+                    venue="Lieu",
+                    description=None if i == 4 else "En cache",
+                    crawled_at=(datetime.now(timezone.utc) - timedelta(days=days)).isoformat(),
+                )
+                for i, days in days_old.items()
+            )
+            store.close()
+
+            # 2 pages programme + 4 fiches détail
+            scraper = OffiScraper(
+                min_delay=0, max_delay=0, sections=["theatre"], cache_db=db, refresh_policy="fixed", max_requests=6
+            )
+            scraper.session = _FakeSession(site)
+            out = os.path.join(tmp, "offi.jsonl")
+            stats = scraper.crawl_programme(out, max_pages=3)
+            rows = _read_jsonl(out)
+
+        detail_calls = [call_url for call_url, _ in scraper.session.calls if "/spectacle-" in call_url]
+        self.assertEqual(detail_calls, [url(2, 5), url(0, 6), url(1, 4), url(0, 3)])
+        self.assertEqual([row["url"] for row in rows], [url(i % 3, i) for i in range(1, 7)])
+        self.assertEqual(rows[0]["description"], "En cache")
+        self.assertIn("Description détaillée", rows[2]["description"])
+        self.assertEqual((stats.requests, stats.budget_deferred, stats.budget_skipped_new), (6, 2, 0))
+
+    def test_budgeted_crawl_checkpoints_pages_before_the_refresh_queue_drains(self):
+        site = _fake_site(range(1, 4))
+        site[f"{THEATRE_PROGRAMME_URL}?npage=2"] = _programme_html([4])
+        site["https://www.offi.fr/theatre/theatre-test-1/spectacle-4.html"] = _detail_html(4)
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "offi.jsonl")
+            scraper = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], max_requests=100, concurrency=1)
+            scraper.session = _FakeSession(site)
+            get = scraper.session.get
+            checkpointed_before_last_refresh = []
+
+            def wait_for_page_1(url, **kwargs):
+                if url.endswith("/spectacle-4.html"):
+                    # La page 1 doit être écrite pendant que la fiche de la page 2 est encore en vol
+                    until = time.monotonic() + 5
+                    while time.monotonic() < until:
+                        checkpoint = CrawlCheckpoint.load(out)
+                        if checkpoint is not None and checkpoint.pages_done("theatre") == 1:
+                            checkpointed_before_last_refresh.append(url)
+                            break
+                        time.sleep(0.01)
+                return get(url, **kwargs)
+
+            scraper.session.get = wait_for_page_1
+            stats = scraper.crawl_programme(out, max_pages=2)
+
+        self.assertTrue(checkpointed_before_last_refresh)
+        self.assertEqual(stats.shows_extracted, 4)
+
+    def test_deadline_starts_with_the_crawl_and_bounds_throttle_waits(self):
+        site = _fake_site(range(1, 4))
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = OffiScraper(min_delay=30, max_delay=30, sections=["theatre"], deadline_s=0.3)
+            scraper.session = _FakeSession(site)
+            time.sleep(0.4)
+            started = time.monotonic()
+            stats = scraper.crawl_programme(os.path.join(tmp, "offi.jsonl"), max_pages=1)
+            elapsed = time.monotonic() - started
+
+        # Construit avant la deadline d'origine, le crawl dispose encore de ses 0,3 s : la page
+        # programme part, mais aucune fiche n'attend son créneau de 30 s
+        self.assertEqual([url for url, _ in scraper.session.calls], [THEATRE_PROGRAMME_URL])
+        self.assertLess(elapsed, 5)
+        self.assertEqual(stats.budget_skipped_new, 3)
+
+    def test_listing_cards_fill_seeds_and_stand_in_for_detail_refreshes(self):
+        def card_programme(dates):
+            cards = "".join(
+                f'<li class="event-card"><a href="/theatre/theatre-test-{i % 3}/spectacle-{i}.html"><img src="/i.jpg"></a>'
+                f'<a href="/theatre/theatre-test-{i % 3}/spectacle-{i}.html">Spectacle {i}</a>'
+                f'<span class="lieu">Théâtre de la Ville</span><span class="dates">{dates}</span>'
+                f'<span class="prix">Tarifs : 15 - 30 €</span></li>'
+                for i in (1, 2)
+            )
+            return f'<html><body><ul class="programme">{cards}</ul></body></html>'
+
+        site = _fake_site([1, 2])
+        with tempfile.TemporaryDirectory() as tmp:
+            options = dict(
+                min_delay=0, max_delay=0, sections=["theatre"], cache_db=os.path.join(tmp, "cache.sqlite"),
+                refresh_policy="fixed",
+            )
+            site[THEATRE_PROGRAMME_URL] = card_programme("Du 5 au 12 octobre 2027")
+            first = OffiScraper(**options)
+            first.session = _FakeSession(site)
+            stats = first.crawl_programme(os.path.join(tmp, "offi-1.jsonl"), max_pages=1)
+            rows = _read_jsonl(os.path.join(tmp, "offi-1.jsonl"))
+
+            self.assertEqual(stats.detail_fetches, 2)
+            self.assertEqual(
+                (rows[0]["title"], rows[0]["venue"], rows[0]["date_start"], rows[0]["price_max_eur"]),
+                ("Spectacle 1", "Théâtre de la Ville", "2027-10-05", 30.0),
+            )
+            self.assertIn("Description détaillée", rows[0]["description"])
+            self.assertEqual(stats.card_fields["venue"], 2)
+            self.assertEqual(stats.card_fields["date_end"], 2)
+
+            # Sans --card-refresh, la carte ne remplace pas le refresh de la fiche détail
+            site[THEATRE_PROGRAMME_URL] = card_programme("Du 5 au 12 octobre 2027")
+            default = OffiScraper(refresh_after_hours=1e-9, **options)
+            default.session = _FakeSession(site)
+            stats = default.crawl_programme(os.path.join(tmp, "offi-default.jsonl"), max_pages=1)
+            self.assertEqual(stats.detail_fetches, 2)
+            self.assertNotIn("card", stats.refresh_rules)
+
+            site[THEATRE_PROGRAMME_URL] = card_programme("Du 5 au 19 octobre 2027")
+            second = OffiScraper(refresh_after_hours=1e-9, card_refresh=True, **options)
+            second.session = _FakeSession(site)
+            stats = second.crawl_programme(os.path.join(tmp, "offi-2.jsonl"), max_pages=1)
+            rows = _read_jsonl(os.path.join(tmp, "offi-2.jsonl"))
+
+        self.assertEqual(stats.detail_fetches, 0)
+        self.assertEqual(stats.refresh_avoided, {"card": 2})
+        self.assertEqual([row["date_end"] for row in rows], ["2027-10-19", "2027-10-19"])
+        self.assertIn("Description détaillée", rows[1]["description"])
+        self.assertEqual(stats.shows_changed, 2)
+
+    def test_card_report_flags_unmatched_cards_and_lists_candidate_containers(self):
+        links = "".join(
+            f'<article class="fiche-spectacle vignette"><div class="infos">'
+            f'<a href="/theatre/theatre-test-{i}/spectacle-{i}.html">Spectacle {i}</a>'
+            f'<p class="salle">Théâtre {i}</p></div></article>'
+            for i in (1, 2, 3)
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = PageArchive(tmp)
+            archive.record(THEATRE_PROGRAMME_URL, 200, {}, f"<html><body>{links}</body></html>")
+            archive.record(f"{THEATRE_PROGRAMME_URL}?npage=2", 404, {}, "")
+            archive.record("https://www.offi.fr/theatre/theatre-test-1/spectacle-1.html", 200, {}, _detail_html(1))
+            report = card_report(tmp)
+
+        theatre = report["theatre"]
+        self.assertEqual((theatre["programme_pages"], theatre["show_links"]), (1, 3))
+        # Balisage inconnu des sélecteurs : aucune carte, rien ne peut tenir lieu de refresh
+        self.assertEqual((theatre["cards"], theatre["covered"], theatre["card_fields"]), (0, 0, {}))
+        self.assertEqual(
+            theatre["ancestor_classes"][:3], [(".infos", 3), (".fiche-spectacle", 3), (".vignette", 3)]
+        )
+        self.assertEqual(report["cinema"]["programme_pages"], 0)
+
+    @unittest.skipUnless(
+        os.path.isdir(RECORDED_PROGRAMME_ARCHIVE), "pas d'archive --record de pages programme réelles"
+    )
+    def test_card_selectors_match_recorded_programme_pages(self):
+        for section, checked in card_report(RECORDED_PROGRAMME_ARCHIVE).items():
+            if not checked["programme_pages"]:
+                continue
+            with self.subTest(section=section):
+                self.assertGreater(checked["show_links"], 0)
+                self.assertEqual(checked["cards"], checked["show_links"])
+                self.assertEqual(checked["covered"], checked["show_links"])
+
+    def test_venue_index_fills_known_venues_and_is_written_as_jsonl(self):
+        url = "https://www.offi.fr/theatre/theatre-test-{}/spectacle-{}.html".format
+        venue_page = (
+            '<nav class="breadcrumb"><a href="/theatre/theatre-test-1.html">Théâtre de Test</a></nav>'
+            '<div class="venue-address">14 boulevard de Strasbourg 75010 Paris</div>'
+        )
+        site = _fake_site([1, 4, 7])
+        for i in (1, 4):
+            site[url(1, i)] = site[url(1, i)].replace("<body>", f"<body>{venue_page}")
+        with tempfile.TemporaryDirectory() as tmp:
+            venues = os.path.join(tmp, "offi-venues.jsonl")
+            options = dict(
+                min_delay=0, max_delay=0, sections=["theatre"], cache_db=os.path.join(tmp, "cache.sqlite"),
+                venues_file=venues,
+            )
+            site[THEATRE_PROGRAMME_URL] = _programme_html([1, 4])
+            first = OffiScraper(**options)
+            first.session = _FakeSession(site)
+            stats = first.crawl_programme(os.path.join(tmp, "offi-1.jsonl"), max_pages=1)
+            self.assertEqual((stats.venues_added, stats.timings["extract_address"].count), (1, 2))
+
+            site[THEATRE_PROGRAMME_URL] = _programme_html([1, 4, 7])
+            second = OffiScraper(**options)
+            second.session = _FakeSession(site)
+            stats = second.crawl_programme(os.path.join(tmp, "offi-2.jsonl"), max_pages=1)
+            rows = _read_jsonl(os.path.join(tmp, "offi-2.jsonl"))
+            written = _read_jsonl(venues)
+
+        self.assertEqual(stats.detail_fetches, 1)
+        self.assertNotIn("extract_address", stats.timings)
+        self.assertEqual(
+            (rows[2]["url"], rows[2]["venue"], rows[2]["address"]),
+            (url(1, 7), "Théâtre de Test", "14 boulevard de Strasbourg 75010 Paris"),
+        )
+        self.assertEqual(stats.venue_index_hits, 3)
+        self.assertEqual(
+            written,
+            [
+                {
+                    "slug": "theatre-test-1",
+                    "name": "Théâtre de Test",
+                    "address": "14 boulevard de Strasbourg 75010 Paris",
+                    "url": "https://www.offi.fr/theatre/theatre-test-1.html",
+                }
+            ],
+        )
+
+    def test_venue_index_trusts_only_reference_sources_and_rereads_stale_entries(self):
+        url = "https://www.offi.fr/theatre/theatre-test-{}/spectacle-{}.html".format
+        breadcrumb = '<nav class="breadcrumb"><a href="/theatre/theatre-test-1.html">Théâtre de Test</a></nav>'
+        free_text_address = "<p>Rendez-vous au 14 boulevard de Strasbourg 75010 Paris</p>"
+        site = _fake_site([1, 4])
+        site[url(1, 1)] = site[url(1, 1)].replace("<body>", f"<body>{free_text_address}")
+        site[url(1, 4)] = site[url(1, 4)].replace("<body>", f"<body>{breadcrumb}{free_text_address}")
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "cache.sqlite")
+            options = dict(
+                min_delay=0, max_delay=0, sections=["theatre"], cache_db=db, refresh_after_hours=1e-9,
+                refresh_policy="fixed",
+            )
+            # Nom tiré de l'URL ou adresse du texte libre : rien n'est indexé
+            first = OffiScraper(**options)
+            first.session = _FakeSession(site)
+            stats = first.crawl_programme(os.path.join(tmp, "offi-1.jsonl"), max_pages=1)
+            self.assertEqual((stats.shows_extracted, stats.venues_added), (2, 0))
+
+            site[url(1, 4)] = site[url(1, 4)].replace(
+                free_text_address, '<div class="venue-address">14 boulevard de Strasbourg 75010 Paris</div>'
+            )
+            second = OffiScraper(**options)
+            second.session = _FakeSession(site)
+            stats = second.crawl_programme(os.path.join(tmp, "offi-2.jsonl"), max_pages=1)
+            self.assertEqual(stats.venues_added, 1)
+
+            store = ShowStore(db)
+            (venue,) = store.venues()
+            store.put_venue(replace(venue, updated_at=(datetime.now(timezone.utc) - timedelta(days=365)).isoformat()))
+            store.close()
+            site[url(1, 4)] = site[url(1, 4)].replace("14 boulevard", "16 boulevard")
+            third = OffiScraper(**options)
+            third.session = _FakeSession(site)
+            stats = third.crawl_programme(os.path.join(tmp, "offi-3.jsonl"), max_pages=1)
+            rows = _read_jsonl(os.path.join(tmp, "offi-3.jsonl"))
+            self.assertEqual((stats.venue_index_hits, stats.venues_changed), (0, 1))
+            self.assertEqual(rows[1]["address"], "16 boulevard de Strasbourg 75010 Paris")
+
+            forgetting = OffiScraper(forget_venues=["theatre-test-1"], **options)
+            self.assertEqual(len(forgetting._venues), 0)
+            forgetting._cache.close()
+            store = ShowStore(db)
+            self.assertEqual(store.venues(), [])
+            store.close()
+
+            legacy = os.path.join(tmp, "legacy.sqlite")
+            conn = sqlite3.connect(legacy)
+            conn.execute("CREATE TABLE venues (slug TEXT PRIMARY KEY, name TEXT NOT NULL, address TEXT NOT NULL)")
+            conn.execute("INSERT INTO venues VALUES ('theatre-test-1', 'Carte', '1 rue X 75001 Paris')")
+            conn.commit()
+            conn.close()
+            store = ShowStore(legacy)
+            self.assertEqual(store.venues(), [], "entrées indexées avant le contrôle de provenance")
+            store.close()
+
+    def test_show_store_keeps_the_most_recent_crawl(self):
+        url = "https://www.offi.fr/theatre/theatre-test-1/spectacle-1.html"
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ShowStore(os.path.join(tmp, "cache.sqlite"))
+            store.put(Show(url=url, section="theatre", title="Récent", crawled_at="2026-10-02T10:00:00+00:00"))
+            store.put(Show(url=url, section="theatre", title="Ancien", crawled_at="2026-09-01T10:00:00+00:00"))
+
+            self.assertEqual(store.get(url).title, "Récent")
+            self.assertIsNone(store.get(url + "?autre"))
+            store.close()
+
+    def test_show_store_sync_marker_follows_content_and_crawl_closes_the_store(self):
+        site = _fake_site(range(1, 4))
+        url = "https://www.offi.fr/theatre/theatre-test-{}/spectacle-{}.html".format
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "cache.sqlite")
+            out = os.path.join(tmp, "offi.jsonl")
+            store = ShowStore(db)
+            old = (datetime.now(timezone.utc) - timedelta(days=400)).isoformat()
+            store.put(Show(url=url(2, 99), section="theatre", title="Disparue", crawled_at=old))
+            film = "https://www.offi.fr/cinema/evenement/film-1-1001.html"
+            store.put(Show(url=film, section="cinema", title="Film hors crawl", crawled_at=old))
+            store.close()
+
+            scraper = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], cache_db=db)
+            scraper.session = _FakeSession(site)
+            scraper.crawl_programme(out, max_pages=1)
+            with self.assertRaises(sqlite3.ProgrammingError):
+                scraper._cache.count()
+
+            store = ShowStore(db)
+            # Section coupée par max_pages, mais fiche invisible depuis plus de CACHE_UNSEEN_TTL : purgée
+            self.assertIsNone(store.get(url(2, 99)))
+            # Le cinéma n'a pas été crawlé : ses fiches ne sont pas « absentes du programme »
+            self.assertEqual(store.get(film).title, "Film hors crawl")
+            # Le wrapper déplace la sortie : même contenu, autre mtime, toujours synchronisé
+            moved = os.path.join(tmp, "moved.jsonl")
+            shutil.copy(out, moved)
+            os.utime(moved, (0, 0))
+            self.assertTrue(store.is_synced_with(moved))
+            with open(moved, "a", encoding="utf-8") as f:
+                f.write("\n")
+            self.assertFalse(store.is_synced_with(moved))
+            store.close()
+
+    def test_resume_continues_after_last_checkpointed_page(self):
+        page_2 = f"{THEATRE_PROGRAMME_URL}?npage=2"
+        site = _fake_site(range(1, 9))
+        site[THEATRE_PROGRAMME_URL] = _programme_html(range(1, 5))
+        site[page_2] = _programme_html(range(5, 9))
+        for engine, compress in (("sync", "none"), ("async", "none"), ("sync", "gzip")):
+            with self.subTest(engine=engine, compress=compress), tempfile.TemporaryDirectory() as tmp:
+                expected_out = os.path.join(tmp, "expected.jsonl")
+                reference = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], engine=engine)
+                reference.session = _FakeSession(site)
+                reference.crawl_programme(expected_out, max_pages=3)
+
+                out = os.path.join(tmp, "offi.jsonl")
+                options = dict(min_delay=0, max_delay=0, sections=["theatre"], engine=engine, output_compress=compress)
+                crashing = OffiScraper(**options)
+                crashing.session = _FakeSession(site)
+                get = crashing.session.get
+
+                def crash_on_page_2(url, **kwargs):
+                    if url.endswith("/spectacle-5.html"):
+                        raise KeyboardInterrupt
+                    return get(url, **kwargs)
+
+                crashing.session.get = crash_on_page_2
+                with self.assertRaises(KeyboardInterrupt):
+                    crashing.crawl_programme(out, max_pages=3)
+                self.assertFalse(os.path.exists(out))
+                with open(out + ".partial", "ab") as f:
+                    f.write(b'{"url": "https://www.offi.fr/theatre/coup')
+                with open(out + ".checkpoint.json", encoding="utf-8") as f:
+                    self.assertNotIn("seen_urls", json.load(f))
+                with open(out + ".checkpoint.seen", encoding="utf-8") as f:
+                    self.assertEqual(len(f.read().splitlines()), 4)
+
+                resumed = OffiScraper(**options)
+                resumed.session = _FakeSession(site)
+                stats = resumed.crawl_programme(out, max_pages=3, resume=True)
+
+                self.assertNotIn(THEATRE_PROGRAMME_URL, [url for url, _ in resumed.session.calls])
+                self.assertEqual(stats.shows_extracted, 8)
+                self.assertEqual(_read_jsonl(out), _read_jsonl(expected_out))
+                self.assertFalse(os.path.exists(out + ".checkpoint.json"))
+                self.assertFalse(os.path.exists(out + ".partial"))
+
+    def test_stale_checkpoint_is_not_resumed(self):
+        site = _fake_site(range(1, 5))
+        site[f"{THEATRE_PROGRAMME_URL}?npage=2"] = _programme_html([5])
+        site["https://www.offi.fr/theatre/theatre-test-2/spectacle-5.html"] = _detail_html(5)
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "offi.jsonl")
+            crashing = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"])
+            crashing.session = _FakeSession(site)
+            get = crashing.session.get
+
+            def crash_on_page_2(url, **kwargs):
+                if url.endswith("/spectacle-5.html"):
+                    raise KeyboardInterrupt
+                return get(url, **kwargs)
+
+            crashing.session.get = crash_on_page_2
+            with self.assertRaises(KeyboardInterrupt):
+                crashing.crawl_programme(out, max_pages=2)
+            checkpoint = CrawlCheckpoint.load(out)
+            checkpoint.created_at = (datetime.now(timezone.utc) - timedelta(days=3)).isoformat()
+            checkpoint.save()
+
+            resumed = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"])
+            resumed.session = _FakeSession(site)
+            with self.assertLogs(level="WARNING") as logs:
+                stats = resumed.crawl_programme(out, max_pages=2, resume=True)
+
+        self.assertIn(THEATRE_PROGRAMME_URL, [url for url, _ in resumed.session.calls])
+        self.assertEqual(stats.shows_extracted, 5)
+        self.assertTrue(any("trop ancien" in line for line in logs.output))
+
+    def test_adaptive_rate_is_additive_up_and_multiplicative_down(self):
+        rate = AdaptiveRate(rate=1.0, min_rate=0.2, max_rate=1.1, increase=0.05, latency_window=4)
+
+        for _ in range(4):
+            self.assertIsNone(rate.observe(200, 0.1))
+        self.assertAlmostEqual(rate.rate, 1.1)
+
+        self.assertEqual(rate.observe(429, 0.1), "HTTP 429")
+        self.assertAlmostEqual(rate.rate, 0.55)
+        self.assertIsNone(rate.observe(503, 0.1), "une rafale d'erreurs ne compte qu'une fois")
+        self.assertIsNone(rate.observe(404, 0.1))
+        self.assertAlmostEqual(rate.rate, 0.55)
+
+        rate._hold_until = 0
+        for _ in range(4):
+            rate.observe(200, 0.1)
+        reasons = [rate.observe(200, 1.5) for _ in range(4)]
+        self.assertEqual([reason.split(" ")[0] for reason in reasons if reason], ["p95"])
+        rate._hold_until = 0
+        for _ in range(5):
+            rate.observe(None, 0.0)
+            rate._hold_until = 0
+        self.assertEqual(rate.rate, 0.2)
+
+    def test_backoff_events_are_counted_in_stats(self):
+        url = "https://www.offi.fr/theatre/theatre-test-1/spectacle-1.html"
+        scraper = OffiScraper(min_delay=0.001, max_delay=0.002, max_rate=1000)
+        scraper.session = _FakeSession(
+            {url: _detail_html(1)},
+            scripted={url: [_FakeResponse(429, headers={"Retry-After": "0"})]},
+        )
+        start_rate = scraper.stats.current_rate
+
+        self.assertIsNotNone(scraper._fetch_html(url))
+        self.assertEqual(scraper.stats.backoff_events, 1)
+        self.assertAlmostEqual(scraper.stats.current_rate, start_rate / 2 + 0.02)
+
+    def test_replay_serves_a_recorded_crawl_without_network_or_throttle(self):
+        site = _fake_site(range(1, 6))
+        flaky = "https://www.offi.fr/theatre/theatre-test-2/spectacle-2.html"
+        with tempfile.TemporaryDirectory() as tmp:
+            archive_dir = os.path.join(tmp, "archive")
+            recorder = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], record_dir=archive_dir)
+            recorder.session = _FakeSession(site, scripted={flaky: [_FakeResponse(429, headers={"Retry-After": "0"})]})
+            recorder.crawl_programme(os.path.join(tmp, "recorded.jsonl"), max_pages=2)
+            self.assertEqual(recorder.stats.archived_responses, len(recorder.session.calls))
+            self.assertEqual([entry.status for entry in PageArchive(archive_dir).responses(flaky)], [429, 200])
+
+            replayer = OffiScraper(min_delay=5, max_delay=10, sections=["theatre"], replay_dir=archive_dir)
+            started = time.monotonic()
+            stats = replayer.crawl_programme(os.path.join(tmp, "replayed.jsonl"), max_pages=2)
+
+            self.assertLess(time.monotonic() - started, 2)
+            self.assertEqual((stats.retries, stats.shows_extracted), (1, 5))
+            self.assertEqual(_read_jsonl(os.path.join(tmp, "replayed.jsonl")), _read_jsonl(os.path.join(tmp, "recorded.jsonl")))
+
+    def test_replayed_not_modified_response_is_served_as_html(self):
+        url = "https://www.offi.fr/theatre/theatre-test-1/spectacle-1.html"
+        with tempfile.TemporaryDirectory() as tmp:
+            archive_dir = os.path.join(tmp, "archive")
+            # Un vrai 304 ne porte que ses validateurs ; le corps archivé vient du cache HTTP
+            PageArchive(archive_dir).record(url, 304, {"ETag": '"v1"'}, _detail_html(1))
+
+            replayer = OffiScraper(min_delay=0, max_delay=0, replay_dir=archive_dir)
+            page = replayer._fetch_html(url)
+
+        self.assertIsNotNone(page)
+        self.assertIn("Spectacle 1", page.html)
+
+    def test_reparse_rebuilds_the_crawl_output_from_the_archive_in_order(self):
+        site = _fake_site(range(1, 9))
+        flaky = "https://www.offi.fr/theatre/theatre-test-0/spectacle-3.html"
+        with tempfile.TemporaryDirectory() as tmp:
+            archive_dir = os.path.join(tmp, "archive")
+            recorder = OffiScraper(min_delay=0, max_delay=0, sections=["theatre"], record_dir=archive_dir)
+            recorder.session = _FakeSession(site, scripted={flaky: [_FakeResponse(503, headers={"Retry-After": "0"})]})
+            recorder.crawl_programme(os.path.join(tmp, "crawl.jsonl"), max_pages=2)
+
+            out = os.path.join(tmp, "reparse.jsonl")
+            stats = reparse_archive(archive_dir, out, workers=2, sections=["theatre"])
+
+            self.assertEqual(stats.shows_extracted, 8)
+            self.assertEqual(_read_jsonl(out), _read_jsonl(os.path.join(tmp, "crawl.jsonl")))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,8 +7,13 @@ LOG_DIR="${OFFI_LOG_DIR:-$ROOT_DIR/scraper/logs}"
 DATA_DIR="${OFFI_DATA_DIR:-$ROOT_DIR/data}"
 STAMP="$(date '+%Y%m%d-%H%M%S')"
 LOG_FILE="${OFFI_LOG_FILE:-$LOG_DIR/offi-pipeline-$STAMP.log}"
-TMP_FILE="${OFFI_TMP_FILE:-$DATA_DIR/offi.$STAMP.jsonl.tmp}"
 OUTPUT_FILE="${OFFI_OUTPUT_FILE:-$DATA_DIR/offi.jsonl}"
+# Le scraper écrit dans $OUTPUT_FILE.partial et ne remplace $OUTPUT_FILE qu'en fin de crawl réussi
+# (avec des sections en parallèle, chacune a aussi son $OUTPUT_FILE.<section>.partial et son checkpoint)
+PARTIAL_FILE="$OUTPUT_FILE.partial"
+CHECKPOINT_GLOB="$OUTPUT_FILE*.checkpoint.json"
+# Chaque checkpoint a son journal des URLs déjà vues, ajouté page par page
+CHECKPOINT_SEEN_GLOB="$OUTPUT_FILE*.checkpoint.seen"
 
 mkdir -p "$LOG_DIR" "$DATA_DIR"
 
@@ -18,7 +23,11 @@ log() {
 
 cleanup() {
   local exit_code=$?
-  rm -f "$TMP_FILE"
+  if [[ "${OFFI_RESUME:-1}" == "1" ]] && compgen -G "$CHECKPOINT_GLOB" >/dev/null; then
+    log "Partial output kept for the next run (--resume): $OUTPUT_FILE*.partial"
+  else
+    rm -f "$PARTIAL_FILE" "$OUTPUT_FILE".*.partial $CHECKPOINT_GLOB $CHECKPOINT_SEEN_GLOB
+  fi
   if [[ $exit_code -ne 0 ]]; then
     log "Pipeline failed with exit code $exit_code"
   fi
@@ -59,35 +68,78 @@ fi
 SCRAPER_CMD=(
   "$PYTHON_BIN"
   "$ROOT_DIR/scraper/offi_scraper.py"
-  --out "$TMP_FILE"
+  --out "$OUTPUT_FILE"
+  --out-compress "${OFFI_OUT_COMPRESS:-none}"
   --max-pages "${OFFI_MAX_PAGES:-150}"
   --sections "${OFFI_SECTIONS:-theatre,cinema}"
   --min-delay "${OFFI_MIN_DELAY:-0.7}"
   --max-delay "${OFFI_MAX_DELAY:-1.6}"
+  --throttle "${OFFI_THROTTLE:-adaptive}"
   --retries "${OFFI_RETRIES:-4}"
   --timeout "${OFFI_TIMEOUT:-20}"
   --refresh-after-hours "${OFFI_REFRESH_AFTER_HOURS:-72}"
+  --refresh-policy "${OFFI_REFRESH_POLICY:-lifecycle}"
+  --concurrency "${OFFI_CONCURRENCY:-1}"
+  --engine "${OFFI_ENGINE:-sync}"
+  --http-cache-dir "${OFFI_HTTP_CACHE_DIR:-$DATA_DIR/http-cache}"
+  --http-cache-max-age-days "${OFFI_HTTP_CACHE_MAX_AGE_DAYS:-30}"
+  --http-cache-max-mb "${OFFI_HTTP_CACHE_MAX_MB:-512}"
+  --cache-db "${OFFI_CACHE_DB:-$DATA_DIR/offi-cache.sqlite}"
+  --parser "${OFFI_PARSER:-lxml}"
+  --metrics-out "${OFFI_METRICS_OUT:-$DATA_DIR/offi-metrics.json}"
+  --venues-out "${OFFI_VENUES_OUT:-$DATA_DIR/offi-venues.jsonl}"
 )
 
 if [[ -f "$OUTPUT_FILE" ]]; then
   SCRAPER_CMD+=(--cache-file "$OUTPUT_FILE")
 fi
 
+if [[ -n "${OFFI_DELTA_OUT:-}" ]]; then
+  SCRAPER_CMD+=(--delta-out "$OFFI_DELTA_OUT")
+fi
+
+if [[ "${OFFI_CARD_REFRESH:-0}" == "1" ]]; then
+  SCRAPER_CMD+=(--card-refresh)
+fi
+
+if [[ -n "${OFFI_METRICS_TEXTFILE:-}" ]]; then
+  SCRAPER_CMD+=(--metrics-textfile "$OFFI_METRICS_TEXTFILE")
+fi
+
+if [[ "${OFFI_PARALLEL_SECTIONS:-1}" != "1" ]]; then
+  SCRAPER_CMD+=(--no-parallel-sections)
+fi
+
+if [[ -n "${OFFI_PARSE_WORKERS:-}" ]]; then
+  SCRAPER_CMD+=(--parse-workers "$OFFI_PARSE_WORKERS")
+fi
+
+if [[ -n "${OFFI_MAX_REQUESTS:-}" ]]; then
+  SCRAPER_CMD+=(--max-requests "$OFFI_MAX_REQUESTS")
+fi
+
+if [[ -n "${OFFI_DEADLINE:-}" ]]; then
+  SCRAPER_CMD+=(--deadline "$OFFI_DEADLINE")
+fi
+
+if [[ "${OFFI_RESUME:-1}" == "1" ]]; then
+  SCRAPER_CMD+=(--resume)
+fi
+
 if [[ $# -gt 0 ]]; then
   SCRAPER_CMD+=("$@")
 fi
 
-log "Running scraper -> $TMP_FILE"
+log "Running scraper -> $OUTPUT_FILE"
 if ! "${SCRAPER_CMD[@]}" 2>&1 | tee -a "$LOG_FILE"; then
   exit 1
 fi
 
-if [[ ! -s "$TMP_FILE" ]]; then
+if [[ ! -s "$OUTPUT_FILE" ]]; then
   log "Scraper output is empty"
   exit 1
 fi
 
-mv "$TMP_FILE" "$OUTPUT_FILE"
 if [[ "${OFFI_SKIP_DB_DEPLOY:-0}" != "1" ]]; then
   log "Applying Prisma migrations"
   if ! pnpm --dir "$ROOT_DIR/app" db:deploy 2>&1 | tee -a "$LOG_FILE"; then
@@ -101,7 +153,6 @@ if ! pnpm --dir "$ROOT_DIR/app" ingest:offi "$OUTPUT_FILE" 2>&1 | tee -a "$LOG_F
 fi
 
 trap - EXIT
-rm -f "$TMP_FILE"
 log "Pipeline completed successfully"
 log "Output file: $OUTPUT_FILE"
 log "Log file: $LOG_FILE"